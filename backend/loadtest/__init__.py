@@ -0,0 +1 @@
+# 부하 테스트 도구 (대역 서버 + 시나리오)
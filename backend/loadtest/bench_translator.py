@@ -0,0 +1,255 @@
+"""
+HWPX 번역기 벤치마크 / 회귀 검사 (대역 서버 기반)
+
+합성 HWPX(loadtest.hwpx_corpus)를 크기별로 만들어 translate_hwpx_preserve_format을
+프로세스 내에서 직접 호출하고, 크기마다 다음을 보고함:
+    - 처리 속도 (문단 세그먼트/초), 단계별 시간
+    - API 호출 수 (번역기 통계 + 대역 서버 /__stats 기준 DeepL/chat 호출 수)
+    - 최대 메모리 (ru_maxrss, 크기마다 새 프로세스에서 실행해 서로 섞이지 않음)
+    - 구조 보존 여부 (항목 이름/순서/압축 방식, 번역 대상이 아닌 항목의 바이트,
+      XML 트리의 태그/속성/텍스트가 t 요소 내용과 linesegarray를 빼고 원본과 같은지)
+
+번역 메모리는 기본적으로 끔 (매 실행이 같은 API 호출 수를 내도록)
+
+사용법 (backend 디렉토리에서):
+    python -m loadtest.bench_translator --pages 10,100,500
+    python -m loadtest.bench_translator --pages 200 --images 10 --boilerplate-ratio 0.5 --target-lang JA
+    python -m loadtest.bench_translator --json-out bench.json --baseline last.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+HP_NS = "http://www.hancom.co.kr/hwpml/2011/paragraph"
+HP_T = f"{{{HP_NS}}}t"
+HP_LINESEGARRAY = f"{{{HP_NS}}}linesegarray"
+
+# 구조 차이는 앞의 몇 개만 보고
+MAX_DIFFS = 10
+
+
+def _same_text(a: Optional[str], b: Optional[str]) -> bool:
+    return (a or "").strip() == (b or "").strip()
+
+
+def _compare_elements(src, out, path: str, diffs: List[str]):
+    """태그/속성/자식 구조 비교 (t 요소 내용은 번역되므로 제외, 원본의 linesegarray는 삭제 대상이라 제외)"""
+    if len(diffs) >= MAX_DIFFS:
+        return
+    if src.tag != out.tag or dict(src.attrib) != dict(out.attrib):
+        diffs.append(f"{path}: {src.tag} {dict(src.attrib)} → {out.tag} {dict(out.attrib)}")
+        return
+    if not _same_text(src.tail, out.tail):
+        diffs.append(f"{path}: tail {src.tail!r} → {out.tail!r}")
+    if src.tag == HP_T:
+        return
+    if not _same_text(src.text, out.text):
+        diffs.append(f"{path}: text {src.text!r} → {out.text!r}")
+    src_children = [c for c in src if c.tag != HP_LINESEGARRAY]
+    out_children = list(out)
+    if len(src_children) != len(out_children):
+        diffs.append(f"{path}: 자식 {len(src_children)}개 → {len(out_children)}개")
+        return
+    for k, (a, b) in enumerate(zip(src_children, out_children)):
+        _compare_elements(a, b, f"{path}/{str(b.tag).split('}')[-1]}[{k}]", diffs)
+
+
+def structural_diff(source_bytes: bytes, output_bytes: bytes) -> List[str]:
+    """
+    원본과 번역본 HWPX의 구조 차이 목록 (빈 목록이면 구조 보존)
+
+    - 항목 이름/순서/압축 방식이 같아야 함
+    - 다시 쓰지 않은 항목은 압축된 바이트(CRC/크기)까지 같아야 함
+    - 다시 쓴 XML 항목은 t 요소 내용과 linesegarray를 빼고 트리가 같아야 함
+    """
+    from lxml import etree
+
+    diffs: List[str] = []
+    with zipfile.ZipFile(io.BytesIO(source_bytes)) as src, zipfile.ZipFile(io.BytesIO(output_bytes)) as out:
+        src_infos, out_infos = src.infolist(), out.infolist()
+        if [i.filename for i in src_infos] != [i.filename for i in out_infos]:
+            return ["항목 이름/순서가 다름"]
+        for a, b in zip(src_infos, out_infos):
+            if len(diffs) >= MAX_DIFFS:
+                break
+            if a.compress_type != b.compress_type:
+                diffs.append(f"{a.filename}: 압축 방식 {a.compress_type} → {b.compress_type}")
+            if a.CRC == b.CRC and a.file_size == b.file_size:
+                continue
+            if not a.filename.endswith(".xml"):
+                diffs.append(f"{a.filename}: 바이트가 바뀜")
+                continue
+            _compare_elements(etree.fromstring(src.read(a)), etree.fromstring(out.read(b)), a.filename, diffs)
+    return diffs
+
+
+def run_case(upstream_url: str, case: Dict, target_lang: str, use_memory: bool) -> Dict:
+    """
+    문서 1개 번역 (새 프로세스에서 실행되어 ru_maxrss가 이 문서만의 최대 메모리가 됨)
+    """
+    from loadtest.run_loadtest import point_backend_at
+    from loadtest.hwpx_corpus import make_hwpx
+    import httpx
+
+    point_backend_at(upstream_url)
+    os.environ["TRANSLATION_MEMORY_ENABLED"] = "true" if use_memory else "false"
+    from routers.translator import translate_hwpx_preserve_format, create_deepl_translator
+
+    source = make_hwpx(**case)
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    before = httpx.get(f"{upstream_url}/__stats", timeout=10).json()
+
+    stats: Dict = {}
+    started = time.perf_counter()
+    output = asyncio.run(
+        translate_hwpx_preserve_format(source, target_lang, "all", create_deepl_translator(), stats)
+    )
+    elapsed = time.perf_counter() - started
+
+    after = httpx.get(f"{upstream_url}/__stats", timeout=10).json()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    diffs = structural_diff(source, output)
+
+    def delta(kind: str, key: str) -> int:
+        return after[kind].get(key, 0) - before[kind].get(key, 0)
+
+    return {
+        "case": f"{case['pages']}p",
+        "pages": case["pages"],
+        "input_kb": round(len(source) / 1024, 1),
+        "output_kb": round(len(output) / 1024, 1),
+        "segments": stats["segments"],
+        "unique_segments": stats["unique_segments"],
+        "deepl_segments": stats["deepl_segments"],
+        "deepl_calls": stats["deepl_calls"],
+        "gpt_calls": stats["gpt_calls"],
+        "upstream_deepl_calls": delta("calls", "deepl"),
+        "upstream_deepl_texts": delta("items", "deepl"),
+        "upstream_chat_calls": delta("calls", "chat"),
+        "parse_seconds": stats["parse_seconds"],
+        "deepl_seconds": stats["deepl_seconds"],
+        "gpt_seconds": stats["gpt_seconds"],
+        "write_seconds": stats["write_seconds"],
+        "seconds": round(elapsed, 3),
+        "segments_per_sec": round(stats["segments"] / elapsed, 1) if elapsed else 0.0,
+        # Linux ru_maxrss 단위는 KB
+        "peak_rss_mb": round(peak_rss / 1024, 1),
+        "rss_growth_mb": round((peak_rss - base_rss) / 1024, 1),
+        "structure_ok": not diffs,
+        "structure_diffs": diffs,
+    }
+
+
+def print_report(results: List[Dict]):
+    header = (f"{'case':<8} {'KB':>8} {'seg':>7} {'uniq':>6} {'DeepL':>6} {'GPT':>5} "
+              f"{'sec':>7} {'seg/s':>8} {'RSS MB':>8} {'+RSS':>7} {'구조':>4}")
+    print("\n" + header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['case']:<8} {r['input_kb']:>8.0f} {r['segments']:>7} {r['unique_segments']:>6} "
+              f"{r['upstream_deepl_calls']:>6} {r['upstream_chat_calls']:>5} {r['seconds']:>7.2f} "
+              f"{r['segments_per_sec']:>8.0f} {r['peak_rss_mb']:>8.0f} {r['rss_growth_mb']:>7.0f} "
+              f"{'OK' if r['structure_ok'] else 'FAIL':>4}")
+        for line in r["structure_diffs"]:
+            print(f"    ⚠️ {line}")
+
+
+def compare_baseline(results: List[Dict], baseline_path: str, max_regression: float) -> List[str]:
+    """기준 결과 대비 처리 속도 저하/API 호출 증가/메모리 증가/구조 깨짐 항목"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["case"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    for r in results:
+        if not r["structure_ok"]:
+            regressions.append(f"{r['case']}: 구조 보존 실패")
+        base = baseline.get(r["case"])
+        if not base:
+            continue
+        if r["segments_per_sec"] < base["segments_per_sec"] * (1 - max_regression):
+            regressions.append(f"{r['case']}: 처리 속도 {base['segments_per_sec']:.0f} → {r['segments_per_sec']:.0f} seg/s")
+        for key in ("upstream_deepl_calls", "upstream_chat_calls"):
+            if r[key] > base[key]:
+                regressions.append(f"{r['case']}: {key} {base[key]} → {r[key]}")
+        if base["rss_growth_mb"] > 0 and r["rss_growth_mb"] > base["rss_growth_mb"] * (1 + max_regression):
+            regressions.append(f"{r['case']}: 메모리 증가 {base['rss_growth_mb']:.0f}MB → {r['rss_growth_mb']:.0f}MB")
+    return regressions
+
+
+def main():
+    from loadtest.run_loadtest import start_fake_upstream
+
+    parser = argparse.ArgumentParser(description="대역 서버 기반 HWPX 번역기 벤치마크")
+    parser.add_argument("--pages", default="10,100,500", help="문서 크기 (페이지 수, 쉼표 구분)")
+    parser.add_argument("--paragraphs-per-page", type=int, default=20)
+    parser.add_argument("--tables-per-page", type=float, default=0.5)
+    parser.add_argument("--boilerplate-ratio", type=float, default=0.25)
+    parser.add_argument("--images", type=int, default=0, help="문서당 이미지 개수")
+    parser.add_argument("--image-kb", type=int, default=300)
+    parser.add_argument("--target-lang", default="EN-US")
+    parser.add_argument("--with-memory", action="store_true", help="번역 메모리 사용")
+    parser.add_argument("--deepl-ms", type=float, default=50, help="대역 DeepL 중앙 지연 (ms)")
+    parser.add_argument("--chat-ms", type=float, default=300, help="대역 chat completions 중앙 지연 (ms)")
+    parser.add_argument("--korean-leak-rate", type=float, help="대역 DeepL 한글 잔존 비율 (GPT 2차 번역 유발)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json-out", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 악화 비율 (처리 속도/메모리)")
+    args = parser.parse_args()
+
+    profile = {"deepl": {"median_ms": args.deepl_ms}, "chat": {"median_ms": args.chat_ms}}
+    if args.korean_leak_rate is not None:
+        profile["deepl"]["korean_leak_rate"] = args.korean_leak_rate
+    upstream_url = start_fake_upstream(profile, args.seed)
+    print(f"🧪 대역 서버: {upstream_url}")
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for pages in [int(p) for p in args.pages.split(",") if p.strip()]:
+        case = {
+            "pages": pages,
+            "paragraphs_per_page": args.paragraphs_per_page,
+            "tables_per_page": args.tables_per_page,
+            "boilerplate_ratio": args.boilerplate_ratio,
+            "images": args.images,
+            "image_kb": args.image_kb,
+            "seed": args.seed,
+        }
+        print(f"▶ {pages}페이지")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results.append(pool.submit(run_case, upstream_url, case, args.target_lang, args.with_memory).result())
+
+    print_report(results)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "args": vars(args)}, f, ensure_ascii=False, indent=2)
+
+    failed = [r["case"] for r in results if not r["structure_ok"]]
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\n❌ 회귀 감지:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n✅ 기준 대비 회귀 없음")
+    elif failed:
+        print(f"\n❌ 구조 보존 실패: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
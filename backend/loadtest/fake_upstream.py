@@ -0,0 +1,377 @@
+"""
+부하 테스트용 외부 API 대역 서버 (OpenAI / DeepL / Kakao)
+
+실제 쿼터를 쓰지 않고 백엔드를 부하 테스트하기 위한 로컬 서버.
+엔드포인트별 지연시간(로그정규분포)과 오류율(429/500)을 설정할 수 있음.
+
+구현 엔드포인트:
+    POST /v1/chat/completions          (stream=true 포함)
+    POST /v1/embeddings
+    POST /v2/translate                 (DeepL)
+    GET  /v2/local/search/address.json (Kakao 주소 검색)
+    GET  /v2/local/geo/coord2address.json
+    GET  /__stats                      (엔드포인트별 호출/오류 수)
+
+실행 (backend 디렉토리에서):
+    python -m loadtest.fake_upstream --port 9100 --latency-ms 800 --error-rate 0.02
+    python -m loadtest.fake_upstream --profile my_profile.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 엔드포인트별 기본 프로필
+#   median_ms/sigma: 전체 응답 지연 (로그정규분포)
+#   ttft_ms: 스트리밍 첫 토큰까지 지연
+#   tokens_per_sec: 스트리밍 출력 속도
+#   error_rate: 오류 응답 비율 (절반은 429, 절반은 500)
+DEFAULT_PROFILE = {
+    "chat": {"median_ms": 800, "sigma": 0.5, "ttft_ms": 350, "tokens_per_sec": 80, "error_rate": 0.0},
+    "embeddings": {"median_ms": 120, "sigma": 0.3, "error_rate": 0.0},
+    "deepl": {"median_ms": 150, "sigma": 0.4, "error_rate": 0.0, "korean_leak_rate": 0.05},
+    "kakao": {"median_ms": 60, "sigma": 0.3, "error_rate": 0.0},
+}
+
+EMBEDDING_DIM = 1536
+HANGUL_RUN = re.compile(r"[가-힣]+")
+
+SAMPLE_SUMMARY = """▣ 주요 논의 사항
+◦ 관련 부서에서 추진 현황을 보고하였으며 향후 일정에 따라 차질 없이 추진하도록 할 예정임
+◦ 시민 불편 최소화를 위한 대책을 검토하고 다음 회의에서 결과를 보고하기로 함
+▣ 향후 계획
+◦ 담당 부서는 세부 계획을 마련하여 연내 완료할 것"""
+
+
+class UpstreamState:
+    """프로필 + 호출 통계"""
+
+    def __init__(self, profile: Optional[Dict] = None, seed: Optional[int] = None):
+        self.profile = {k: dict(v) for k, v in DEFAULT_PROFILE.items()}
+        for key, overrides in (profile or {}).items():
+            self.profile.setdefault(key, {}).update(overrides)
+        self.random = random.Random(seed)
+        self.calls = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.items = defaultdict(int)
+        self.seen_prefixes = set()
+
+    def latency(self, key: str) -> float:
+        """로그정규분포 지연시간 (초)"""
+        p = self.profile[key]
+        return self.random.lognormvariate(math.log(p["median_ms"] / 1000.0), p.get("sigma", 0.0))
+
+    def pick_error(self, key: str) -> Optional[int]:
+        if self.random.random() < self.profile[key].get("error_rate", 0.0):
+            return 429 if self.random.random() < 0.5 else 500
+        return None
+
+    def snapshot(self) -> Dict:
+        return {
+            "calls": dict(self.calls),
+            "errors": dict(self.errors),
+            "items": dict(self.items),
+            "profile": self.profile,
+        }
+
+
+def _error_response(status: int, provider: str) -> JSONResponse:
+    headers = {"retry-after": "1"} if status == 429 else {}
+    if provider == "openai":
+        body = {"error": {"message": f"fake upstream error {status}", "type": "fake_error", "code": status}}
+    else:
+        body = {"message": f"fake upstream error {status}"}
+    return JSONResponse(status_code=status, content=body, headers=headers)
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, int(len(text) * 0.6))
+
+
+def _cached_prefix_tokens(state: "UpstreamState", body: Dict, prompt_tokens: int) -> int:
+    """
+    공급자 프롬프트 캐시 흉내: 1024토큰 이상 요청에서 이전에 본 system 메시지는 캐시 적중
+    (128토큰 단위로 내림)
+    """
+    messages = body.get("messages") or []
+    if prompt_tokens < 1024 or not messages or messages[0].get("role") != "system":
+        return 0
+    prefix = messages[0].get("content") or ""
+    if prefix not in state.seen_prefixes:
+        state.seen_prefixes.add(prefix)
+        return 0
+    return _approx_tokens(prefix) // 128 * 128
+
+
+def _messages_text(messages) -> str:
+    parts = []
+    for message in messages or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(p.get("text", "") for p in content if p.get("type") == "text")
+    return "\n".join(parts)
+
+
+def _fake_translation(text: str, target_lang: str) -> str:
+    """한글 구간을 대상 언어 표시 문자열로 치환 (숫자/기호/영문은 유지)"""
+    return HANGUL_RUN.sub(lambda m: f"{target_lang.lower()}{len(m.group(0))}", text)
+
+
+def fake_chat_content(body: Dict) -> str:
+    """요청 형태에 맞는 그럴듯한 응답 본문"""
+    text = _messages_text(body.get("messages"))
+    max_tokens = body.get("max_tokens") or 1000
+    response_format = (body.get("response_format") or {}).get("type")
+
+    if response_format == "json_object" and "Segments (JSON):" in text:
+        # 번역기 GPT 2차 번역 묶음 요청
+        segments = json.loads(text.split("Segments (JSON):", 1)[1])
+        target = re.search(r"Target language: (.+)", text)
+        label = target.group(1).strip().replace(" ", "-") if target else "en"
+        return json.dumps({
+            "translations": [{"id": s["id"], "text": _fake_translation(s["text"], label)} for s in segments]
+        }, ensure_ascii=False)
+    if response_format == "json_object":
+        sections = re.search(r"## 섹션 구성\s*\n(.+)", text)
+        names = [s.strip() for s in sections.group(1).split("→")] if sections else ["개요", "세부내용"]
+        return json.dumps({
+            "title": "부하 테스트 보고서",
+            "summary": "부하 테스트용 요약임. 주요 지표는 전년 대비 12% 개선됨",
+            "sections": [
+                {"title": name, "order": i + 1, "content": [f"{name} 관련 항목 {j + 1}을 추진함" for j in range(4)]}
+                for i, name in enumerate(names)
+            ],
+            "metadata": {},
+            # 업무보고 병렬 생성용 (개요 / 섹션 단위 응답)
+            "outline": {name: f"{name} 핵심 포인트" for name in names},
+            "content": [f"관련 항목 {j + 1}을 추진함" for j in range(4)],
+        }, ensure_ascii=False)
+    if max_tokens <= 20:
+        return "general"
+    if "JSON 형식으로 출력" in text:
+        return '["기부행위 제한", "선거운동 기간", "공무원 중립 의무"]'
+    if "professional translator" in text.lower() or text.startswith("Translate"):
+        return "Translated text for load testing."
+    if "▣" in text:
+        return SAMPLE_SUMMARY
+    return ("충주시는 시민 편의를 높이기 위해 관련 사업을 추진한다고 밝혔다. " * 20)[: max(40, min(max_tokens, 400) * 2)]
+
+
+def create_app(state: Optional[UpstreamState] = None) -> FastAPI:
+    state = state or UpstreamState()
+    app = FastAPI(title="Fake upstream (OpenAI/DeepL/Kakao)")
+    app.state.upstream = state
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        state.calls["chat"] += 1
+        error = state.pick_error("chat")
+        if error:
+            state.errors["chat"] += 1
+            await asyncio.sleep(state.latency("chat") * 0.1)
+            return _error_response(error, "openai")
+
+        content = fake_chat_content(body)
+        n = max(1, int(body.get("n") or 1))
+        prompt_tokens = _approx_tokens(_messages_text(body.get("messages")))
+        completion_tokens = _approx_tokens(content) * n
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": _cached_prefix_tokens(state, body, prompt_tokens)},
+        }
+        completion_id = f"chatcmpl-fake-{state.calls['chat']}"
+        created = int(time.time())
+        model = body.get("model", "gpt-4o-mini")
+
+        if not body.get("stream"):
+            await asyncio.sleep(state.latency("chat"))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": i,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                } for i in range(n)],
+                "usage": usage,
+            }
+
+        profile = state.profile["chat"]
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        async def event_stream():
+            await asyncio.sleep(state.random.lognormvariate(math.log(profile["ttft_ms"] / 1000.0), profile.get("sigma", 0.0)))
+            chunk_size = 8
+            delay = chunk_size / 0.6 / profile["tokens_per_sec"]
+            for i in range(0, len(content), chunk_size):
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[i:i + chunk_size]}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                await asyncio.sleep(delay)
+            final = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            if include_usage:
+                usage_chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [], "usage": usage,
+                }
+                yield f"data: {json.dumps(usage_chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        state.calls["embeddings"] += 1
+        error = state.pick_error("embeddings")
+        if error:
+            state.errors["embeddings"] += 1
+            return _error_response(error, "openai")
+
+        inputs = body.get("input")
+        inputs = [inputs] if isinstance(inputs, str) else list(inputs or [])
+        state.items["embeddings"] += len(inputs)
+        await asyncio.sleep(state.latency("embeddings"))
+
+        data = []
+        for i, text in enumerate(inputs):
+            rng = random.Random(hashlib.md5(str(text).encode("utf-8")).hexdigest())
+            vec = [rng.gauss(0, 1) for _ in range(EMBEDDING_DIM)]
+            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+            data.append({"object": "embedding", "index": i, "embedding": [v / norm for v in vec]})
+        tokens = sum(_approx_tokens(str(t)) for t in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.post("/v2/translate")
+    async def deepl_translate(request: Request):
+        if request.headers.get("content-type", "").startswith("application/json"):
+            body = await request.json()
+        else:
+            form = await request.form()
+            body = {"text": form.getlist("text"), "target_lang": form.get("target_lang")}
+        state.calls["deepl"] += 1
+        error = state.pick_error("deepl")
+        if error:
+            state.errors["deepl"] += 1
+            return _error_response(error, "deepl")
+
+        texts = body.get("text") or []
+        texts = [texts] if isinstance(texts, str) else texts
+        target_lang = body.get("target_lang", "EN-US")
+        state.items["deepl"] += len(texts)
+        await asyncio.sleep(state.latency("deepl"))
+
+        leak_rate = state.profile["deepl"].get("korean_leak_rate", 0.0)
+        translations = []
+        for text in texts:
+            # 일부 세그먼트는 한글을 남겨 GPT 2차 번역 경로를 태움
+            translated = text if state.random.random() < leak_rate else _fake_translation(text, target_lang)
+            translations.append({"detected_source_language": "KO", "text": translated, "billed_characters": len(text)})
+        return {"translations": translations}
+
+    @app.get("/v2/local/search/address.json")
+    async def kakao_address(query: str = ""):
+        state.calls["kakao"] += 1
+        error = state.pick_error("kakao")
+        if error:
+            state.errors["kakao"] += 1
+            return _error_response(error, "kakao")
+        await asyncio.sleep(state.latency("kakao"))
+        rng = random.Random(query)
+        return {
+            "meta": {"total_count": 1},
+            "documents": [{
+                "address_name": query,
+                "x": f"{127.9 + rng.random() * 0.1:.6f}",
+                "y": f"{36.95 + rng.random() * 0.1:.6f}",
+            }],
+        }
+
+    @app.get("/v2/local/geo/coord2address.json")
+    async def kakao_coord2address(x: float = 0.0, y: float = 0.0):
+        state.calls["kakao"] += 1
+        error = state.pick_error("kakao")
+        if error:
+            state.errors["kakao"] += 1
+            return _error_response(error, "kakao")
+        await asyncio.sleep(state.latency("kakao"))
+        return {
+            "meta": {"total_count": 1},
+            "documents": [{
+                "address": {"address_name": f"충북 충주시 가상동 {int(x * 1000) % 900 + 1}"},
+                "road_address": {"address_name": f"충북 충주시 가상로 {int(y * 1000) % 300 + 1}"},
+            }],
+        }
+
+    @app.get("/__stats")
+    async def stats():
+        return state.snapshot()
+
+    @app.post("/__reset")
+    async def reset():
+        state.calls.clear()
+        state.errors.clear()
+        state.items.clear()
+        return {"status": "reset"}
+
+    return app
+
+
+def build_profile(args) -> Dict:
+    """CLI 인자 -> 프로필 (파일 > 전역 플래그 순으로 덮어씀)"""
+    profile = {}
+    if args.profile:
+        with open(args.profile, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    if args.latency_ms is not None:
+        profile.setdefault("chat", {})["median_ms"] = args.latency_ms
+    if args.error_rate is not None:
+        for key in DEFAULT_PROFILE:
+            profile.setdefault(key, {})["error_rate"] = args.error_rate
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI/DeepL/Kakao 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--profile", help="엔드포인트별 지연/오류 프로필 JSON")
+    parser.add_argument("--latency-ms", type=float, help="chat completions 중앙 지연 (ms)")
+    parser.add_argument("--error-rate", type=float, help="모든 엔드포인트 오류율 (0~1)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    import uvicorn
+    app = create_app(UpstreamState(build_profile(args), seed=args.seed))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+번역기 벤치마크용 합성 HWPX 생성
+
+실제 시청 문서처럼 여러 run으로 나뉜 문단, 표, 반복되는 상용구(부서명/제목/표 머리글),
+한글이 없는 run(번호, 날짜, 영문), 이미지(BinData)를 섞어 원하는 크기로 만듦.
+같은 인자와 seed면 항상 같은 바이트를 생성함
+
+사용법 (backend 디렉토리에서):
+    python -m loadtest.hwpx_corpus --pages 200 --tables-per-page 1 --images 5 --out sample_200p.hwpx
+"""
+import argparse
+import io
+import random
+import zipfile
+from typing import List
+
+HP_NS = "http://www.hancom.co.kr/hwpml/2011/paragraph"
+HS_NS = "http://www.hancom.co.kr/hwpml/2011/section"
+HH_NS = "http://www.hancom.co.kr/hwpml/2011/head"
+
+# 문단 1개를 한 페이지 기준 몇 개 넣을지 (A4 본문 10pt 기준 대략치)
+DEFAULT_PARAGRAPHS_PER_PAGE = 20
+# 섹션 XML 1개당 페이지 수 (큰 문서는 여러 section*.xml로 나뉨)
+PAGES_PER_SECTION = 50
+
+BOILERPLATE = [
+    "충주시 자치행정과", "붙임 자료 참고", "추진 배경", "추진 계획", "행정사항", "기대 효과",
+    "관련 부서와 협의하여 추진함", "예산: 시비 100%", "문의: 담당 주무관", "이상입니다.",
+]
+TABLE_HEADERS = ["구분", "내용", "일정", "비고"]
+SUBJECTS = ["시민", "관광객", "청년", "어르신", "소상공인", "학생", "농업인", "자원봉사자"]
+TOPICS = ["안전 점검", "축제 운영", "도로 정비", "복지 지원", "문화 행사", "환경 개선", "일자리 창출", "주차 관리"]
+ACTIONS = ["추진한다", "확대 운영한다", "점검할 예정이다", "지원할 계획이다", "마련하였다", "강화한다"]
+LATIN = ["ESG", "R&D", "Smart City", "AI", "CCTV", "QR", "GIS"]
+
+LINESEG = ('<hp:linesegarray><hp:lineseg textpos="0" vertpos="0" vertsize="1000" textheight="1000" '
+           'baseline="850" spacing="600" horzpos="0" horzsize="42520" flags="393216"/></hp:linesegarray>')
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _run(text: str, char_pr: int) -> str:
+    return f'<hp:run charPrIDRef="{char_pr}"><hp:t>{_escape(text)}</hp:t></hp:run>'
+
+
+def _sentence(rng: random.Random, index: int) -> List[str]:
+    """서식 때문에 여러 run으로 나뉜 문장 (run 텍스트 목록)"""
+    parts = [
+        f"{rng.choice(SUBJECTS)}을 위한 {rng.choice(TOPICS)} 사업을 ",
+        f"{2026}년 {rng.randint(1, 12)}월부터 ",
+        f"{rng.choice(LATIN)} 기반으로 {rng.choice(ACTIONS)}.",
+    ]
+    if rng.random() < 0.3:
+        parts.append(f" (사업비 {index * 7 % 900 + 100}백만원)")
+    return parts
+
+
+def _paragraph(rng: random.Random, index: int, boilerplate_ratio: float) -> str:
+    roll = rng.random()
+    if roll < boilerplate_ratio:
+        runs = [_run(rng.choice(BOILERPLATE), 1)]
+    elif roll < boilerplate_ratio + 0.1:
+        # 한글 없는 run (번호, 날짜, 영문)
+        runs = [_run(rng.choice([f"{index}.", f"2026. {rng.randint(1, 12)}. {rng.randint(1, 28)}.", "○", "- 1 -",
+                                 rng.choice(LATIN)]), 2)]
+    else:
+        runs = [_run(text, 1 + k % 3) for k, text in enumerate(_sentence(rng, index))]
+        if rng.random() < 0.2:
+            # 전각 공백이 들어간 run
+            runs.append('<hp:run charPrIDRef="1"><hp:t>담당<hp:fwSpace/>부서</hp:t></hp:run>')
+    return f'<hp:p paraPrIDRef="0" styleIDRef="0">{"".join(runs)}{LINESEG}</hp:p>'
+
+
+def _table(rng: random.Random, index: int, rows: int = 4) -> str:
+    def cell(text: str) -> str:
+        return (f'<hp:tc><hp:subList><hp:p paraPrIDRef="1">{_run(text, 3)}{LINESEG}</hp:p></hp:subList>'
+                f'<hp:cellSz width="10630" height="1000"/></hp:tc>')
+
+    header = "".join(cell(h) for h in TABLE_HEADERS)
+    body = "".join(
+        "<hp:tr>" + cell(f"{r}") + cell(f"{rng.choice(TOPICS)} {rng.choice(ACTIONS)}")
+        + cell(f"{rng.randint(1, 12)}월") + cell(rng.choice(["", "완료", "진행 중", "-"])) + "</hp:tr>"
+        for r in range(1, rows)
+    )
+    return (f'<hp:p paraPrIDRef="0"><hp:run charPrIDRef="0"><hp:tbl id="{index}" rowCnt="{rows}" colCnt="4">'
+            f'<hp:tr>{header}</hp:tr>{body}</hp:tbl></hp:run>{LINESEG}</hp:p>')
+
+
+def _picture(index: int) -> str:
+    return (f'<hp:p paraPrIDRef="0"><hp:run charPrIDRef="0"><hp:pic id="{index}">'
+            f'<hp:img binaryItemIDRef="image{index}"/></hp:pic></hp:run></hp:p>')
+
+
+def _section(paragraphs: List[str]) -> str:
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<hs:sec xmlns:hs="{HS_NS}" xmlns:hp="{HP_NS}">{"".join(paragraphs)}</hs:sec>')
+
+
+def make_hwpx(
+    pages: int = 10,
+    paragraphs_per_page: int = DEFAULT_PARAGRAPHS_PER_PAGE,
+    tables_per_page: float = 0.5,
+    boilerplate_ratio: float = 0.25,
+    images: int = 0,
+    image_kb: int = 300,
+    seed: int = 0,
+) -> bytes:
+    """
+    합성 HWPX 생성
+
+    Args:
+        pages: 페이지 수 (문단 수 = pages * paragraphs_per_page)
+        tables_per_page: 페이지당 표 개수 (0.5면 두 페이지에 하나)
+        boilerplate_ratio: 상용구 문단 비율 (문서 내 중복 세그먼트)
+        images: BinData 이미지 개수 (압축되지 않는 임의 바이트)
+        image_kb: 이미지 1개 크기 (KB)
+        seed: 난수 시드
+    """
+    rng = random.Random(seed)
+    sections: List[List[str]] = []
+    table_budget = 0.0
+    for page in range(pages):
+        if page % PAGES_PER_SECTION == 0:
+            sections.append([])
+        paragraphs = sections[-1]
+        for k in range(paragraphs_per_page):
+            paragraphs.append(_paragraph(rng, page * paragraphs_per_page + k, boilerplate_ratio))
+        table_budget += tables_per_page
+        while table_budget >= 1:
+            paragraphs.append(_table(rng, page))
+            table_budget -= 1
+    for i in range(images):
+        sections[i % len(sections)].append(_picture(i))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("mimetype", "application/hwp+zip", compress_type=zipfile.ZIP_STORED)
+        zf.writestr("version.xml", '<?xml version="1.0" encoding="UTF-8"?><hv:HCFVersion xmlns:hv="urn:hv" major="5"/>')
+        zf.writestr("META-INF/container.xml",
+                    '<?xml version="1.0" encoding="UTF-8"?><ocf:container xmlns:ocf="urn:oasis:names:tc:opendocument:'
+                    'xmlns:container"><ocf:rootfiles><ocf:rootfile full-path="Contents/content.hpf"/></ocf:rootfiles>'
+                    '</ocf:container>')
+        zf.writestr("Contents/header.xml",
+                    f'<?xml version="1.0" encoding="UTF-8"?><hh:head xmlns:hh="{HH_NS}" secCnt="{len(sections)}">'
+                    '<hh:fontfaces><hh:fontface lang="HANGUL"><hh:font face="맑은 고딕"/></hh:fontface></hh:fontfaces>'
+                    '</hh:head>')
+        for i, paragraphs in enumerate(sections):
+            zf.writestr(f"Contents/section{i}.xml", _section(paragraphs))
+        for i in range(images):
+            image_rng = random.Random(seed * 1000 + i)
+            zf.writestr(f"BinData/image{i}.png", image_rng.randbytes(image_kb * 1024))
+        zf.writestr("Preview/PrvText.txt", "충주시 합성 문서 미리보기")
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="번역기 벤치마크용 합성 HWPX 생성")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--paragraphs-per-page", type=int, default=DEFAULT_PARAGRAPHS_PER_PAGE)
+    parser.add_argument("--tables-per-page", type=float, default=0.5)
+    parser.add_argument("--boilerplate-ratio", type=float, default=0.25)
+    parser.add_argument("--images", type=int, default=0)
+    parser.add_argument("--image-kb", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="저장할 .hwpx 경로")
+    args = parser.parse_args()
+
+    data = make_hwpx(args.pages, args.paragraphs_per_page, args.tables_per_page, args.boilerplate_ratio,
+                     args.images, args.image_kb, args.seed)
+    with open(args.out, "wb") as f:
+        f.write(data)
+    print(f"✅ {args.out} ({len(data) / 1024:.0f}KB, {args.pages}페이지)")
+
+
+if __name__ == "__main__":
+    main()
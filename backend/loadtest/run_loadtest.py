@@ -0,0 +1,292 @@
+"""
+엔드투엔드 부하 테스트 (대역 서버 기반)
+
+main.py에 등록된 모든 라우터의 대표 엔드포인트를 동시 요청으로 호출하고
+엔드포인트별 처리량과 p50/p95/p99 지연시간을 보고함.
+
+기본 동작:
+    1) 대역 서버(fake_upstream)를 빈 포트에 띄움
+    2) OPENAI_BASE_URL / DEEPL_SERVER_URL / KAKAO_API_BASE_URL을 대역 서버로 설정
+    3) 백엔드 앱을 프로세스 내(ASGI)로 로드해 호출
+
+사용법 (backend 디렉토리에서):
+    python -m loadtest.run_loadtest --requests 50 --concurrency 8
+    python -m loadtest.run_loadtest --only election-law,meeting --latency-ms 1500
+    python -m loadtest.run_loadtest --backend-url http://localhost:8000 --upstream-url http://localhost:9100
+    python -m loadtest.run_loadtest --json-out result.json --baseline last.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SECTION_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<hs:sec xmlns:hs="http://www.hancom.co.kr/hwpml/2011/section" xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph">
+{paragraphs}
+</hs:sec>"""
+PARAGRAPH_XML = '<hp:p><hp:run><hp:t>{text}</hp:t></hp:run><hp:linesegarray><hp:lineseg/></hp:linesegarray></hp:p>'
+
+
+def make_sample_hwpx(paragraphs: int = 20) -> bytes:
+    """번역기 호출용 최소 HWPX"""
+    body = "\n".join(
+        PARAGRAPH_XML.format(text=f"충주시 {i}번째 안내 문단입니다. 신청 기간은 3월 {i % 28 + 1}일까지입니다.")
+        for i in range(paragraphs)
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("mimetype", "application/hwp+zip", compress_type=zipfile.ZIP_STORED)
+        zf.writestr("Contents/header.xml", '<?xml version="1.0" encoding="UTF-8"?><hh:head xmlns:hh="urn:h"/>')
+        zf.writestr("Contents/section0.xml", SECTION_XML.format(paragraphs=body))
+    return buffer.getvalue()
+
+
+SAMPLE_CSV = "이름,부서,점수\n" + "\n".join(f"직원{i},부서{i % 5},{i * 7 % 100}" for i in range(50))
+SAMPLE_MEETING = "\n".join(
+    f"{'시장' if i % 3 == 0 else '과장'}: 안건 {i}에 대해 관련 부서의 추진 현황을 보고하고 향후 계획을 논의하였습니다."
+    for i in range(30)
+)
+
+
+@dataclass
+class Scenario:
+    """엔드포인트 호출 하나"""
+    name: str
+    router: str
+    method: str
+    path: str
+    build: Callable[[], Dict] = field(default=lambda: {})
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("health", "health", "GET", "/api/health"),
+    Scenario("press-release.generate", "press-release", "POST", "/api/press-release/generate",
+             lambda: {"json": {"title": "충주시 봄꽃 축제 개최", "content": "4월 개최\n호암지 일원\n체험 행사"}}),
+    Scenario("election-law.ask", "election-law", "POST", "/api/election-law/ask",
+             lambda: {"json": {"question": "선거운동 기간은 언제부터인가요?", "target": "all"}}),
+    Scenario("news.summarize", "news", "POST", "/api/news/summarize",
+             lambda: {"json": {"title": "충주시 소식", "content": "충주시는 올해 신규 사업을 추진한다. " * 30}}),
+    Scenario("merit-report.generate", "merit-report", "POST", "/api/merit-report/generate",
+             lambda: {"json": {
+                 "name": "홍길동", "position": "행정6급", "department": "자치행정과", "start_date": "2010. 3. 2.",
+                 "award_type": "시장 표창", "achievement_area": "지역 행정",
+                 "merit_points": ["민원 처리 기간 단축", "지역 축제 안전 관리", "예산 절감"],
+             }}),
+    Scenario("data-analysis.upload", "data-analysis", "POST", "/api/data-analysis/upload",
+             lambda: {"files": {"file": ("sample.csv", SAMPLE_CSV.encode("utf-8"), "text/csv")}}),
+    Scenario("translator.translate", "translator", "POST", "/api/translator/translate",
+             lambda: {"files": {"file": ("sample.hwpx", make_sample_hwpx(), "application/octet-stream")},
+                      "data": {"target_lang": "EN-US"}}),
+    Scenario("geocoder.address-to-coord", "geocoder", "POST", "/api/geocoder/address-to-coord",
+             lambda: {"json": {"address": "충청북도 충주시 금릉동 123-4"}}),
+    Scenario("kakao-promo.generate", "kakao-promo", "POST", "/api/kakao-promo/generate",
+             lambda: {"json": {"category": "축제", "content": "충주 사과 축제가 10월에 열립니다."}}),
+    Scenario("kakao-promo.generate-batch", "kakao-promo", "POST", "/api/kakao-promo/generate-batch",
+             lambda: {"json": {"categories": ["시정홍보", "이벤트", "축제"], "n": 2,
+                               "content": "충주 사과 축제가 10월에 열립니다."}}),
+    Scenario("excel-merger.preview", "excel-merger", "POST", "/api/excel-merger/preview",
+             lambda: {"files": {"file": ("sample.csv", SAMPLE_CSV.encode("utf-8"), "text/csv")}}),
+    Scenario("meeting.summarize", "meeting", "POST", "/api/meeting/summarize",
+             lambda: {"json": {"text": SAMPLE_MEETING, "summary_mode": "표준"}}),
+    Scenario("report-writer.generate", "report-writer", "POST", "/api/report-writer/generate",
+             lambda: {"json": {"title": "방범 CCTV 확충 계획", "report_type": "계획 보고서",
+                               "detail_type": "기본 계획", "keywords": "CCTV, 방범", "length": "표준"}}),
+    Scenario("report-writer.generate-parallel", "report-writer", "POST", "/api/report-writer/generate",
+             lambda: {"json": {"title": "방범 CCTV 확충 계획", "report_type": "계획 보고서",
+                               "detail_type": "기본 계획", "keywords": "CCTV, 방범", "length": "표준",
+                               "parallel": True}}),
+    Scenario("auth.status", "auth", "GET", "/api/auth/status"),
+    Scenario("board.status", "board", "GET", "/api/board/status"),
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_fake_upstream(profile: Dict, seed: Optional[int]) -> str:
+    """대역 서버를 백그라운드 스레드에서 실행하고 주소 반환"""
+    import uvicorn
+    from loadtest.fake_upstream import create_app, UpstreamState
+
+    port = _free_port()
+    config = uvicorn.Config(create_app(UpstreamState(profile, seed=seed)), host="127.0.0.1",
+                            port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 10
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("대역 서버 기동 실패")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def point_backend_at(upstream_url: str):
+    """백엔드 설정이 대역 서버를 보도록 환경변수 설정 (앱 import 전에 호출)"""
+    os.environ["OPENAI_API_KEY"] = os.environ.get("LOADTEST_OPENAI_KEY", "sk-loadtest")
+    os.environ["OPENAI_BASE_URL"] = f"{upstream_url}/v1"
+    os.environ["DEEPL_API_KEY"] = "loadtest-key"
+    os.environ["DEEPL_SERVER_URL"] = upstream_url
+    os.environ["KAKAO_API_KEY"] = "loadtest-key"
+    os.environ["KAKAO_API_BASE_URL"] = upstream_url
+
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int) -> Dict:
+    """시나리오 하나를 requests회, 동시 concurrency개로 실행"""
+    latencies, errors, statuses = [], 0, {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, scenario.path, **scenario.build())
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            if not (isinstance(status, int) and status < 400):
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "endpoint": scenario.name,
+        "router": scenario.router,
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 1),
+    }
+
+
+def print_report(results: List[Dict]):
+    header = f"{'endpoint':<30} {'req':>5} {'err':>5} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}"
+    print("\n" + header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['endpoint']:<30} {r['requests']:>5} {r['errors']:>5} {r['throughput_rps']:>8.2f} "
+              f"{r['p50_ms']:>7.0f}ms {r['p95_ms']:>7.0f}ms {r['p99_ms']:>7.0f}ms")
+
+
+def compare_baseline(results: List[Dict], baseline_path: str, max_regression: float) -> List[str]:
+    """기준 결과 대비 p95 악화/오류 증가 항목"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["endpoint"]: r for r in json.load(f)["results"]}
+
+    regressions = []
+    for r in results:
+        base = baseline.get(r["endpoint"])
+        if not base:
+            continue
+        if base["p95_ms"] > 0 and r["p95_ms"] > base["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{r['endpoint']}: p95 {base['p95_ms']:.0f}ms → {r['p95_ms']:.0f}ms")
+        if r["errors"] > base["errors"]:
+            regressions.append(f"{r['endpoint']}: 오류 {base['errors']} → {r['errors']}")
+    return regressions
+
+
+async def main_async(args) -> int:
+    from loadtest.fake_upstream import DEFAULT_PROFILE
+    import httpx
+
+    profile = {}
+    if args.profile:
+        with open(args.profile, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    if args.latency_ms is not None:
+        profile.setdefault("chat", {})["median_ms"] = args.latency_ms
+    if args.error_rate is not None:
+        for key in DEFAULT_PROFILE:
+            profile.setdefault(key, {})["error_rate"] = args.error_rate
+
+    upstream_url = args.upstream_url or start_fake_upstream(profile, args.seed)
+    print(f"🧪 대역 서버: {upstream_url}")
+
+    if args.backend_url:
+        transport = None
+        base_url = args.backend_url
+    else:
+        point_backend_at(upstream_url)
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://backend"
+
+    scenarios = SCENARIOS
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(",")}
+        scenarios = [s for s in SCENARIOS if s.router in wanted or s.name in wanted]
+
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+        for scenario in scenarios:
+            print(f"▶ {scenario.name} ({args.requests}회, 동시 {args.concurrency})")
+            results.append(await run_scenario(client, scenario, args.requests, args.concurrency))
+
+        async with httpx.AsyncClient(timeout=10) as upstream:
+            upstream_stats = (await upstream.get(f"{upstream_url}/__stats")).json()
+
+    print_report(results)
+    print(f"\n📡 대역 서버 호출 수: {upstream_stats.get('calls')} / 오류 주입: {upstream_stats.get('errors')}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "upstream": upstream_stats, "args": vars(args)}, f,
+                      ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline, args.max_regression)
+        if regressions:
+            print("\n❌ 회귀 감지:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ 기준 대비 회귀 없음")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대역 서버 기반 엔드투엔드 부하 테스트")
+    parser.add_argument("--requests", type=int, default=30, help="엔드포인트당 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="엔드포인트당 동시 요청 수")
+    parser.add_argument("--only", help="실행할 라우터/엔드포인트 (쉼표 구분)")
+    parser.add_argument("--backend-url", help="이미 떠 있는 백엔드 주소 (없으면 프로세스 내 실행)")
+    parser.add_argument("--upstream-url", help="이미 떠 있는 대역 서버 주소 (없으면 자동 실행)")
+    parser.add_argument("--profile", help="대역 서버 지연/오류 프로필 JSON")
+    parser.add_argument("--latency-ms", type=float, help="chat completions 중앙 지연 (ms)")
+    parser.add_argument("--error-rate", type=float, help="대역 서버 오류율 (0~1)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json-out", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 p95 악화 비율")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,15 @@ Azure Container Apps 배포용
 #import langchain_experimental
 #print(f"🔍 langchain_experimental version: {langchain_experimental.__version__}")
 
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 
 from config import settings
+from services import metrics
 from routers import press_release, election_law, news, health
 from routers import merit_report, data_analysis, translator
 from routers import address_geocoder, kakao_promo, excel_merger, meeting_summarizer
@@ -26,6 +30,7 @@ async def lifespan(app: FastAPI):
     print(f"📍 CORS Origins: {settings.cors_origins_list}")
     yield
     # 종료 시
+    translator.shutdown_job_pool()
     print("👋 백엔드 종료")
 
 
@@ -44,9 +49,28 @@ app.add_middleware(
     #allow_methods=["*"],
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["X-Processed-Count", "X-Total-Rows", "X-Total-Cols", "X-Errors"],
+    expose_headers=["X-Processed-Count", "X-Total-Rows", "X-Total-Cols", "X-Errors",
+                    "X-Translation-Languages", "X-Translation-Segments", "X-Translation-Skipped", "X-Translation-Unique", "X-DeepL-Segments",
+                    "X-DeepL-Calls", "X-GPT-Calls", "X-Translation-Seconds",
+                    "X-TM-DeepL-Hits", "X-TM-GPT-Hits"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """라우트별 요청 처리 시간 기록"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # 등록된 라우트 템플릿 기준 (매칭 실패 시 unmatched로 묶음)
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        metrics.observe_http_request(request.method, path, status, time.perf_counter() - start)
+
+
 # 라우터 등록
 app.include_router(health.router, prefix="/api", tags=["Health"])
 app.include_router(press_release.router, prefix="/api/press-release", tags=["Press Release"])
@@ -77,6 +101,13 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus 지표"""
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
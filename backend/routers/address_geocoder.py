@@ -6,12 +6,12 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import pandas as pd
-import httpx
 import io
 import re
 import os
 
 from config import settings
+from services.metrics import external_client
 
 router = APIRouter()
 
@@ -83,11 +83,11 @@ async def get_coords_from_kakao(address: str) -> Dict[str, Any]:
     if not KAKAO_API_KEY:
         return {"lat": None, "lon": None, "accuracy": "", "error": "API 키 미설정"}
     
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
+    url = f"{settings.KAKAO_API_BASE_URL}/v2/local/search/address.json"
     headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
     params = {"query": address}
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("kakao") as client:
         try:
             r = await client.get(url, headers=headers, params=params)
             if r.status_code == 200:
@@ -148,11 +148,11 @@ async def get_address_from_kakao(lat: float, lon: float) -> Dict[str, Any]:
     if not KAKAO_API_KEY:
         return {"jibun": None, "road": None, "error": "API 키 미설정"}
     
-    url = "https://dapi.kakao.com/v2/local/geo/coord2address.json"
+    url = f"{settings.KAKAO_API_BASE_URL}/v2/local/geo/coord2address.json"
     headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
     params = {"x": lon, "y": lat}
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("kakao") as client:
         try:
             r = await client.get(url, headers=headers, params=params)
             if r.status_code == 200:
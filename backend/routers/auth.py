@@ -5,9 +5,9 @@
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-import httpx
 
 from config import settings
+from services.metrics import external_client
 
 router = APIRouter()
 
@@ -68,7 +68,7 @@ HEADERS = {
 async def signup(request: SignUpRequest):
     """회원가입 - OTP 이메일 발송"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             # 1. 회원가입 요청 (이메일 OTP 발송됨)
             response = await client.post(
                 f"{SUPABASE_URL}/auth/v1/signup",
@@ -125,7 +125,7 @@ async def signup(request: SignUpRequest):
 async def verify_otp(request: VerifyOTPRequest):
     """OTP 코드 검증"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             response = await client.post(
                 f"{SUPABASE_URL}/auth/v1/verify",
                 headers=HEADERS,
@@ -162,7 +162,7 @@ async def verify_otp(request: VerifyOTPRequest):
 async def resend_otp(request: ResendOTPRequest):
     """OTP 재발송"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             response = await client.post(
                 f"{SUPABASE_URL}/auth/v1/resend",
                 headers=HEADERS,
@@ -191,7 +191,7 @@ async def resend_otp(request: ResendOTPRequest):
 async def login(request: LoginRequest):
     """로그인"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             response = await client.post(
                 f"{SUPABASE_URL}/auth/v1/token?grant_type=password",
                 headers=HEADERS,
@@ -234,7 +234,7 @@ async def logout(authorization: Optional[str] = Header(None)):
         
         token = authorization.replace("Bearer ", "")
         
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             await client.post(
                 f"{SUPABASE_URL}/auth/v1/logout",
                 headers={
@@ -258,7 +258,7 @@ async def verify_token(authorization: Optional[str] = Header(None)):
         
         token = authorization.replace("Bearer ", "")
         
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             response = await client.get(
                 f"{SUPABASE_URL}/auth/v1/user",
                 headers={
@@ -288,7 +288,7 @@ async def verify_token(authorization: Optional[str] = Header(None)):
 async def refresh_token(refresh_token: str):
     """토큰 갱신"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             response = await client.post(
                 f"{SUPABASE_URL}/auth/v1/token?grant_type=refresh_token",
                 headers=HEADERS,
@@ -320,7 +320,7 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
     
     token = authorization.replace("Bearer ", "")
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         # 1. 사용자 정보 가져오기
         user_response = await client.get(
             f"{SUPABASE_URL}/auth/v1/user",
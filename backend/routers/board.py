@@ -4,10 +4,10 @@
 from fastapi import APIRouter, HTTPException, Header, UploadFile, File, Form
 from pydantic import BaseModel
 from typing import Optional, List
-import httpx
 from datetime import datetime
 
 from config import settings
+from services.metrics import external_client
 
 router = APIRouter()
 
@@ -61,7 +61,7 @@ async def get_user_from_token(authorization: str) -> dict:
     
     token = authorization.replace("Bearer ", "")
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         response = await client.get(
             f"{SUPABASE_URL}/auth/v1/user",
             headers={**HEADERS, "Authorization": f"Bearer {token}"}
@@ -75,7 +75,7 @@ async def get_user_from_token(authorization: str) -> dict:
 
 async def get_user_role(user_id: str, token: str) -> str:
     """사용자 권한 조회"""
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         response = await client.get(
             f"{SUPABASE_URL}/rest/v1/user_profiles?id=eq.{user_id}&select=role",
             headers={**HEADERS, "Authorization": f"Bearer {token}"}
@@ -113,7 +113,7 @@ async def get_board_list(
     
     offset = (page - 1) * limit
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         # 게시글 목록
         response = await client.get(
             f"{SUPABASE_URL}/rest/v1/boards?board_type=eq.{board_type}&select=id,title,author_email,created_at,view_count,file_name&order=created_at.desc&offset={offset}&limit={limit}",
@@ -160,7 +160,7 @@ async def get_board_detail(
     user = await get_user_from_token(authorization)
     token = authorization.replace("Bearer ", "")
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         # 게시글 조회
         response = await client.get(
             f"{SUPABASE_URL}/rest/v1/boards?id=eq.{board_id}&select=*",
@@ -203,7 +203,7 @@ async def create_board(
     if board.board_type in ['notice', 'archive'] and not is_admin:
         raise HTTPException(status_code=403, detail="관리자만 작성할 수 있습니다")
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         response = await client.post(
             f"{SUPABASE_URL}/rest/v1/boards",
             headers={**HEADERS, "Authorization": f"Bearer {token}", "Prefer": "return=representation"},
@@ -252,7 +252,7 @@ async def create_board_with_file(
         safe_filename = f"{uuid.uuid4().hex}.{file_ext}"
         storage_path = f"{board_type}/{datetime.now().strftime('%Y%m%d')}_{safe_filename}"
         
-        async with httpx.AsyncClient() as client:
+        async with external_client("supabase") as client:
             upload_response = await client.post(
                 f"{SUPABASE_URL}/storage/v1/object/boards/{storage_path}",
                 headers={
@@ -271,7 +271,7 @@ async def create_board_with_file(
                 print(f"Upload failed: {upload_response.text}")
     
     # 게시글 저장
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         response = await client.post(
             f"{SUPABASE_URL}/rest/v1/boards",
             headers={**HEADERS, "Authorization": f"Bearer {token}", "Prefer": "return=representation"},
@@ -303,7 +303,7 @@ async def update_board(
     token = authorization.replace("Bearer ", "")
     
     # 기존 게시글 확인
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         existing = await client.get(
             f"{SUPABASE_URL}/rest/v1/boards?id=eq.{board_id}&select=author_id,board_type",
             headers={**HEADERS, "Authorization": f"Bearer {token}"}
@@ -346,7 +346,7 @@ async def delete_board(
     user, is_admin = await check_admin(authorization)
     token = authorization.replace("Bearer ", "")
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         # 기존 게시글 확인
         existing = await client.get(
             f"{SUPABASE_URL}/rest/v1/boards?id=eq.{board_id}&select=author_id",
@@ -390,7 +390,7 @@ async def create_answer(
     if not is_admin:
         raise HTTPException(status_code=403, detail="관리자만 답변할 수 있습니다")
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         # 게시글 존재 확인
         board_check = await client.get(
             f"{SUPABASE_URL}/rest/v1/boards?id=eq.{board_id}&board_type=eq.qna&select=id",
@@ -430,7 +430,7 @@ async def delete_answer(
     if not is_admin:
         raise HTTPException(status_code=403, detail="관리자만 삭제할 수 있습니다")
     
-    async with httpx.AsyncClient() as client:
+    async with external_client("supabase") as client:
         response = await client.delete(
             f"{SUPABASE_URL}/rest/v1/board_answers?id=eq.{answer_id}",
             headers={**HEADERS, "Authorization": f"Bearer {token}"}
@@ -161,7 +161,8 @@ async def analyze_data(request: AnalyzeRequest):
             ChatOpenAI(
                 temperature=0,
                 model=AGENT_MODEL,
-                api_key=settings.OPENAI_API_KEY
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None
             ),
             df,
             verbose=True,
@@ -1,17 +1,22 @@
 """선거법 챗봇 API"""
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
 
 from services.vectorstore import VectorStoreService
 from services.openai_service import OpenAIService
+from services.question_classifier import get_question_classifier
 from utils.prompt_filter import check_text_security
+from utils.context_packer import pack_context
+from config import settings
 
 router = APIRouter()
 
 # 서비스 인스턴스
 vectorstore = VectorStoreService()
-openai_service = OpenAIService()
+openai_service = OpenAIService(endpoint="election_law", hedge=True)
 
 # 검색 대상 목록
 SEARCH_TARGETS = {
@@ -47,23 +52,34 @@ async def ask_question(request: QuestionRequest):
         raise HTTPException(status_code=400, detail="잘못된 검색 대상입니다.")
     
     try:
-        # 1. 질문 유형 분류
-        question_type = await classify_question_type(request.question)
-        
-        # 2. 관련 문서 검색
-        if question_type == "list_type":
-            # 목록형 질문: 멀티쿼리 검색
-            references = await search_multi_query(request.question, request.target)
-        else:
-            # 일반 질문: 단일 검색
-            references = await vectorstore.search_election_law(
+        # 1. 질문 유형 분류 + 단일 검색을 동시에 시작 (대부분의 질문은 단일 검색 결과를 그대로 사용)
+        speculative_search = asyncio.create_task(
+            vectorstore.search_election_law(
                 query=request.question,
                 target=request.target,
                 top_k=5
             )
+        )
+        try:
+            question_type = await classify_question_type(request.question)
+        except BaseException:
+            speculative_search.cancel()
+            raise
+        
+        # 2. 관련 문서 검색
+        if question_type == "list_type":
+            # 목록형 질문: 멀티쿼리 검색 (실패 시 선행 검색 결과로 대체)
+            references = await search_multi_query(
+                request.question,
+                request.target,
+                fallback=speculative_search
+            )
+        else:
+            # 일반 질문: 선행 단일 검색 결과 재사용
+            references = await speculative_search
         
         # 3. 답변 생성
-        answer = await generate_answer(
+        answer, context_stats = await generate_answer(
             question=request.question,
             references=references,
             question_type=question_type
@@ -72,7 +88,8 @@ async def ask_question(request: QuestionRequest):
         return {
             "answer": answer,
             "references": references[:3],  # 상위 3개만 반환
-            "question_type": question_type
+            "question_type": question_type,
+            "context_stats": context_stats
         }
         
     except Exception as e:
@@ -80,7 +97,21 @@ async def ask_question(request: QuestionRequest):
 
 
 async def classify_question_type(question: str) -> str:
-    """질문 유형 분류"""
+    """질문 유형 분류 (로컬 임베딩 분류기 우선, 확신도가 낮을 때만 LLM)"""
+    try:
+        label, confidence = await asyncio.to_thread(get_question_classifier().predict, question)
+        if label:
+            print(f"🏷️ 질문 유형(로컬): {label} ({confidence:.2f})")
+            return label
+        print(f"🏷️ 로컬 분류 확신도 낮음 ({confidence:.2f}) → LLM 분류")
+    except Exception as e:
+        print(f"⚠️ 로컬 질문 분류 실패, LLM 분류 사용: {e}")
+    
+    return await classify_question_type_llm(question)
+
+
+async def classify_question_type_llm(question: str) -> str:
+    """질문 유형 분류 (LLM)"""
     prompt = f"""다음 질문의 유형을 분류해주세요.
 
 질문: {question}
@@ -108,8 +139,12 @@ async def classify_question_type(question: str) -> str:
         return "general"
 
 
-async def search_multi_query(question: str, target: str) -> List[dict]:
-    """멀티쿼리 검색 (목록형 질문용)"""
+async def search_multi_query(question: str, target: str, fallback: Optional[asyncio.Task] = None) -> List[dict]:
+    """
+    멀티쿼리 검색 (목록형 질문용)
+
+    fallback: 원본 질문으로 미리 시작한 검색 태스크 (실패 시 재검색 대신 사용)
+    """
     # 서브쿼리 생성
     prompt = f"""다음 질문에 답하기 위해 검색해야 할 키워드나 하위 질문 3개를 생성하세요.
 
@@ -128,16 +163,16 @@ JSON 형식으로 출력:
         import json
         sub_queries = json.loads(result)
         
-        # 각 서브쿼리로 검색
+        # 서브쿼리 전체를 한 번에 인코딩/검색
         all_results = []
         seen_contents = set()
         
-        for sub_query in sub_queries:
-            docs = await vectorstore.search_election_law(
-                query=sub_query,
-                target=target,
-                top_k=3
-            )
+        batch_results = await vectorstore.search_election_law_batch(
+            queries=[str(q) for q in sub_queries],
+            target=target,
+            top_k=3
+        )
+        for docs in batch_results:
             for doc in docs:
                 content_hash = hash(doc.get("content", "")[:100])
                 if content_hash not in seen_contents:
@@ -146,10 +181,14 @@ JSON 형식으로 출력:
         
         # 유사도 기준 정렬
         all_results.sort(key=lambda x: x.get("similarity", 0), reverse=True)
+        if fallback is not None:
+            fallback.cancel()
         return all_results[:10]
         
     except Exception as e:
         # 폴백: 원본 질문으로 검색
+        if fallback is not None:
+            return await fallback
         return await vectorstore.search_election_law(
             query=question,
             target=target,
@@ -157,15 +196,24 @@ JSON 형식으로 출력:
         )
 
 
-async def generate_answer(question: str, references: List[dict], question_type: str) -> str:
-    """답변 생성"""
+async def generate_answer(question: str, references: List[dict], question_type: str) -> tuple:
+    """답변 생성 -> (answer, context_stats)"""
     if not references:
-        return "죄송합니다. 관련 정보를 찾을 수 없습니다. 질문을 다시 확인해주세요."
+        return "죄송합니다. 관련 정보를 찾을 수 없습니다. 질문을 다시 확인해주세요.", None
+    
+    # 참고 문서 텍스트 구성 (중복 제거 + 토큰 예산 내로 압축)
+    packed, context_stats = pack_context(
+        references,
+        token_budget=settings.ELECTION_LAW_CONTEXT_TOKENS,
+        max_chars=800,
+        max_docs=5,
+        model=openai_service.model
+    )
+    print(f"📦 선거법 컨텍스트: {context_stats['tokens_used']}토큰 (절감 {context_stats['tokens_saved']}토큰)")
     
-    # 참고 문서 텍스트 구성
     ref_text = "\n\n".join([
-        f"[참고 {i+1}] (유사도: {doc.get('similarity', 0):.2f})\n{doc.get('content', '')[:800]}"
-        for i, doc in enumerate(references[:5])
+        f"[참고 {i+1}] (유사도: {doc.get('similarity', 0):.2f})\n{doc.get('content', '')}"
+        for i, doc in enumerate(packed)
     ])
     
     if question_type == "list_type":
@@ -201,7 +249,7 @@ async def generate_answer(question: str, references: List[dict], question_type:
         temperature=0
     )
     
-    return result
+    return result, context_stats
 
 
 @router.get("/targets")
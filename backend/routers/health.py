@@ -2,6 +2,10 @@
 from fastapi import APIRouter
 from datetime import datetime
 
+from services.llm_hedge import get_hedge_policy
+from services.llm_scheduler import get_scheduler
+from services.prompt_registry import list_prompts
+
 router = APIRouter()
 
 
@@ -14,3 +18,14 @@ async def health_check():
         "service": "cj-ai-backend",
         "platform": "Azure Container Apps"
     }
+
+
+@router.get("/health/llm")
+async def llm_scheduler_status():
+    """LLM 스케줄러 상태 (모델별 대기열 깊이, 대기시간, 재시도 수, 헤지 요청, 프롬프트 템플릿)"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "models": get_scheduler().snapshot(),
+        "hedging": get_hedge_policy().snapshot(),
+        "prompts": list_prompts()
+    }
@@ -1,21 +1,37 @@
 """
 카카오채널 홍보문구 생성기 API
 """
+import asyncio
+import base64
+import hashlib
+import time
+from collections import OrderedDict
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel
-from typing import Optional
-from openai import OpenAI
+from typing import List, Optional
 
 from config import settings
+from services.openai_service import OpenAIService
+from services.prompt_registry import register_prompt
+from utils.image_preprocess import prepare_image_for_vision
 
 router = APIRouter()
 
-# OpenAI 클라이언트
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+# OpenAI 서비스 (전역 스케줄러 경유)
+openai_service = OpenAIService(endpoint="kakao_promo")
+
+# 일괄 생성 한도
+MAX_BATCH_VARIANTS = 5
+
+OCR_PROMPT = "이 이미지에서 모든 텍스트를 추출해주세요. 텍스트만 출력하고 다른 설명은 하지 마세요."
+
+# 이미지 OCR 결과 캐시 (업로드 원본 sha256 -> 추출 텍스트)
+_ocr_cache: "OrderedDict[str, str]" = OrderedDict()
 
 
 # ===== 프롬프트 템플릿 =====
-PROMPT_TEMPLATES = {
+# 카테고리별 고정 지침(system) + 원본 내용(user) 구성 (services.prompt_registry 참고)
+PROMO_SYSTEM_PROMPTS = {
     "시정홍보": """당신은 충주시청 홍보 담당자입니다.
 아래 내용을 바탕으로 카카오톡 채널용 홍보 메시지를 작성해주세요.
 
@@ -29,10 +45,7 @@ PROMPT_TEMPLATES = {
 - 시민 눈높이에 맞춘 쉬운 설명
 - 충주시민에게 도움이 되는 정보 강조
 
-[원본 내용]
-{content}
-
-위 내용으로 카카오톡 채널 홍보 메시지를 작성해주세요.""",
+사용자가 보내는 [원본 내용]으로 카카오톡 채널 홍보 메시지를 작성해주세요.""",
 
     "정책공지": """당신은 충주시청 정책홍보 담당자입니다.
 아래 정책/공지 내용을 카카오톡 채널용 메시지로 변환해주세요.
@@ -46,10 +59,7 @@ PROMPT_TEMPLATES = {
 - 공식적이되 딱딱하지 않게
 - 핵심 정보를 빠뜨리지 않도록
 
-[원본 내용]
-{content}
-
-위 내용으로 정책 공지 메시지를 작성해주세요.""",
+사용자가 보내는 [원본 내용]으로 정책 공지 메시지를 작성해주세요.""",
 
     "문화행사": """당신은 충주시 문화관광 홍보 담당자입니다.
 아래 행사 정보를 매력적인 카카오톡 채널 메시지로 작성해주세요.
@@ -63,10 +73,7 @@ PROMPT_TEMPLATES = {
 - 설레고 기대되는 분위기
 - 참여 욕구를 자극하는 문구
 
-[원본 내용]
-{content}
-
-위 내용으로 문화행사 홍보 메시지를 작성해주세요.""",
+사용자가 보내는 [원본 내용]으로 문화행사 홍보 메시지를 작성해주세요.""",
 
     "축제": """당신은 충주시 축제 홍보 담당자입니다.
 아래 축제 정보를 열정적인 카카오톡 채널 메시지로 작성해주세요.
@@ -80,10 +87,7 @@ PROMPT_TEMPLATES = {
 - 축제의 즐거움과 설렘 전달
 - 충주만의 특색 강조
 
-[원본 내용]
-{content}
-
-위 내용으로 축제 홍보 메시지를 작성해주세요.""",
+사용자가 보내는 [원본 내용]으로 축제 홍보 메시지를 작성해주세요.""",
 
     "이벤트": """당신은 충주시 SNS 이벤트 담당자입니다.
 아래 이벤트 내용을 참여를 유도하는 카카오톡 채널 메시지로 작성해주세요.
@@ -98,10 +102,7 @@ PROMPT_TEMPLATES = {
 - 참여하고 싶게 만드는 매력적인 문구
 - 쉽고 간단하다는 느낌
 
-[원본 내용]
-{content}
-
-위 내용으로 이벤트 홍보 메시지를 작성해주세요.""",
+사용자가 보내는 [원본 내용]으로 이벤트 홍보 메시지를 작성해주세요.""",
 
     "재난알림": """당신은 충주시 재난안전 담당자입니다.
 아래 재난/안전 정보를 긴급한 카카오톡 채널 메시지로 작성해주세요.
@@ -116,10 +117,7 @@ PROMPT_TEMPLATES = {
 - 긴급하고 진지한 톤
 - 불필요한 수식어 없이 명확하게
 
-[원본 내용]
-{content}
-
-위 내용으로 재난알림 메시지를 작성해주세요.""",
+사용자가 보내는 [원본 내용]으로 재난알림 메시지를 작성해주세요.""",
 
     "기타": """당신은 충주시청 홍보 담당자입니다.
 아래 내용을 카카오톡 채널용 홍보 메시지로 작성해주세요.
@@ -133,10 +131,12 @@ PROMPT_TEMPLATES = {
 - 친근하고 읽기 쉽게
 - 충주시민 눈높이에 맞춰
 
-[원본 내용]
-{content}
+사용자가 보내는 [원본 내용]으로 홍보 메시지를 작성해주세요."""
+}
 
-위 내용으로 홍보 메시지를 작성해주세요."""
+PROMPT_TEMPLATES = {
+    category: register_prompt(f"kakao_promo.{category}", system=system, tail="[원본 내용]\n{content}")
+    for category, system in PROMO_SYSTEM_PROMPTS.items()
 }
 
 
@@ -150,6 +150,30 @@ class PromoResponse(BaseModel):
     category: str
 
 
+class PromoBatchRequest(BaseModel):
+    content: str
+    categories: List[str]
+    n: int = 1  # 카테고리별 후보 개수
+
+
+class PromoVariant(BaseModel):
+    category: str
+    variant: int
+    result: str
+    latency: float  # 해당 후보를 받기까지 걸린 시간 (초)
+
+
+class PromoBatchError(BaseModel):
+    category: str
+    error: str
+
+
+class PromoBatchResponse(BaseModel):
+    results: List[PromoVariant]
+    errors: List[PromoBatchError] = []
+    total_time: float
+
+
 @router.get("/categories")
 async def get_categories():
     """카테고리 목록 조회"""
@@ -176,17 +200,14 @@ async def generate_promo(request: PromoRequest):
         raise HTTPException(status_code=400, detail="잘못된 카테고리입니다.")
     
     try:
-        prompt = PROMPT_TEMPLATES[request.category].format(content=request.content)
-        
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+        result = await openai_service.generate_prompt(
+            PROMPT_TEMPLATES[request.category],
+            {"content": request.content},
+            max_tokens=1000,
             temperature=0.7,
-            max_tokens=1000
+            model="gpt-4o-mini"
         )
         
-        result = completion.choices[0].message.content
-        
         return PromoResponse(
             result=result,
             category=request.category
@@ -196,6 +217,127 @@ async def generate_promo(request: PromoRequest):
         raise HTTPException(status_code=500, detail=f"생성 실패: {str(e)}")
 
 
+@router.post("/generate-batch", response_model=PromoBatchResponse)
+async def generate_promo_batch(request: PromoBatchRequest):
+    """
+    여러 카테고리 홍보문구 일괄 생성
+
+    카테고리별 호출을 동시에 보내고, 후보 n개는 OpenAI n 파라미터로 한 번에 받음.
+    일부 카테고리가 실패해도 나머지 결과는 반환 (errors에 실패 사유)
+    """
+    if not request.content.strip():
+        raise HTTPException(status_code=400, detail="내용을 입력해주세요.")
+    
+    categories = list(dict.fromkeys(request.categories))
+    if not categories:
+        raise HTTPException(status_code=400, detail="카테고리를 1개 이상 선택해주세요.")
+    
+    invalid = [c for c in categories if c not in PROMPT_TEMPLATES]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"잘못된 카테고리입니다: {', '.join(invalid)}")
+    
+    if not 1 <= request.n <= MAX_BATCH_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"후보 개수는 1~{MAX_BATCH_VARIANTS}개까지 가능합니다.")
+    
+    start_time = time.time()
+    
+    async def generate_category(category: str) -> List[PromoVariant]:
+        call_start = time.time()
+        template = PROMPT_TEMPLATES[category]
+        response = await openai_service.chat_completion(
+            messages=template.render(content=request.content),
+            model="gpt-4o-mini",
+            prompt_name=template.name,
+            max_tokens=1000,
+            temperature=0.7,
+            n=request.n
+        )
+        latency = round(time.time() - call_start, 2)
+        return [
+            PromoVariant(
+                category=category,
+                variant=choice.index + 1,
+                result=(choice.message.content or "").strip(),
+                latency=latency
+            )
+            for choice in response.choices
+        ]
+    
+    outcomes = await asyncio.gather(*(generate_category(c) for c in categories), return_exceptions=True)
+    
+    results, errors = [], []
+    for category, outcome in zip(categories, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append(PromoBatchError(category=category, error=f"생성 실패: {str(outcome)}"))
+        else:
+            results.extend(outcome)
+    
+    if not results:
+        raise HTTPException(status_code=500, detail=f"생성 실패: {errors[0].error if errors else ''}")
+    
+    return PromoBatchResponse(
+        results=results,
+        errors=errors,
+        total_time=round(time.time() - start_time, 2)
+    )
+
+
+async def extract_image_text(image_bytes: bytes, content_type: str) -> tuple:
+    """
+    이미지 텍스트 추출 (같은 이미지는 캐시에서 반환)
+
+    비전 모델에는 KAKAO_OCR_MAX_DIMENSION/KAKAO_OCR_JPEG_QUALITY로 축소·재인코딩한 이미지를 전송
+
+    Returns:
+        (추출 텍스트, 캐시 여부, 전처리 통계 또는 None)
+    """
+    key = hashlib.sha256(image_bytes).hexdigest()
+    cached = _ocr_cache.get(key)
+    if cached is not None:
+        _ocr_cache.move_to_end(key)
+        print(f"♻️ OCR 캐시 사용: {key[:12]}")
+        return cached, True, None
+    
+    prepared, mime, stats = await asyncio.to_thread(
+        prepare_image_for_vision,
+        image_bytes,
+        settings.KAKAO_OCR_MAX_DIMENSION,
+        settings.KAKAO_OCR_JPEG_QUALITY,
+        content_type
+    )
+    print(f"🖼️ OCR 이미지 {stats['original_bytes'] // 1024}KB → {stats['sent_bytes'] // 1024}KB")
+    base64_image = base64.b64encode(prepared).decode('utf-8')
+    
+    ocr_response = await openai_service.chat_completion(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": OCR_PROMPT
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime};base64,{base64_image}"
+                        }
+                    }
+                ]
+            }
+        ],
+        max_tokens=1000
+    )
+    
+    ocr_text = ocr_response.choices[0].message.content or ""
+    _ocr_cache[key] = ocr_text
+    while len(_ocr_cache) > settings.KAKAO_OCR_CACHE_SIZE:
+        _ocr_cache.popitem(last=False)
+    
+    return ocr_text, False, stats
+
+
 @router.post("/generate-with-image")
 async def generate_promo_with_image(
     category: str = Form(...),
@@ -206,39 +348,14 @@ async def generate_promo_with_image(
     final_content = content or ""
     
     # 이미지가 있으면 OCR 처리 (GPT-4 Vision 사용)
+    ocr_cached = False
+    image_stats = None
     if image:
         try:
-            import base64
             image_bytes = await image.read()
-            base64_image = base64.b64encode(image_bytes).decode('utf-8')
-            
-            # 이미지 MIME 타입 확인
-            content_type = image.content_type or "image/jpeg"
-            
-            # GPT-4 Vision으로 이미지 텍스트 추출
-            ocr_response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "이 이미지에서 모든 텍스트를 추출해주세요. 텍스트만 출력하고 다른 설명은 하지 마세요."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{content_type};base64,{base64_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                max_tokens=1000
+            ocr_text, ocr_cached, image_stats = await extract_image_text(
+                image_bytes, image.content_type or "image/jpeg"
             )
-            
-            ocr_text = ocr_response.choices[0].message.content
             final_content = ocr_text + "\n" + final_content
             
         except Exception as e:
@@ -249,21 +366,20 @@ async def generate_promo_with_image(
     
     # 홍보문구 생성
     try:
-        prompt = PROMPT_TEMPLATES.get(category, PROMPT_TEMPLATES["기타"]).format(content=final_content)
-        
-        completion = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+        result = await openai_service.generate_prompt(
+            PROMPT_TEMPLATES.get(category, PROMPT_TEMPLATES["기타"]),
+            {"content": final_content},
+            max_tokens=1000,
             temperature=0.7,
-            max_tokens=1000
+            model="gpt-4o-mini"
         )
         
-        result = completion.choices[0].message.content
-        
         return {
             "result": result,
             "category": category,
-            "extracted_text": final_content if image else None
+            "extracted_text": final_content if image else None,
+            "ocr_cached": ocr_cached,
+            "image_stats": image_stats
         }
         
     except Exception as e:
@@ -1,24 +1,37 @@
 """
 회의요약기 API (GPT 기반)
 """
+import asyncio
+import hashlib
+import json
 import os
 import re
 import time
+from collections import OrderedDict
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, List, Any
-from openai import OpenAI
+from typing import Awaitable, Callable, Optional, Dict, List, Any
 
 from config import settings
+from services.openai_service import OpenAIService
+from services.prompt_registry import register_prompt
 
 router = APIRouter()
 
-# OpenAI 클라이언트
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+# OpenAI 서비스 (전역 스케줄러 경유)
+openai_service = OpenAIService(endpoint="meeting_summarizer")
 
 # 모델 설정
 FULL_MODEL = "gpt-4o"
 SUMMARY_TOKENS = 3000
+CHUNK_SUMMARY_TOKENS = 1200
+
+# 구간 요약/통합 결과 캐시 (회의록 뒷부분만 바뀐 재요청 시 앞 구간 재사용)
+_summary_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# 진행 상황 콜백 (stage, done, total, cached)
+ProgressCallback = Callable[[str, int, int, int], Awaitable[None]]
 
 # 충주시 부서/지역 데이터 (하드코딩)
 DEPARTMENTS = [
@@ -190,6 +203,51 @@ def _split_by_speaker(text: str) -> List[tuple]:
     return blocks
 
 
+def _chunk_by_speaker(text: str, max_chars: int) -> List[str]:
+    """
+    발화자 경계 기준으로 max_chars 이하 구간으로 묶기
+
+    앞에서부터 채우므로 회의록 뒷부분이 바뀌어도 앞 구간은 그대로 유지됨.
+    한 발화가 max_chars를 넘으면 줄 단위(그래도 넘으면 글자 단위)로 자름
+    """
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    first = next((i for i, ln in enumerate(lines) if _SP_LABEL.match(ln)), len(lines))
+    # 첫 발화자 라벨 이전 내용(회의 개요 등)은 _split_by_speaker가 버리므로 별도 블록으로 유지
+    blocks = (["\n".join(lines[:first])] if first else []) + [blk for _, blk in _split_by_speaker(text)]
+
+    pieces = []
+    for blk in blocks:
+        if len(blk) <= max_chars:
+            pieces.append(blk)
+            continue
+        buf = ""
+        for ln in blk.splitlines():
+            while len(ln) > max_chars:
+                if buf:
+                    pieces.append(buf)
+                    buf = ""
+                pieces.append(ln[:max_chars])
+                ln = ln[max_chars:]
+            if buf and len(buf) + 1 + len(ln) > max_chars:
+                pieces.append(buf)
+                buf = ln
+            else:
+                buf = f"{buf}\n{ln}" if buf else ln
+        if buf:
+            pieces.append(buf)
+
+    chunks, buf = [], ""
+    for piece in pieces:
+        if buf and len(buf) + 2 + len(piece) > max_chars:
+            chunks.append(buf)
+            buf = piece
+        else:
+            buf = f"{buf}\n\n{piece}" if buf else piece
+    if buf:
+        chunks.append(buf)
+    return chunks
+
+
 def _filter_focus(text: str, pattern: Optional[str]) -> str:
     """특정 발화자에 집중"""
     if not pattern:
@@ -240,31 +298,18 @@ def enhance_text_with_terms(text: str) -> tuple:
     return enhanced_text, corrections[:10]
 
 
-def build_summary_prompt(text: str, mode: str, focus_pattern: Optional[str], is_focused: bool) -> str:
-    """요약 프롬프트 생성"""
-    config = MODE_CONFIG[mode]
-    length_category = detect_input_length_category(text)
-    anti_hallucination = get_anti_hallucination_instruction(length_category)
-    
-    short_note = ""
-    if length_category in ["아주짧음", "짧음"]:
-        short_note = f"""
-## 📌 입력 길이 참고
-현재 입력은 **{len(text)}자**로 짧은 편입니다. 
-- 출력 분량도 이에 맞게 간결하게 유지하세요.
-"""
-    
-    if is_focused:
-        return f"""당신은 행정기관 회의록 요약 전문가입니다.
+# 요약 프롬프트 (고정 지침 → 요청별 상세도/원문 순서, services.prompt_registry 참고)
+SUMMARY_PROMPT = register_prompt(
+    "meeting_summary",
+    system="""당신은 행정기관 회의록 요약 전문가입니다.
+사용자가 보내는 회의록(또는 특정 발화자의 발언)을 주제별로 분류하여 요청된 상세도로 요약합니다.
 
-다음은 특정 발화자({focus_pattern})의 발언 내용입니다. 이 발화자의 발언을 주제별로 분류하고 {mode} 수준으로 요약해주세요.
-{anti_hallucination}
-{short_note}
 ## 요약 원칙:
-1. **주제 추출**: 발화자의 발언을 논리적 주제로 분류
-2. **{mode} 상세도**: {config['설명']} - 각 주제별로 {config['주제당_문장수']} ({config['문장당_길이']})
+1. **주제 추출**: 요약 대상 내용을 논리적 주제로 분류
+2. **상세도 준수**: 요청된 상세도의 주제당 문장 수와 문장 길이를 따름
 3. **자연스러운 문체**: 행정문서체이지만 읽기 쉽게 작성
-4. **원문 충실**: 원문에 없는 내용은 절대 추가하지 않음
+4. **균형감**: 전체 회의 요약이면 모든 참석자의 중요 발언을 적절히 반영
+5. **원문 충실**: 원문에 없는 내용은 절대 추가하지 않음
 
 ## 문체 가이드:
 - 종결어미: "~하도록 할 예정", "~에 대해 논의함", "~을 추진 중" 등
@@ -272,44 +317,106 @@ def build_summary_prompt(text: str, mode: str, focus_pattern: Optional[str], is_
 
 ## 출력 형식:
 ▣ 주제명
-◦ 내용 설명
+◦ 내용 설명""",
+    tail="""## 요약 대상
+{scope}
 
+## {mode} 상세도
+{description} - 각 주제별로 {sentences} ({sentence_length})
+{anti_hallucination}{short_note}
 ---
-발화자 발언 내용:
+{source_label}:
 {text}
 ---
-발화자의 발언을 주제별로 분류하고 {mode} 상세도로 요약해 주세요 (원문에 없는 내용 추가 금지):"""
-    
-    else:
-        return f"""당신은 행정기관 회의록 요약 전문가입니다.
+{closing}""",
+)
 
-다음 전체 회의록의 핵심 내용을 주제별로 분류하여 {mode} 수준으로 요약하세요.
-{anti_hallucination}
-{short_note}
-## 요약 원칙:
-1. **주제 추출**: 회의 전체 내용을 논리적 주제로 분류
-2. **{mode} 상세도**: {config['설명']} - 각 주제별로 {config['주제당_문장수']} ({config['문장당_길이']})
-3. **자연스러운 문체**: 행정문서체이지만 읽기 쉽게 작성
-4. **균형감**: 모든 참석자의 중요 발언을 적절히 반영
-5. **원문 충실**: 원문에 없는 내용은 절대 추가하지 않음
+DIRECTIVE_PROMPT = register_prompt(
+    "meeting_directive",
+    system="""당신은 행정기관 회의록을 '지시사항' 형태로 정리하는 전문가입니다.
+사용자가 보내는 텍스트를 검토하여 주제별 핵심 내용을 정리하되, **원문에 있는 내용만** 지시사항 형태로 변환하세요.
 
-## 문체 가이드:
-- 종결어미: "~하도록 할 예정", "~에 대해 논의함", "~을 추진 중" 등
-- 구어체 배제: 문서체로 변환
+## 작성 규칙
+- 원문에 내용이 충분하면: 각 주제별 4~6문장
+- 원문이 짧으면: 원문 길이에 맞게 간결하게 작성
+- "~임/~됨/~필요함/~바람" 표현은 "~할 것"으로 변환
+- **원문에 없는 구체적 날짜, 수치, 부서명, 담당자를 생성하지 말 것**
 
-## 출력 형식:
+## 출력 형식
 ▣ 주제명
-◦ 내용 설명
-
+◦ 지시형으로 변환된 내용""",
+    tail="""## 정리 범위
+{scope}의 주제별 핵심 내용
+{anti_hallucination}{length_note}
 ---
-전체 회의록:
+분석 대상 텍스트{who}:
 {text}
 ---
-회의 내용을 주제별로 분류하고 {mode} 상세도로 요약해 주세요 (원문에 없는 내용 추가 금지):"""
+위 지침에 따라 원문 내용만 사용하여 지시사항 형태로 변환:""",
+)
+
+CHUNK_PROMPT = register_prompt(
+    "meeting_chunk",
+    system="""당신은 행정기관 회의록 요약 전문가입니다.
+사용자가 보내는 것은 긴 회의록을 나눈 구간 중 하나입니다.
+이 구간에서 논의된 내용을 주제별로 정리하세요. 이 결과는 이후 전체 요약의 재료로 쓰입니다.
+
+## 정리 원칙:
+1. 주제별로 발언자, 결정사항, 요청·지시사항, 수치, 일정, 담당 부서를 빠짐없이 기록
+2. 원문에 없는 내용은 절대 추가하지 않음
+3. 인사말, 진행 멘트 등 실질 내용이 없는 발언은 생략
+4. 행정문서체로 간결하게 작성
+
+## 출력 형식:
+▣ 주제명
+◦ 내용 (발언자)""",
+    tail="""---
+회의록 {index}/{total} 구간:
+{chunk}
+---
+이 구간의 내용을 주제별로 정리해 주세요 (원문에 없는 내용 추가 금지):""",
+)
 
 
-def build_directive_prompt(text: str, mode: str, focus_pattern: Optional[str], is_focused: bool) -> str:
-    """지시사항 프롬프트 생성"""
+def build_summary_prompt(text: str, mode: str, focus_pattern: Optional[str], is_focused: bool) -> Dict[str, Any]:
+    """요약 프롬프트(SUMMARY_PROMPT)에 채울 요청별 값"""
+    config = MODE_CONFIG[mode]
+    length_category = detect_input_length_category(text)
+    anti_hallucination = get_anti_hallucination_instruction(length_category)
+    
+    short_note = ""
+    if length_category in ["아주짧음", "짧음"]:
+        short_note = f"""
+## 📌 입력 길이 참고
+현재 입력은 **{len(text)}자**로 짧은 편입니다. 
+- 출력 분량도 이에 맞게 간결하게 유지하세요.
+"""
+    
+    if is_focused:
+        scope = f"특정 발화자({focus_pattern})의 발언 - 이 발화자의 발언을 주제별로 분류"
+        source_label = "발화자 발언 내용"
+        closing = f"발화자의 발언을 주제별로 분류하고 {mode} 상세도로 요약해 주세요 (원문에 없는 내용 추가 금지):"
+    else:
+        scope = "전체 회의록 - 회의 전체 내용을 논리적 주제로 분류"
+        source_label = "전체 회의록"
+        closing = f"회의 내용을 주제별로 분류하고 {mode} 상세도로 요약해 주세요 (원문에 없는 내용 추가 금지):"
+    
+    return {
+        "scope": scope,
+        "mode": mode,
+        "description": config["설명"],
+        "sentences": config["주제당_문장수"],
+        "sentence_length": config["문장당_길이"],
+        "anti_hallucination": anti_hallucination,
+        "short_note": short_note,
+        "source_label": source_label,
+        "text": text,
+        "closing": closing,
+    }
+
+
+def build_directive_prompt(text: str, mode: str, focus_pattern: Optional[str], is_focused: bool) -> Dict[str, Any]:
+    """지시사항 프롬프트(DIRECTIVE_PROMPT)에 채울 요청별 값"""
     length_category = detect_input_length_category(text)
     anti_hallucination = get_anti_hallucination_instruction(length_category)
     
@@ -322,30 +429,58 @@ def build_directive_prompt(text: str, mode: str, focus_pattern: Optional[str], i
 - 형식을 채우기 위해 없는 내용을 만들지 마세요.
 """
     
+    return {
+        "scope": "해당 발화자의 발언" if is_focused else "전체 회의록",
+        "anti_hallucination": anti_hallucination,
+        "length_note": length_note,
+        "who": f" (대상 발화자: {focus_pattern})" if (is_focused and focus_pattern) else "",
+        "text": text,
+    }
+
+
+def build_reduce_prompt(partials: List[str], mode: str, focus_pattern: Optional[str],
+                        is_focused: bool, directive_mode: bool) -> str:
+    """reduce 단계: 구간별 중간 요약을 하나의 ▣/◦ 요약으로 통합하는 프롬프트"""
+    config = MODE_CONFIG[mode]
+    sections = "\n\n".join(f"[구간 {i}]\n{p}" for i, p in enumerate(partials, 1))
     who = f" (대상 발화자: {focus_pattern})" if (is_focused and focus_pattern) else ""
-    scope = "해당 발화자의 발언에서" if is_focused else "전체 회의록에서"
-    
-    return f"""당신은 행정기관 회의록을 '지시사항' 형태로 정리하는 전문가입니다.
-{anti_hallucination}
-{length_note}
-다음 텍스트를 검토하여 {scope} 주제별 핵심 내용을 정리하되, 
-**원문에 있는 내용만** 지시사항 형태로 변환하세요.
 
-## 작성 규칙
-- 원문에 내용이 충분하면: 각 주제별 4~6문장
-- 원문이 짧으면: 원문 길이에 맞게 간결하게 작성
+    if directive_mode:
+        style = """## 작성 규칙
+- 각 주제별 4~6문장
 - "~임/~됨/~필요함/~바람" 표현은 "~할 것"으로 변환
-- **원문에 없는 구체적 날짜, 수치, 부서명, 담당자를 생성하지 말 것**
+- **중간 요약에 없는 구체적 날짜, 수치, 부서명, 담당자를 생성하지 말 것**
 
 ## 출력 형식
 ▣ 주제명
-◦ 지시형으로 변환된 내용
+◦ 지시형으로 변환된 내용"""
+    else:
+        style = f"""## 요약 원칙:
+1. **{mode} 상세도**: {config['설명']} - 각 주제별로 {config['주제당_문장수']} ({config['문장당_길이']})
+2. **자연스러운 문체**: 행정문서체이지만 읽기 쉽게 작성
+3. **균형감**: 모든 구간의 중요 내용을 적절히 반영
+
+## 문체 가이드:
+- 종결어미: "~하도록 할 예정", "~에 대해 논의함", "~을 추진 중" 등
+- 구어체 배제: 문서체로 변환
+
+## 출력 형식:
+▣ 주제명
+◦ 내용 설명"""
+
+    return f"""당신은 행정기관 회의록 요약 전문가입니다.
+
+다음은 긴 회의록{who}을 {len(partials)}개 구간으로 나누어 정리한 중간 요약입니다.
+여러 구간에 걸친 같은 주제는 하나로 합치고, 회의 진행 순서를 유지하여 최종 요약을 작성하세요.
+중간 요약에 없는 내용은 절대 추가하지 마세요.
+
+{style}
 
 ---
-분석 대상 텍스트{who}:
-{text}
+구간별 중간 요약:
+{sections}
 ---
-위 지침에 따라 원문 내용만 사용하여 지시사항 형태로 변환:"""
+위 중간 요약을 통합하여 최종 요약을 작성해 주세요 (원문에 없는 내용 추가 금지):"""
 
 
 def extract_action_items(summary: str) -> List[Dict[str, str]]:
@@ -438,6 +573,108 @@ def _format_basic_summary(summary: str) -> str:
     return '\n'.join(formatted_lines)
 
 
+def _cache_key(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    value = _summary_cache.get(key)
+    if value is not None:
+        _summary_cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: str, value: str):
+    _summary_cache[key] = value
+    _summary_cache.move_to_end(key)
+    while len(_summary_cache) > settings.MEETING_SUMMARY_CACHE_SIZE:
+        _summary_cache.popitem(last=False)
+
+
+async def map_reduce_summary(
+    text: str,
+    mode: str,
+    focus_pattern: Optional[str],
+    is_focused: bool,
+    directive_mode: bool,
+    route: Dict,
+    on_progress: Optional[ProgressCallback] = None,
+) -> tuple:
+    """
+    긴 회의록 map-reduce 요약
+
+    1) 발화자 경계로 구간 분할 -> 2) 구간별 중간 요약을 동시 호출 제한 내에서 병렬 생성
+    -> 3) 중간 요약을 ▣/◦ 형식으로 통합.
+    구간 요약은 구간 원문 해시로, 통합 결과는 중간 요약 목록 해시로 캐시하므로
+    뒷부분만 바뀐 회의록은 바뀐 구간과 통합 단계만 다시 호출함
+
+    Returns:
+        (summary, stats)
+    """
+    chunks = _chunk_by_speaker(text, settings.MEETING_CHUNK_CHARS)
+    total = len(chunks)
+    map_model = settings.LLM_MODEL_TIERS.get(settings.MEETING_MAP_TIER, route["model"])
+    semaphore = asyncio.Semaphore(settings.MEETING_MAP_CONCURRENCY)
+    partials: List[Optional[str]] = [None] * total
+    done = 0
+    cached = 0
+
+    async def report(stage: str, n: int, of: int):
+        print(f"📝 회의록 요약 [{stage}] {n}/{of} (캐시 {cached})")
+        if on_progress:
+            await on_progress(stage, n, of, cached)
+
+    async def summarize_chunk(i: int, chunk: str):
+        nonlocal done, cached
+        key = _cache_key("map", map_model, chunk)
+        partial = _cache_get(key)
+        if partial is None:
+            async with semaphore:
+                partial = await openai_service.generate_prompt(
+                    CHUNK_PROMPT,
+                    {"chunk": chunk, "index": i + 1, "total": total},
+                    max_tokens=CHUNK_SUMMARY_TOKENS,
+                    temperature=0.2,
+                    model=map_model,
+                    priority="batch",
+                )
+            _cache_put(key, partial)
+        else:
+            cached += 1
+        partials[i] = partial
+        done += 1
+        await report("map", done, total)
+
+    await report("map", 0, total)
+    await asyncio.gather(*(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+
+    reduce_key = _cache_key(
+        "reduce", route["model"], mode, focus_pattern or "", str(is_focused), str(directive_mode), *partials
+    )
+    summary = _cache_get(reduce_key)
+    reduce_cached = summary is not None
+    if summary is None:
+        await report("reduce", 0, 1)
+        summary = await openai_service.generate_text(
+            prompt=build_reduce_prompt(partials, mode, focus_pattern, is_focused, directive_mode),
+            max_tokens=route["max_tokens"],
+            temperature=0.3,
+            system_prompt=None,
+            model=route["model"],
+            priority="batch",
+        )
+        _cache_put(reduce_key, summary)
+    await report("reduce", 1, 1)
+
+    stats = {
+        "chunk_count": total,
+        "cached_chunks": cached,
+        "reduce_cached": reduce_cached,
+        "map_model": map_model,
+    }
+    return summary, stats
+
+
 # ===== API 엔드포인트 =====
 @router.get("/modes")
 async def get_modes():
@@ -467,109 +704,164 @@ async def get_system_info():
     }
 
 
-@router.post("/summarize", response_model=SummarizeResponse)
-async def summarize_meeting(request: SummarizeRequest):
-    """회의록 요약"""
-    if not request.text.strip():
-        raise HTTPException(status_code=400, detail="회의록 텍스트를 입력해주세요.")
-    
+async def _run_summary(request: SummarizeRequest, on_progress: Optional[ProgressCallback] = None) -> SummarizeResponse:
+    """요약 파이프라인 (긴 회의록은 map-reduce, 그 외는 단일 호출)"""
     start_time = time.time()
     
-    try:
-        # 1) 전처리
-        prepped = _propagate_last_label(request.text)
-        
-        # 발화자 필터링
-        if request.focus_pattern:
-            text_to_summarize = _filter_focus(prepped, request.focus_pattern)
-            is_focused = True
-            if not text_to_summarize.strip() or text_to_summarize == prepped:
-                text_to_summarize = prepped
-                is_focused = False
-        else:
+    # 1) 전처리
+    prepped = _propagate_last_label(request.text)
+    
+    # 발화자 필터링
+    if request.focus_pattern:
+        text_to_summarize = _filter_focus(prepped, request.focus_pattern)
+        is_focused = True
+        if not text_to_summarize.strip() or text_to_summarize == prepped:
             text_to_summarize = prepped
             is_focused = False
-        
-        # 2) 용어 보정
-        enhanced_text, corrections = enhance_text_with_terms(text_to_summarize)
-        
-        # 3) 모드 자동 조정
-        length_category = detect_input_length_category(enhanced_text)
-        effective_mode, mode_msg = get_effective_mode(
-            request.summary_mode, 
-            enhanced_text, 
-            request.auto_adjust_mode
+    else:
+        text_to_summarize = prepped
+        is_focused = False
+    
+    # 2) 용어 보정
+    enhanced_text, corrections = enhance_text_with_terms(text_to_summarize)
+    
+    # 3) 모드 자동 조정
+    length_category = detect_input_length_category(enhanced_text)
+    effective_mode, mode_msg = get_effective_mode(
+        request.summary_mode, 
+        enhanced_text, 
+        request.auto_adjust_mode
+    )
+    
+    # 모델 등급/토큰 수 조정 (짧은 입력은 config 정책에 따라 경량 모델 + 작은 max_tokens)
+    route = openai_service.route_model(
+        input_chars=len(enhanced_text.strip()),
+        default_max_tokens=SUMMARY_TOKENS if is_focused else SUMMARY_TOKENS * 2,
+        default_model=FULL_MODEL
+    )
+    
+    map_reduce_stats = {}
+    if len(enhanced_text) >= settings.MEETING_MAP_REDUCE_MIN_CHARS:
+        # 4-5) 긴 회의록: 구간별 병렬 요약 후 통합
+        summary, map_reduce_stats = await map_reduce_summary(
+            enhanced_text, effective_mode, request.focus_pattern, is_focused,
+            request.directive_mode, route, on_progress
         )
-        
+    else:
         # 4) 프롬프트 생성
         if request.directive_mode:
-            prompt = build_directive_prompt(enhanced_text, effective_mode, request.focus_pattern, is_focused)
+            template = DIRECTIVE_PROMPT
+            values = build_directive_prompt(enhanced_text, effective_mode, request.focus_pattern, is_focused)
         else:
-            prompt = build_summary_prompt(enhanced_text, effective_mode, request.focus_pattern, is_focused)
-        
-        # 토큰 수 조정
-        if length_category in ["아주짧음", "짧음"]:
-            max_tokens = 500
-        elif length_category == "보통":
-            max_tokens = 1000
-        else:
-            max_tokens = SUMMARY_TOKENS if is_focused else SUMMARY_TOKENS * 2
+            template = SUMMARY_PROMPT
+            values = build_summary_prompt(enhanced_text, effective_mode, request.focus_pattern, is_focused)
         
         temperature = 0.2 if length_category in ["아주짧음", "짧음"] else 0.3
         
-        # 5) GPT 호출
-        response = client.chat.completions.create(
-            model=FULL_MODEL,
-            messages=[{"role": "user", "content": prompt}],
+        # 5) GPT 호출 (대용량 생성이므로 batch 우선순위)
+        summary = await openai_service.generate_prompt(
+            template,
+            values,
+            max_tokens=route["max_tokens"],
             temperature=temperature,
-            max_tokens=max_tokens,
-        )
-        
-        summary = response.choices[0].message.content.strip()
-        
-        # 6) 검증
-        is_valid, validation_msg = validate_summary(summary, effective_mode, is_focused, length_category)
-        if not is_valid:
-            summary = _format_basic_summary(summary)
-            validation_msg = "기본 형식 적용"
-        
-        # 7) 액션 아이템 추출
-        actions = []
-        if request.extract_actions and length_category not in ["아주짧음"]:
-            action_dicts = extract_action_items(summary)
-            actions = [ActionItem(**a) for a in action_dicts]
-        
-        # 8) 통계
-        speakers = _split_by_speaker(prepped)
-        processing_time = time.time() - start_time
-        
-        summary_type = "발화자 집중 요약" if is_focused else "전체 회의 요약"
-        
-        analysis_stats = {
-            "speaker_count": len(speakers),
-            "topic_count": summary.count("▣"),
-            "keyword_count": len(corrections),
-            "processing_time": round(processing_time, 1),
-            "validation_status": validation_msg,
-            "corrections": corrections[:5],
-            "summary_type": summary_type,
-            "input_length": len(request.text),
-            "input_category": length_category,
-            "effective_mode": effective_mode,
-            "original_mode": request.summary_mode,
-            "mode_adjustment": mode_msg,
-        }
-        
-        return SummarizeResponse(
-            summary=summary.replace("\n", "  \n"),
-            actions=actions,
-            analysis_stats=analysis_stats
+            model=route["model"],
+            priority="batch",
         )
-        
+    
+    # 6) 검증
+    is_valid, validation_msg = validate_summary(summary, effective_mode, is_focused, length_category)
+    if not is_valid:
+        summary = _format_basic_summary(summary)
+        validation_msg = "기본 형식 적용"
+    
+    # 7) 액션 아이템 추출
+    actions = []
+    if request.extract_actions and length_category not in ["아주짧음"]:
+        action_dicts = extract_action_items(summary)
+        actions = [ActionItem(**a) for a in action_dicts]
+    
+    # 8) 통계
+    speakers = _split_by_speaker(prepped)
+    processing_time = time.time() - start_time
+    
+    summary_type = "발화자 집중 요약" if is_focused else "전체 회의 요약"
+    
+    analysis_stats = {
+        "speaker_count": len(speakers),
+        "topic_count": summary.count("▣"),
+        "keyword_count": len(corrections),
+        "processing_time": round(processing_time, 1),
+        "validation_status": validation_msg,
+        "corrections": corrections[:5],
+        "summary_type": summary_type,
+        "input_length": len(request.text),
+        "input_category": length_category,
+        "effective_mode": effective_mode,
+        "original_mode": request.summary_mode,
+        "mode_adjustment": mode_msg,
+        "model": route["model"],
+        "model_tier": route["tier"],
+        **map_reduce_stats,
+    }
+    
+    return SummarizeResponse(
+        summary=summary.replace("\n", "  \n"),
+        actions=actions,
+        analysis_stats=analysis_stats
+    )
+
+
+@router.post("/summarize", response_model=SummarizeResponse)
+async def summarize_meeting(request: SummarizeRequest):
+    """회의록 요약"""
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="회의록 텍스트를 입력해주세요.")
+    
+    try:
+        return await _run_summary(request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"요약 처리 중 오류: {str(e)}")
 
 
+@router.post("/summarize-stream")
+async def summarize_meeting_stream(request: SummarizeRequest):
+    """
+    회의록 요약 (진행 상황 스트리밍)
+
+    NDJSON으로 한 줄씩 전송:
+    {"type": "progress", "stage": "map"|"reduce", "done", "total", "cached"} ... 
+    마지막에 {"type": "result", ...SummarizeResponse} 또는 {"type": "error", "detail"}
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="회의록 텍스트를 입력해주세요.")
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def on_progress(stage: str, done: int, total: int, cached: int):
+        await queue.put({"type": "progress", "stage": stage, "done": done, "total": total, "cached": cached})
+    
+    async def worker():
+        try:
+            result = await _run_summary(request, on_progress)
+            await queue.put({"type": "result", **result.model_dump()})
+        except Exception as e:
+            await queue.put({"type": "error", "detail": f"요약 처리 중 오류: {str(e)}"})
+    
+    async def event_stream():
+        task = asyncio.create_task(worker())
+        try:
+            while True:
+                event = await queue.get()
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+                if event["type"] in ("result", "error"):
+                    break
+        finally:
+            if not task.done():
+                task.cancel()
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @router.post("/summarize-file")
 async def summarize_file(
     file: UploadFile = File(...),
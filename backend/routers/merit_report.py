@@ -1,15 +1,31 @@
 """
 공적조서 생성기 API
 """
+import asyncio
+import re
+import time
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-from openai import OpenAI
 
 from config import settings
+from services.openai_service import OpenAIService
 
 router = APIRouter()
 
+# OpenAI 서비스 (전역 스케줄러 경유)
+openai_service = OpenAIService(endpoint="merit_report")
+
+# 공적요지 1건(챕터)당 / 서론 최대 토큰
+CHAPTER_TOKENS = 1500
+INTRO_TOKENS = 600
+
+FIXED_CHAPTER_TITLE = "공사생활에서 항상 남을 배려하는 모범 공직자"
+FIXED_CHAPTER_BODY = "위 공무원은 평소 동료와 시민을 배려하는 따뜻한 성품을 바탕으로 직무를 수행해왔으며, 상사에게는 신뢰받는 직원으로, 동료에게는 친근한 동료로서 공직사회의 귀감이 되고 있습니다."
+
+# 챕터 제목 앞에 모델이 붙인 번호/기호 제거용
+_TITLE_PREFIX = re.compile(r"^\s*(\d+[.)]|[-•▣□■◦*#]+|제목\s*:)\s*")
+
 
 class MeritReportRequest(BaseModel):
     name: str
@@ -24,85 +40,137 @@ class MeritReportRequest(BaseModel):
 class MeritReportResponse(BaseModel):
     result: str
     generation_time: float
+    chapter_times: List[float] = []  # 공적요지별 생성 시간 (초)
 
 
-@router.post("/generate", response_model=MeritReportResponse)
-async def generate_merit_report(request: MeritReportRequest):
-    """
-    공적조서 생성
-    """
-    import time
-    start_time = time.time()
-    
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    
-    # 공적요지 포맷팅
-    merit_str = "\n".join([f"{i+1}. {point}" for i, point in enumerate(request.merit_points)])
-    
-    prompt = f"""당신은 충주시의 공무원 공적조서를 작성하는 행정 전문가입니다.
+def build_intro_prompt(request: MeritReportRequest, merit_str: str) -> str:
+    """서론(도입부) 프롬프트"""
+    return f"""당신은 충주시의 공무원 공적조서를 작성하는 행정 전문가입니다.
 
-아래 입력 정보를 바탕으로, 포상 대상 공무원의 공적조서를 다음 조건에 맞게 작성해주세요.
+아래 입력 정보를 바탕으로, 포상 대상 공무원 공적조서의 도입부(서론) 한 문단만 작성해주세요.
 
 [기본 정보]
-- 소속: {request.department}
-- 직급: {request.position}
-- 성명: {request.name}
 - 임용일: {request.start_date}
 - 표창 종류: {request.award_type}
 - 공적 분야: {request.achievement_area}
 
-- 공적요지 목록:
+- 공적요지 목록 (본문은 별도로 작성되므로 참고만 하십시오):
 {merit_str}
 
 [작성 조건]
-
-1. 공적조서의 시작은 다음과 같이 구성합니다:
-- 소속 : {request.department}
-- 직급 : {request.position}
-- 성명 : {request.name}
-
-2. 도입부(서론)는 다음 기준에 따라 작성합니다:
 - 첫 문장은 반드시 아래 형식을 따릅니다:
-  "위 공무원은 {request.start_date} 임용된 이래로"  
+  "위 공무원은 {request.start_date} 임용된 이래로"
 - 서론에서는 "위 공무원은"이라는 표현만 사용하며, 성명, 직급은 사용하지 않습니다.
 - 공직자로서의 태도, 책임감, 전문성, 해당 분야에서의 헌신을 통합적으로 서술하십시오.
 - 서론 마지막 문장은 반드시 아래 형식을 따릅니다:
   "{request.achievement_area} 발전에 지대한 공로가 인정되는 바, 그 공적을 나열하면 다음과 같습니다."
+- 모든 문장은 과거형 서술체(예: ~하였습니다, ~기여하였습니다)로 작성하십시오.
+- 서론 문단 외에 제목, 기본 정보, 본문은 출력하지 마십시오.
+"""
 
-3. 본문은 각 공적요지 항목별로 다음 기준에 따라 작성합니다:
-- 각 항목마다 제목과 함께 두 개의 소챕터로 나누어 작성하십시오.
-- 각 소챕터는 **최소 6문장 이상**으로 풍부하고 구체적으로 작성하십시오.
-- 첫 번째 문단은 해당 공적요지를 기반으로 일반적인 성과, 의미, 효과를 중심으로 서술하십시오.
-- 두 번째 문단은 괄호로 제시된 구체 사례가 있는 경우, 해당 사례를 중심으로 실천 내용, 추진 배경, 실행 방식, 구체적인 성과 등을 상세하게 서술하십시오.
-- 본문에서는 "위 공무원"이라는 표현을 사용하지 마십시오.
-- 성명과 직급은 본문 전체에서 절대 사용하지 않습니다.
 
-4. 본문 마지막에는 아래 고정 챕터를 반드시 삽입하십시오:
-- 제목: 공사생활에서 항상 남을 배려하는 모범 공직자
-- 내용: 위 공무원은 평소 동료와 시민을 배려하는 따뜻한 성품을 바탕으로 직무를 수행해왔으며, 상사에게는 신뢰받는 직원으로, 동료에게는 친근한 동료로서 공직사회의 귀감이 되고 있습니다.
+def build_chapter_prompt(request: MeritReportRequest, point: str, index: int, total: int) -> str:
+    """본문 챕터(공적요지 1건) 프롬프트"""
+    return f"""당신은 충주시의 공무원 공적조서를 작성하는 행정 전문가입니다.
+
+공적조서 본문은 공적요지 {total}건을 챕터별로 나누어 작성 중이며, 이번에는 {index}번째 공적요지 챕터 하나만 작성합니다.
+
+[기본 정보]
+- 공적 분야: {request.achievement_area}
+- 공적요지: {point}
 
-5. 마지막 문단은 다음 형식을 따르십시오:
-"위와 같은 공로를 세운 상기인은 올바른 공직자상을 정립하고, 맡은 바 직분에 끊임없는 노력과 연구를 아끼지 않으며, 묵묵히 소신과 열정으로 {request.achievement_area} 업무를 추진해 온 바, {request.award_type}에 추천하고자 합니다."
+[작성 조건]
+- 첫 줄에는 공적요지를 나타내는 챕터 제목만 번호 없이 작성하십시오.
+- 제목 아래는 두 개의 소챕터로 나누어 작성하고, 각 소챕터는 소제목 한 줄과 문단으로 구성하십시오.
+- 각 소챕터는 **최소 6문장 이상**으로 풍부하고 구체적으로 작성하십시오.
+- 첫 번째 소챕터는 해당 공적요지를 기반으로 일반적인 성과, 의미, 효과를 중심으로 서술하십시오.
+- 두 번째 소챕터는 괄호로 제시된 구체 사례가 있는 경우, 해당 사례를 중심으로 실천 내용, 추진 배경, 실행 방식, 구체적인 성과 등을 상세하게 서술하십시오.
+- "위 공무원"이라는 표현을 사용하지 마십시오.
+- 성명과 직급은 절대 사용하지 않습니다.
 
 [기타 작성 지침]
 - 모든 문장은 과거형 서술체(예: ~하였습니다, ~기여하였습니다)로 작성하십시오.
 - 문장은 간결하면서도 구체적이고 사실 중심이어야 합니다.
+- 이 챕터 외에 서론, 다른 공적요지, 맺음말은 출력하지 마십시오.
 """
 
+
+def format_chapter(index: int, text: str) -> str:
+    """모델 출력 챕터의 제목에 순번을 붙여 정리"""
+    lines = text.strip().splitlines() or [""]
+    title = _TITLE_PREFIX.sub("", lines[0]).strip().strip("*")
+    body = "\n".join(lines[1:]).strip()
+    return f"{index}. {title}\n\n{body}" if body else f"{index}. {title}"
+
+
+def assemble_report(request: MeritReportRequest, intro: str, chapters: List[str]) -> str:
+    """머리말 → 서론 → 공적요지 챕터(입력 순서) → 고정 챕터 → 맺음말 순으로 조립"""
+    parts = [
+        f"- 소속 : {request.department}\n- 직급 : {request.position}\n- 성명 : {request.name}",
+        intro.strip(),
+    ]
+    parts += [format_chapter(i + 1, chapter) for i, chapter in enumerate(chapters)]
+    parts.append(f"{len(chapters) + 1}. {FIXED_CHAPTER_TITLE}\n\n{FIXED_CHAPTER_BODY}")
+    parts.append(
+        f"위와 같은 공로를 세운 상기인은 올바른 공직자상을 정립하고, 맡은 바 직분에 끊임없는 노력과 연구를 아끼지 않으며, "
+        f"묵묵히 소신과 열정으로 {request.achievement_area} 업무를 추진해 온 바, {request.award_type}에 추천하고자 합니다."
+    )
+    return "\n\n".join(parts)
+
+
+@router.post("/generate", response_model=MeritReportResponse)
+async def generate_merit_report(request: MeritReportRequest):
+    """
+    공적조서 생성
+
+    서론(경량 모델)과 공적요지별 챕터를 동시에 생성한 뒤 입력 순서대로 조립.
+    머리말, 고정 챕터, 맺음말은 정해진 문구라 모델을 호출하지 않음
+    """
+    start_time = time.time()
+    
+    # 공적요지 포맷팅
+    merit_str = "\n".join([f"{i+1}. {point}" for i, point in enumerate(request.merit_points)])
+    
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
+        # 본문 모델 등급 선택 (config.LLM_ROUTING_POLICY, 기본 full 등급 + 지연 목표 초과 시 하향)
+        route = openai_service.route_model(
+            input_chars=len(merit_str),
+            default_max_tokens=CHAPTER_TOKENS,
+            default_model="gpt-4o"
+        )
+        
+        async def generate_chapter(index: int, point: str) -> tuple:
+            chapter_start = time.time()
+            text = await openai_service.generate_text(
+                prompt=build_chapter_prompt(request, point, index, len(request.merit_points)),
+                max_tokens=min(route["max_tokens"], CHAPTER_TOKENS),
+                temperature=0.4,
+                system_prompt=None,
+                model=route["model"],
+                priority="batch"
+            )
+            return text, round(time.time() - chapter_start, 2)
+        
+        intro_task = openai_service.generate_text(
+            prompt=build_intro_prompt(request, merit_str),
+            max_tokens=INTRO_TOKENS,
             temperature=0.4,
-            max_tokens=3000
+            system_prompt=None,
+            model=settings.LLM_MODEL_TIERS.get("fast", route["model"]),
+            priority="batch"
+        )
+        intro, *chapter_results = await asyncio.gather(
+            intro_task,
+            *(generate_chapter(i + 1, point) for i, point in enumerate(request.merit_points))
         )
         
-        result = response.choices[0].message.content
+        result = assemble_report(request, intro, [text for text, _ in chapter_results])
         generation_time = round(time.time() - start_time, 2)
         
         return MeritReportResponse(
             result=result,
-            generation_time=generation_time
+            generation_time=generation_time,
+            chapter_times=[seconds for _, seconds in chapter_results]
         )
         
     except Exception as e:
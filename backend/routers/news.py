@@ -9,10 +9,11 @@ import html
 from datetime import datetime
 
 from config import settings
+from services.metrics import external_client
 from services.openai_service import OpenAIService
 
 router = APIRouter()
-openai_service = OpenAIService()
+openai_service = OpenAIService(endpoint="news")
 
 
 class SummarizeRequest(BaseModel):
@@ -50,7 +51,7 @@ async def get_news_list():
         )
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with external_client("github", timeout=30.0) as client:
             # Gist 메타데이터 가져오기
             headers = {"Accept": "application/vnd.github.v3+json"}
             if github_token:
@@ -137,7 +138,7 @@ async def refresh_news():
     url = f"https://api.github.com/repos/{github_repo}/actions/workflows/scrape_news.yml/dispatches"
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
+        async with external_client("github", timeout=10.0) as client:
             response = await client.post(
                 url,
                 headers={
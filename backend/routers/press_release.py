@@ -7,16 +7,50 @@ import datetime
 from services.vectorstore import VectorStoreService
 from services.openai_service import OpenAIService
 from services.supabase_service import SupabaseService
+from services.prompt_registry import register_prompt
 from utils.prompt_filter import check_text_security
+from utils.context_packer import pack_context
+from config import settings
 
 router = APIRouter()
 
 # 서비스 인스턴스
 vectorstore = VectorStoreService()
-openai_service = OpenAIService()
+openai_service = OpenAIService(endpoint="press_release")
 supabase_service = SupabaseService()
 
 
+# 보도자료 프롬프트 (고정 지침 → 유사 사례 → 요청별 값 순서, services.prompt_registry 참고)
+PRESS_RELEASE_PROMPT = register_prompt(
+    "press_release",
+    system="""너는 지방정부 보도자료 작성 전문가야. 사용자가 보내는 유사 사례를 참고해, 행정기관 스타일로 공공 보도자료를 작성해줘.
+
+작성 규칙:
+- 보도자료에는 상단의 보도일자, 담당자 정보, 연락처는 포함하지 말고 본문만 작성해주세요.
+- 담당자 인용문이 나올 경우, 요청에 적힌 담당자 이름을 쓰고 한칸띄고 '부서명+장'으로 직책을 표기해주세요. 예: 김태균 자치행정과장
+- 전체 문체는 보도자료 스타일의 간접화법을 사용해주세요. 예: '~했다', '~라고 밝혔다' 등.
+- 보도자료는 반드시 '[제목] 본문제목'으로 시작한 후, 한 줄 아래에 부제목 형태의 요약 문장을 넣어주세요. 부제목은 '-' 기호로 시작하세요.
+- 입력한 제목 후보는 참고만 하고, 내용 포인트를 반영하여 보도자료에 어울리는 제목을 새로 작성해 '[제목]'에 반영해주세요.
+- 요청에 적힌 분량보다 길게(+300자 가능) 작성해주세요.""",
+    tail="""아래는 참고용 보도자료 예시입니다:
+
+{examples}
+
+위 스타일을 참고하여 아래 요청사항에 맞는 새로운 보도자료를 작성해줘:
+
+담당자: {manager} {department}장
+{paragraph_instruction}전체 보도자료 분량은 약 {length_chars}자 내외로 작성해주세요.
+
+입력한 제목 후보: {title}
+
+내용 포인트:
+- {points}
+
+요청사항:
+- {additional}""",
+)
+
+
 class SearchRequest(BaseModel):
     query: str
     top_k: int = 3
@@ -49,6 +83,7 @@ class GenerateResponse(BaseModel):
     vectorstore_status: Dict
     generation_time: float
     supabase_log_id: Optional[int] = None
+    context_stats: Optional[Dict] = None
 
 
 @router.post("/search-similar")
@@ -95,7 +130,6 @@ async def generate_press_release(request: GenerateRequest):
         
         # 3. 참조 문서 정보 구성
         references = []
-        examples_for_prompt = []
         
         for i, doc in enumerate(similar_docs):
             content = doc.get('content', '')
@@ -109,9 +143,16 @@ async def generate_press_release(request: GenerateRequest):
                 "preview": content[:200] + "..." if len(content) > 200 else content,
                 "full_content": content
             })
-            
-            # 프롬프트용 예시 (전체 내용, 최대 1000자)
-            examples_for_prompt.append(content[:1000])
+        
+        # 프롬프트용 예시 (문서당 최대 1000자, 중복 제거 + 토큰 예산 내로 압축)
+        packed_docs, context_stats = pack_context(
+            similar_docs,
+            token_budget=settings.PRESS_RELEASE_CONTEXT_TOKENS,
+            max_chars=1000,
+            model=openai_service.model
+        )
+        examples_for_prompt = [doc["content"] for doc in packed_docs]
+        print(f"📦 보도자료 컨텍스트: {context_stats['tokens_used']}토큰 (절감 {context_stats['tokens_saved']}토큰)")
         
         # 4. 프롬프트 생성 (기존 개선된 버전)
         examples_combined = "\n\n---\n\n".join(examples_for_prompt)
@@ -133,52 +174,19 @@ async def generate_press_release(request: GenerateRequest):
             "1개": "전체 글은 1개 문단으로 구성해주세요.\n"
         }.get(request.paragraphs, "")
         
-        # 시스템 프롬프트
-        system_prompt = (
-            "너는 지방정부 보도자료 작성 전문가야. "
-            "아래 유사 사례를 참고해, 행정기관 스타일로 공공 보도자료를 작성해줘."
-        )
-        
-        # 추가 지시사항
-        additional_instructions = (
-            f"보도자료에는 상단의 보도일자, 담당자 정보, 연락처는 포함하지 말고 본문만 작성해주세요.\n"
-            f"담당자 인용문이 나올 경우, 담당자 이름은 '{request.manager}'이고, "
-            f"직책은 '{request.department}장'으로 표기해주세요.\n"
-            f"담당자 인용문이 나올 경우, '{request.manager}' 한칸띄고 '{request.department}장'으로 표기해주세요. "
-            f"예: 김태균 자치행정과장\n"
-            f"전체 문체는 보도자료 스타일의 간접화법을 사용해주세요. 예: '~했다', '~라고 밝혔다' 등.\n"
-            f"{paragraph_instruction}"
-            f"보도자료는 반드시 '[제목] 본문제목'으로 시작한 후, 한 줄 아래에 부제목 형태의 요약 문장을 넣어주세요. "
-            f"부제목은 '-' 기호로 시작하세요.\n"
-            f"전체 보도자료 분량은 약 {length_chars}자 내외로 작성해주세요. 필요 시 최대 토큰 수를 늘려도 괜찮습니다.\n"
-            f"전체 보도자료는 반드시 {length_chars}자 보다는 길게(+300자 가능) 작성해주세요."
-        )
-        
-        # 사용자 쿼리 프롬프트
-        user_query_prompt = (
-            f"입력한 제목 후보: {request.title}\n\n"
-            f"아래 내용 포인트를 반영하여 보도자료에 어울리는 제목을 새로 작성하고, "
-            f"그 제목을 '[제목]'에 반영해줘. 입력한 제목은 참고만 하고 그대로 쓰지 않아도 돼.\n\n"
-            f"내용 포인트:\n- {joined_points}\n\n"
-            f"요청사항:\n- {request.additional if request.additional else '없음'}\n\n"
-            f"{additional_instructions}"
-        )
-        
-        # 최종 프롬프트
-        full_prompt = f"""{system_prompt}
-
-아래는 참고용 보도자료 예시입니다:
-
-{examples_combined}
-
-위 스타일을 참고하여 아래 요청사항에 맞는 새로운 보도자료를 작성해줘:
-
-{user_query_prompt}
-"""
-        
-        # 5. GPT로 생성
-        result = await openai_service.generate_text(
-            prompt=full_prompt,
+        # 5. GPT로 생성 (고정 지침이 앞에 오도록 템플릿으로 구성)
+        result = await openai_service.generate_prompt(
+            PRESS_RELEASE_PROMPT,
+            {
+                "examples": examples_combined,
+                "manager": request.manager,
+                "department": request.department,
+                "paragraph_instruction": paragraph_instruction,
+                "length_chars": length_chars,
+                "title": request.title,
+                "points": joined_points,
+                "additional": request.additional if request.additional else '없음',
+            },
             max_tokens=2000,
             temperature=0.5
         )
@@ -205,7 +213,8 @@ async def generate_press_release(request: GenerateRequest):
                     "length": request.length,
                     "search_method": search_method,
                     "references_count": len(references),
-                    "generation_time": generation_time
+                    "generation_time": generation_time,
+                    "context_tokens_saved": context_stats["tokens_saved"]
                 }
             )
             supabase_log_id = log_result.get("id") if log_result else None
@@ -219,7 +228,8 @@ async def generate_press_release(request: GenerateRequest):
             search_method=search_method,
             vectorstore_status=vectorstore_status,
             generation_time=generation_time,
-            supabase_log_id=supabase_log_id
+            supabase_log_id=supabase_log_id,
+            context_stats=context_stats
         )
         
     except Exception as e:
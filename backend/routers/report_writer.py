@@ -3,16 +3,22 @@
 섹션별 특성에 맞는 차별화된 프롬프트 적용
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
 import json
 import re
 from datetime import datetime
 
-from config import settings
+from services.openai_service import OpenAIService
+from services.prompt_registry import register_prompt
 
 router = APIRouter()
 
+# OpenAI 서비스 (전역 스케줄러 경유)
+openai_service = OpenAIService(endpoint="report_writer")
+
 
 # ===========================================
 # 📋 요청/응답 모델
@@ -23,6 +29,7 @@ class ReportGenerateRequest(BaseModel):
     detail_type: str
     keywords: str
     length: str = "표준"
+    parallel: bool = False  # True: 개요 생성 후 섹션별 병렬 생성
 
 
 class ReportSection(BaseModel):
@@ -78,11 +85,16 @@ REPORT_STRUCTURES: Dict[str, Dict[str, List[str]]] = {
 }
 
 LENGTH_RULES = {
-    "간략": {"items_per_section": "3~4", "detail_level": "핵심만 간략히"},
-    "표준": {"items_per_section": "4~6", "detail_level": "구체적 내용 포함"},
-    "상세": {"items_per_section": "6~8", "detail_level": "매우 상세하게"},
+    "간략": {"items_per_section": "3~4", "detail_level": "핵심만 간략히", "section_tokens": 500},
+    "표준": {"items_per_section": "4~6", "detail_level": "구체적 내용 포함", "section_tokens": 800},
+    "상세": {"items_per_section": "6~8", "detail_level": "매우 상세하게", "section_tokens": 1200},
 }
 
+# 병렬 생성 시 개요(요약 + 섹션별 핵심 포인트) 최대 토큰
+OUTLINE_TOKENS = 1000
+
+SYSTEM_PROMPT = "당신은 대한민국 지방자치단체 공무원 업무보고서 작성 전문가입니다. 섹션별 특성(서술형/나열형/효과형/방안형/분석형)에 맞게 작성합니다. 반드시 JSON 형식으로만 응답하세요."
+
 
 # ===========================================
 # 🎯 섹션별 작성 스타일 정의 (핵심!)
@@ -417,42 +429,28 @@ SECTION_STYLES = {
 # ===========================================
 # 🎯 프롬프트 생성 함수
 # ===========================================
-def build_prompt(title: str, report_type: str, detail_type: str, keywords: str, length_key: str) -> str:
-    """섹션별 특성을 반영한 프롬프트 생성"""
-    
-    sections = REPORT_STRUCTURES[report_type][detail_type]
-    rule = LENGTH_RULES[length_key]
-    keyword_list = [kw.strip() for kw in keywords.split(",") if kw.strip()]
-    
-    # 섹션별 가이드 생성
-    section_guides = []
-    for sec in sections:
-        if sec in SECTION_STYLES:
-            style_info = SECTION_STYLES[sec]
-            section_guides.append(f"""
+def build_section_guide(sec: str) -> str:
+    """섹션 하나의 작성 스타일 가이드"""
+    if sec in SECTION_STYLES:
+        style_info = SECTION_STYLES[sec]
+        return f"""
 ### {sec} ({style_info['style']})
 - 작성방법: {style_info['guide']}
 - 예시: "{style_info['example']}"
-""")
-        else:
-            section_guides.append(f"""
+"""
+    return f"""
 ### {sec}
 - 작성방법: 해당 내용을 구체적으로 기술
-""")
-    
-    section_guide_text = "\n".join(section_guides)
-    
-    return f"""당신은 대한민국 지방자치단체에서 15년간 근무한 7급 공무원입니다.
-실제 업무에서 사용하는 수준의 보고서를 작성해주세요.
+"""
 
-## 작성할 보고서 정보
-- 제목: {title}
-- 유형: {report_type} > {detail_type}
-- 핵심 키워드: {', '.join(keyword_list)}
-- 분량: 섹션당 {rule['items_per_section']}개 항목
 
-## 섹션 구성
-{' → '.join(sections)}
+# 단일 호출 보고서 프롬프트 (고정 지침 → 유형별 섹션 가이드 → 요청별 값 순서, services.prompt_registry 참고)
+REPORT_PROMPT = register_prompt(
+    "report_writer",
+    system=SYSTEM_PROMPT + """
+
+당신은 대한민국 지방자치단체에서 15년간 근무한 7급 공무원입니다.
+실제 업무에서 사용하는 수준의 보고서를 작성해주세요.
 
 ## 문체 규칙 (개괄식 종결어미)
 - 서술형 섹션: "~임", "~음", "~함", "~됨" 등으로 문장 종결
@@ -460,24 +458,19 @@ def build_prompt(title: str, report_type: str, detail_type: str, keywords: str,
 - 절대 금지: "~했습니다", "~합니다", "~했다", "~한다"
 
 ## 핵심 규칙
-1. 키워드 "{', '.join(keyword_list)}"를 반드시 내용에 자연스럽게 포함
+1. 요청의 핵심 키워드를 반드시 내용에 자연스럽게 포함
 2. 구체적 숫자(수량, 금액, 일정, 비율 등)를 반드시 포함
 3. 각 섹션의 스타일(서술형/나열형/효과형/방안형/분석형)에 맞게 작성
 4. 섹션 간 내용 중복 금지
-
-## 섹션별 작성 가이드
-{section_guide_text}
+5. 요청의 섹션 구성 순서대로, 섹션마다 요청된 개수의 항목 작성
 
 ## 출력 형식
 마크다운, 이모지, 불릿 기호 없이 순수 JSON만 출력하세요.
 
-{{
-  "title": "{title}",
-  "type": "{report_type}",
-  "detailType": "{detail_type}",
+{
   "summary": "보고서 핵심 내용을 3~4문장으로 요약 (구체적 수치 포함, 개괄식 종결어미)",
   "sections": [
-    {{
+    {
       "title": "섹션명",
       "order": 1,
       "content": [
@@ -486,17 +479,128 @@ def build_prompt(title: str, report_type: str, detail_type: str, keywords: str,
         "세 번째 항목",
         "네 번째 항목"
       ]
-    }}
-  ],
-  "metadata": {{
-    "generatedAt": "{datetime.now().isoformat()}",
-    "totalSections": {len(sections)},
-    "keywords": {json.dumps(keyword_list, ensure_ascii=False)}
+    }
+  ]
+}""",
+    tail="""## 섹션 구성
+{section_flow}
+
+## 섹션별 작성 가이드
+{section_guides}
+
+## 작성할 보고서 정보
+- 제목: {title}
+- 유형: {report_type} > {detail_type}
+- 핵심 키워드: {keywords}
+- 분량: 섹션당 {items_per_section}개 항목""",
+)
+
+
+def build_prompt_values(title: str, report_type: str, detail_type: str, keywords: str, length_key: str) -> Dict[str, Any]:
+    """REPORT_PROMPT에 채울 요청별 값 (섹션별 특성 가이드 포함)"""
+    
+    sections = REPORT_STRUCTURES[report_type][detail_type]
+    keyword_list = [kw.strip() for kw in keywords.split(",") if kw.strip()]
+    
+    return {
+        "section_flow": " → ".join(sections),
+        "section_guides": "\n".join(build_section_guide(sec) for sec in sections),
+        "title": title,
+        "report_type": report_type,
+        "detail_type": detail_type,
+        "keywords": ", ".join(keyword_list),
+        "items_per_section": LENGTH_RULES[length_key]["items_per_section"],
+    }
+
+
+def build_outline_prompt(title: str, report_type: str, detail_type: str, keywords: str, length_key: str) -> str:
+    """병렬 생성 1단계: 섹션들이 공유할 요약과 섹션별 핵심 포인트"""
+    
+    sections = REPORT_STRUCTURES[report_type][detail_type]
+    keyword_list = [kw.strip() for kw in keywords.split(",") if kw.strip()]
+    
+    return f"""당신은 대한민국 지방자치단체에서 15년간 근무한 7급 공무원입니다.
+아래 보고서의 섹션들을 나누어 작성하기 전에, 전체 방향을 잡는 개요를 먼저 작성해주세요.
+
+## 작성할 보고서 정보
+- 제목: {title}
+- 유형: {report_type} > {detail_type}
+- 핵심 키워드: {', '.join(keyword_list)}
+- 분량: {LENGTH_RULES[length_key]['detail_level']}
+
+## 섹션 구성
+{' → '.join(sections)}
+
+## 작성 규칙
+1. summary: 보고서 핵심 내용을 3~4문장으로 요약 (구체적 수치 포함, 개괄식 종결어미 "~임", "~함", "~됨")
+2. outline: 섹션별로 다룰 핵심 포인트와 사용할 수치를 1~2문장으로 지정
+3. 같은 수치(수량, 금액, 일정, 비율)는 모든 섹션에서 일관되게 사용하도록 개요에 명시
+4. 섹션 간 내용 중복 금지
+
+## 출력 형식
+마크다운, 이모지 없이 순수 JSON만 출력하세요.
+
+{{
+  "summary": "보고서 요약",
+  "outline": {{
+{chr(10).join(f'    "{sec}": "이 섹션의 핵심 포인트",' for sec in sections).rstrip(',')}
   }}
 }}
 """
 
 
+def build_section_prompt(title: str, report_type: str, detail_type: str, keywords: str, length_key: str,
+                         section: str, outline: Dict[str, Any]) -> str:
+    """병렬 생성 2단계: 공유 개요를 바탕으로 섹션 하나만 작성"""
+    
+    rule = LENGTH_RULES[length_key]
+    keyword_list = [kw.strip() for kw in keywords.split(",") if kw.strip()]
+    section_outline = outline.get("outline", {}) or {}
+    other_sections = "\n".join(
+        f"- {name}: {point}" for name, point in section_outline.items() if name != section
+    )
+    
+    return f"""당신은 대한민국 지방자치단체에서 15년간 근무한 7급 공무원입니다.
+보고서의 여러 섹션을 나누어 작성 중이며, 이번에는 "{section}" 섹션만 작성합니다.
+
+## 보고서 정보
+- 제목: {title}
+- 유형: {report_type} > {detail_type}
+- 핵심 키워드: {', '.join(keyword_list)}
+
+## 보고서 요약 (모든 섹션 공통)
+{outline.get("summary", "")}
+
+## 이 섹션에서 다룰 내용
+{section_outline.get(section, "보고서 요약에 맞게 해당 섹션 내용을 구체적으로 기술")}
+
+## 다른 섹션에서 다룰 내용 (중복 금지)
+{other_sections or "- 없음"}
+
+## 섹션 작성 가이드
+{build_section_guide(section)}
+## 문체 규칙 (개괄식 종결어미)
+- 서술형 섹션: "~임", "~음", "~함", "~됨" 등으로 문장 종결
+- 나열형 섹션: "항목: 내용" 형태로 간결하게 (문장형 종결어미 불필요)
+- 절대 금지: "~했습니다", "~합니다", "~했다", "~한다"
+
+## 핵심 규칙
+1. 키워드를 자연스럽게 포함하고 보고서 요약의 수치와 일관되게 작성
+2. 구체적 숫자(수량, 금액, 일정, 비율 등)를 반드시 포함
+3. {rule['items_per_section']}개 항목, {rule['detail_level']}
+
+## 출력 형식
+마크다운, 이모지, 불릿 기호 없이 순수 JSON만 출력하세요.
+
+{{
+  "content": [
+    "첫 번째 항목",
+    "두 번째 항목"
+  ]
+}}
+"""
+
+
 # ===========================================
 # 🔧 후처리 함수
 # ===========================================
@@ -609,10 +713,7 @@ async def get_report_structures():
     )
 
 
-@router.post("/generate", response_model=ReportResponse)
-async def generate_report(request: ReportGenerateRequest):
-    """업무보고서 생성"""
-    
+def _validate_request(request: ReportGenerateRequest):
     if request.report_type not in REPORT_STRUCTURES:
         raise HTTPException(status_code=400, detail=f"지원하지 않는 보고서 유형: {request.report_type}")
     
@@ -621,56 +722,166 @@ async def generate_report(request: ReportGenerateRequest):
     
     if request.length not in LENGTH_RULES:
         raise HTTPException(status_code=400, detail=f"지원하지 않는 분량 옵션: {request.length}")
+
+
+def _route(request: ReportGenerateRequest) -> Dict:
+    # 모델 등급 선택 (config.LLM_ROUTING_POLICY, 기본 full 등급 + 지연 목표 초과 시 하향)
+    return openai_service.route_model(
+        input_chars=len(request.title) + len(request.keywords),
+        default_max_tokens=4000,
+        default_model="gpt-4o"
+    )
+
+
+def _build_response(request: ReportGenerateRequest, data: Dict[str, Any], route: Dict, mode: str) -> ReportResponse:
+    sections = [
+        ReportSection(
+            title=sec.get("title", ""),
+            order=sec.get("order", idx + 1),
+            content=sec.get("content", [])
+        )
+        for idx, sec in enumerate(data.get("sections", []))
+    ]
     
-    try:
-        prompt = build_prompt(
+    # 제목/유형은 요청 값을 그대로 사용 (모델 출력 스키마에는 없음)
+    return ReportResponse(
+        title=request.title,
+        type=request.report_type,
+        detail_type=request.detail_type,
+        summary=data.get("summary", ""),
+        sections=sections,
+        metadata={
+            **data.get("metadata", {}),
+            "model": route["model"],
+            "modelTier": route["tier"],
+            "generationMode": mode,
+        },
+        success=True
+    )
+
+
+async def _generate_single(request: ReportGenerateRequest, route: Dict) -> Dict[str, Any]:
+    """전체 보고서를 한 번의 JSON 응답으로 생성"""
+    raw_content = await openai_service.generate_prompt(
+        REPORT_PROMPT,
+        build_prompt_values(
             title=request.title,
             report_type=request.report_type,
             detail_type=request.detail_type,
             keywords=request.keywords,
             length_key=request.length
-        )
-        
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "당신은 대한민국 지방자치단체 공무원 업무보고서 작성 전문가입니다. 섹션별 특성(서술형/나열형/효과형/방안형/분석형)에 맞게 작성합니다. 반드시 JSON 형식으로만 응답하세요."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.4,
-            response_format={"type": "json_object"},
-            max_tokens=4000
-        )
-        
-        raw_content = response.choices[0].message.content or ""
-        data = json.loads(raw_content)
-        
-        data = postprocess_report(data)
+        ),
+        model=route["model"],
+        temperature=0.4,
+        response_format={"type": "json_object"},
+        max_tokens=route["max_tokens"],
+        priority="batch"
+    )
+    data = postprocess_report(json.loads(raw_content))
+    data["metadata"] = _report_metadata(request, len(data.get("sections", [])))
+    
+    return data
+
+
+async def _generate_section(request: ReportGenerateRequest, route: Dict, order: int, section: str,
+                            outline: Dict[str, Any]) -> Dict[str, Any]:
+    """섹션 하나 생성 후 바로 후처리"""
+    raw_content = await openai_service.generate_text(
+        prompt=build_section_prompt(
+            request.title, request.report_type, request.detail_type, request.keywords,
+            request.length, section, outline
+        ),
+        system_prompt=SYSTEM_PROMPT,
+        model=route["model"],
+        temperature=0.4,
+        response_format={"type": "json_object"},
+        max_tokens=min(route["max_tokens"], LENGTH_RULES[request.length]["section_tokens"]),
+        priority="batch"
+    )
+    content = json.loads(raw_content).get("content", [])
+    
+    return postprocess_report({"sections": [{"title": section, "order": order, "content": content}]})["sections"][0]
+
+
+async def iter_parallel_report(request: ReportGenerateRequest, route: Dict) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    개요 → 섹션 병렬 생성
+
+    공유 개요(요약 + 섹션별 핵심 포인트)를 먼저 만든 뒤 섹션마다 작은 프롬프트를 동시에 호출하고,
+    완성되는 순서대로 ("outline", {...}) 다음 ("section", {...})를 yield함.
+    동시 호출 수는 LLM 스케줄러의 모델별 한도를 따름
+    """
+    sections = REPORT_STRUCTURES[request.report_type][request.detail_type]
+    
+    raw_outline = await openai_service.generate_text(
+        prompt=build_outline_prompt(
+            request.title, request.report_type, request.detail_type, request.keywords, request.length
+        ),
+        system_prompt=SYSTEM_PROMPT,
+        model=route["model"],
+        temperature=0.4,
+        response_format={"type": "json_object"},
+        max_tokens=OUTLINE_TOKENS,
+        priority="batch"
+    )
+    outline = json.loads(raw_outline)
+    outline["summary"] = postprocess_report({"summary": outline.get("summary", "")})["summary"]
+    yield "outline", outline
+    
+    tasks = [
+        asyncio.create_task(_generate_section(request, route, idx + 1, sec, outline))
+        for idx, sec in enumerate(sections)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield "section", await next_done
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def _report_metadata(request: ReportGenerateRequest, total_sections: int) -> Dict[str, Any]:
+    return {
+        "generatedAt": datetime.now().isoformat(),
+        "totalSections": total_sections,
+        "keywords": [kw.strip() for kw in request.keywords.split(",") if kw.strip()],
+    }
+
+
+async def _generate_parallel(request: ReportGenerateRequest, route: Dict) -> Dict[str, Any]:
+    """병렬 생성 결과를 섹션 순서대로 조립"""
+    summary = ""
+    sections = []
+    async for kind, payload in iter_parallel_report(request, route):
+        if kind == "outline":
+            summary = payload.get("summary", "")
+        else:
+            sections.append(payload)
+    sections.sort(key=lambda sec: sec["order"])
+    
+    return {
+        "summary": summary,
+        "sections": sections,
+        "metadata": _report_metadata(request, len(sections)),
+    }
+
+
+@router.post("/generate", response_model=ReportResponse)
+async def generate_report(request: ReportGenerateRequest):
+    """업무보고서 생성 (parallel=True면 개요 생성 후 섹션별 병렬 생성)"""
+    
+    _validate_request(request)
+    
+    try:
+        route = _route(request)
         
-        sections = [
-            ReportSection(
-                title=sec.get("title", ""),
-                order=sec.get("order", idx + 1),
-                content=sec.get("content", [])
-            )
-            for idx, sec in enumerate(data.get("sections", []))
-        ]
+        if request.parallel:
+            data = await _generate_parallel(request, route)
+        else:
+            data = await _generate_single(request, route)
         
-        return ReportResponse(
-            title=data.get("title", request.title),
-            type=data.get("type", request.report_type),
-            detail_type=data.get("detailType", request.detail_type),
-            summary=data.get("summary", ""),
-            sections=sections,
-            metadata=data.get("metadata", {}),
-            success=True
-        )
+        return _build_response(request, data, route, "parallel" if request.parallel else "single")
         
     except json.JSONDecodeError as e:
         raise HTTPException(status_code=500, detail=f"JSON 파싱 실패: {str(e)}")
@@ -678,6 +889,43 @@ async def generate_report(request: ReportGenerateRequest):
         raise HTTPException(status_code=500, detail=f"보고서 생성 실패: {str(e)}")
 
 
+@router.post("/generate-stream")
+async def generate_report_stream(request: ReportGenerateRequest):
+    """
+    업무보고서 병렬 생성 (완성된 섹션부터 스트리밍)
+
+    NDJSON으로 한 줄씩 전송:
+    {"type": "outline", "summary"} → {"type": "section", "title", "order", "content"} (완성 순서) ...
+    → 마지막에 {"type": "result", ...ReportResponse} 또는 {"type": "error", "detail"}
+    """
+    _validate_request(request)
+    
+    async def event_stream():
+        summary = ""
+        sections = []
+        route = None
+        try:
+            route = _route(request)
+            async for kind, payload in iter_parallel_report(request, route):
+                if kind == "outline":
+                    summary = payload.get("summary", "")
+                    yield json.dumps({"type": "outline", "summary": summary}, ensure_ascii=False) + "\n"
+                else:
+                    sections.append(payload)
+                    yield json.dumps({"type": "section", **payload}, ensure_ascii=False) + "\n"
+            
+            sections.sort(key=lambda sec: sec["order"])
+            data = {"summary": summary, "sections": sections, "metadata": _report_metadata(request, len(sections))}
+            result = _build_response(request, data, route, "parallel")
+            yield json.dumps({"type": "result", **result.model_dump()}, ensure_ascii=False) + "\n"
+        except json.JSONDecodeError as e:
+            yield json.dumps({"type": "error", "detail": f"JSON 파싱 실패: {str(e)}"}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": f"보고서 생성 실패: {str(e)}"}, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @router.get("/status")
 async def get_status():
     """서비스 상태 확인"""
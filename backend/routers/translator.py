@@ -4,20 +4,32 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
 from fastapi.responses import Response
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from xml.sax.saxutils import escape
+import asyncio
+import json
+import multiprocessing
+import uuid
 import zipfile
-import tempfile
-import os
-import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import re
+import time
 from io import BytesIO
 from lxml import etree
-from openai import OpenAI
 
 from config import settings
+from services import metrics
+from services.openai_service import OpenAIService
+from services.prompt_registry import register_prompt
+from services.translation_memory import get_translation_memory, normalize_segment
+from utils.zip_rewrite import rewrite_zip
 
 router = APIRouter()
 
+# 서비스 인스턴스
+openai_service = OpenAIService(endpoint="translator")
+
 
 # 지원 언어 목록
 SUPPORTED_LANGUAGES = {
@@ -41,10 +53,53 @@ SUPPORTED_LANGUAGES = {
 }
 
 
+# GPT 2차 번역용 언어 이름
+GPT_LANGUAGE_NAMES = {
+    "EN-US": "English", "EN-GB": "British English",
+    "JA": "Japanese", "ZH-HANS": "Simplified Chinese",
+    "ZH-HANT": "Traditional Chinese", "VI": "Vietnamese",
+    "TH": "Thai", "RU": "Russian", "AR": "Arabic",
+    "ES": "Spanish", "DE": "German", "FR": "French"
+}
+
+# GPT 2차 번역 프롬프트 (세그먼트 여러 개를 id가 붙은 JSON 배열로 묶어 한 번에 요청)
+FALLBACK_PROMPT = register_prompt(
+    "translator.fallback",
+    system="""You are a professional translator. Translate Korean text segments from municipal government documents.
+Preserve all formatting, numbers, and special characters in each segment.
+Translate every segment independently and do not merge or split segments.
+Segments are XML fragments: tags such as <r0>...</r0> mark formatting runs of one paragraph.
+Keep every tag exactly once, translate the text inside and around the tags, and keep XML escapes such as &amp; and &lt;.
+
+Return ONLY a JSON object in this form, with exactly one entry per input segment and the same ids:
+{"translations": [{"id": 0, "text": "translated segment"}]}""",
+    tail="""Target language: {target_lang_name}
+
+Segments (JSON):
+{segments_json}""",
+)
+
+
 class LanguagesResponse(BaseModel):
     languages: dict
 
 
+class TranslationJobResponse(BaseModel):
+    """번역 작업 상태 (status: queued, running, done, error)"""
+    job_id: str
+    status: str
+    filename: str
+    target_langs: List[str]
+    stage: Optional[str] = None  # parse, deepl, gpt, render, done
+    current_part: Optional[str] = None
+    segments_done: int = 0
+    segments_total: int = 0
+    languages: Dict[str, Dict[str, Any]] = {}
+    error: Optional[str] = None
+    stats: Optional[Dict[str, Any]] = None
+    elapsed_seconds: float = 0.0
+
+
 @router.get("/languages", response_model=LanguagesResponse)
 async def get_languages():
     """
@@ -53,46 +108,312 @@ async def get_languages():
     return LanguagesResponse(languages=SUPPORTED_LANGUAGES)
 
 
+def parse_target_langs(target_lang: List[str]) -> List[str]:
+    """폼 값(필드 반복 또는 쉼표 구분) -> 중복 없는 대상 언어 목록 (지원하지 않으면 400)"""
+    target_langs = list(dict.fromkeys(
+        lang.strip() for value in target_lang for lang in value.split(",") if lang.strip()
+    ))
+    if not target_langs:
+        raise HTTPException(status_code=400, detail="번역 언어를 선택해주세요.")
+    for lang in target_langs:
+        if lang not in SUPPORTED_LANGUAGES:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 언어입니다: {lang}")
+    return target_langs
+
+
+def create_deepl_translator():
+    """DeepL 클라이언트 생성 (키가 없거나 잘못되면 예외)"""
+    import deepl
+    return deepl.Translator(
+        settings.DEEPL_API_KEY,
+        server_url=settings.DEEPL_SERVER_URL or None
+    )
+
+
+def record_progress(store, job_id: str, update: Dict):
+    """
+    진행 상황 1건을 공유 dict(Manager().dict())의 작업 항목에 반영
+
+    API 프로세스(DeepL/GPT 단계)와 작업자 프로세스(parse/render 단계)가 같은 항목을 갱신하므로
+    언어별 값은 기존 항목에 합쳐 씀. 진행 상황은 참고용이라 Manager 연결 오류는 무시함
+    """
+    try:
+        entry = dict(store.get(job_id) or {})
+        entry["stage"] = update["stage"]
+        entry["part"] = update.get("part")
+        lang = update.get("target_lang")
+        if lang:
+            languages = dict(entry.get("languages") or {})
+            languages[lang] = {"stage": update["stage"], "done": update["done"], "total": update["total"]}
+            entry["languages"] = languages
+            entry["segments_done"] = sum(p["done"] for p in languages.values())
+            entry["segments_total"] = sum(p["total"] for p in languages.values())
+        store[job_id] = entry
+    except (OSError, EOFError) as e:
+        print(f"⚠️ 번역 작업 진행 상황 기록 실패: {e}")
+
+
+def _progress_reporter(store, job_id: Optional[str]) -> Optional[Callable[[Dict], None]]:
+    if store is None or not job_id:
+        return None
+    return lambda update: record_progress(store, job_id, update)
+
+
+def scan_hwpx_segments(file_bytes: bytes, job_id: Optional[str] = None, progress=None) -> "SegmentTable":
+    """
+    프로세스 풀 작업자: HWPX 파싱 -> 번역할 세그먼트 목록 (XML 트리는 프로세스 밖으로 보내지 않음)
+
+    Args:
+        job_id, progress: 진행 상황을 기록할 작업 ID와 공유 dict (Manager().dict())
+    """
+    return parse_hwpx(file_bytes, _progress_reporter(progress, job_id)).segment_table()
+
+
+def render_translations(file_bytes: bytes, translations: Dict[str, List[Optional[str]]],
+                        job_id: Optional[str] = None, progress=None) -> Dict[str, Tuple[bytes, Dict]]:
+    """
+    프로세스 풀 작업자: 같은 바이트를 다시 파싱해 언어별 번역문을 써 넣은 HWPX 생성
+
+    파싱 순서가 같으므로 scan_hwpx_segments의 originals 인덱스가 그대로 맞음
+
+    Returns:
+        {대상 언어: (HWPX 바이트, 렌더링 통계)}
+    """
+    report = _progress_reporter(progress, job_id)
+    step = time.perf_counter()
+    doc = parse_hwpx(file_bytes)
+    reparse_seconds = round(time.perf_counter() - step, 3)
+    results = {}
+    for lang, lang_translations in translations.items():
+        if report:
+            total = sum(t is not None for t in lang_translations)
+            report({"stage": "render", "part": None, "target_lang": lang, "done": total, "total": total})
+        stats = {"reparse_seconds": reparse_seconds}
+        results[lang] = (render_hwpx(doc, lang_translations, stats), stats)
+    return results
+
+
+async def translate_upload(
+    file_bytes: bytes,
+    original_name: str,
+    target_langs: List[str],
+    font_mode: str,
+    job_id: Optional[str] = None
+) -> Tuple[bytes, str, Dict]:
+    """
+    업로드 파일 번역 -> (다운로드 바이트, 파일명, 통계)
+
+    lxml 파싱/직렬화(CPU 작업)만 프로세스 풀에서 하고, DeepL/GPT 호출은 API 프로세스에서 함
+    (외부 API 지표가 API의 /metrics에 남고, 모델별 동시 요청/분당 토큰 한도를 전역 스케줄러 하나가 지키도록).
+    대상 언어가 하나면 번역된 HWPX, 여러 개면 언어별 HWPX를 묶은 ZIP
+
+    Args:
+        job_id: 진행 상황을 기록할 작업 ID (/jobs)
+    """
+    started = time.perf_counter()
+    report = None
+    if job_id:
+        # 풀을 다시 만들면 공유 dict도 바뀌므로 기록할 때마다 현재 dict를 찾음
+        report = lambda update: record_progress(_job_progress(), job_id, update)
+
+    table = await _run_in_pool(scan_hwpx_segments, file_bytes, job_id=job_id)
+
+    deepl_translator = create_deepl_translator()
+
+    async def translate_one(target_lang: str) -> Tuple[List[Optional[str]], Dict]:
+        stats = {}
+        translations = await translate_table(
+            table, target_lang, deepl_translator, stats, _tag_progress(report, target_lang)
+        )
+        return translations, stats
+
+    translated = dict(zip(target_langs, await asyncio.gather(*(translate_one(lang) for lang in target_langs))))
+    rendered = await _run_in_pool(
+        render_translations, file_bytes,
+        {lang: translations for lang, (translations, _) in translated.items()}, job_id=job_id
+    )
+
+    results: Dict[str, Tuple[bytes, Dict]] = {}
+    for lang, (_, stats) in translated.items():
+        data, render_stats = rendered[lang]
+        stats.update(render_stats)
+        stats["total_seconds"] = round(time.perf_counter() - started, 3)
+        log_translation(lang, stats)
+        results[lang] = (data, stats)
+
+    if len(target_langs) == 1:
+        data, stats = results[target_langs[0]]
+        return data, f"{original_name}_translated_{target_langs[0]}.hwpx", stats
+
+    stats = combine_stats([lang_stats for _, lang_stats in results.values()])
+    # HWPX는 이미 압축되어 있으므로 묶기만 함
+    bundle = BytesIO()
+    with zipfile.ZipFile(bundle, 'w', zipfile.ZIP_STORED) as zip_out:
+        for lang, (data, _) in results.items():
+            zip_out.writestr(f"{original_name}_translated_{lang}.hwpx", data)
+    return bundle.getvalue(), f"{original_name}_translated.zip", stats
+
+
+class TranslationJob:
+    """백그라운드 번역 작업 1건"""
+
+    def __init__(self, job_id: str, filename: str, target_langs: List[str]):
+        self.job_id = job_id
+        self.filename = filename
+        self.target_langs = target_langs
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.result: Optional[Tuple[bytes, str, Dict]] = None
+        self.error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return "error"
+        if self.result is not None:
+            return "done"
+        return "running" if _job_progress_entry(self.job_id) else "queued"
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_manager = None
+_progress = None
+_jobs: Dict[str, TranslationJob] = {}
+
+
+def _pool_broken() -> bool:
+    """작업자가 비정상 종료(메모리 부족 등)되어 풀이 깨졌거나 Manager 프로세스가 죽었는지"""
+    if _pool is None:
+        return False
+    manager_process = getattr(_manager, "_process", None)
+    return bool(getattr(_pool, "_broken", False)) or (manager_process is not None and not manager_process.is_alive())
+
+
+def get_job_pool() -> ProcessPoolExecutor:
+    """
+    HWPX 파싱/생성 프로세스 풀 (spawn: 이벤트 루프/스레드를 가진 API 프로세스를 fork하지 않음)
+
+    작업자는 lxml 작업만 하고 외부 API를 호출하지 않음. 깨진 풀은 Manager와 함께 새로 만듦
+    """
+    global _pool, _manager, _progress
+    if _pool_broken():
+        print("⚠️ 번역 프로세스 풀이 깨져 다시 시작합니다")
+        shutdown_job_pool()
+    if _pool is None:
+        context = multiprocessing.get_context("spawn")
+        _manager = context.Manager()
+        _progress = _manager.dict()
+        _pool = ProcessPoolExecutor(max_workers=settings.TRANSLATOR_JOB_WORKERS, mp_context=context)
+        print(f"✅ 번역 프로세스 풀 시작 (작업자 {settings.TRANSLATOR_JOB_WORKERS}개)")
+    return _pool
+
+
+def _job_progress():
+    return _progress if _progress is not None else {}
+
+
+def _job_progress_entry(job_id: str) -> Dict:
+    """작업 진행 상황 (Manager 연결 오류면 빈 dict)"""
+    try:
+        return dict(_job_progress().get(job_id) or {})
+    except (OSError, EOFError):
+        return {}
+
+
+def shutdown_job_pool():
+    """앱 종료 시(또는 풀이 깨졌을 때) 프로세스 풀/Manager 정리"""
+    global _pool, _manager, _progress
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            _manager.shutdown()
+        except (OSError, EOFError) as e:
+            print(f"⚠️ 번역 작업 Manager 종료 실패: {e}")
+        _pool = _manager = _progress = None
+
+
+async def _run_in_pool(fn: Callable, *args, job_id: Optional[str] = None):
+    """
+    프로세스 풀에서 fn(*args, job_id, 진행 상황 dict) 실행
+
+    작업자가 도중에 죽으면(BrokenProcessPool) 풀을 정리해 다음 요청이 새 풀을 쓰게 하고
+    예외는 그대로 올려 이 작업을 실패로 처리함
+    """
+    pool = get_job_pool()
+    progress = _progress if job_id else None
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args, job_id, progress)
+    except BrokenProcessPool:
+        if pool is _pool:
+            print("❌ 번역 작업자 프로세스가 비정상 종료되어 프로세스 풀을 정리합니다")
+            shutdown_job_pool()
+        raise
+
+
+def _prune_jobs():
+    """보관 시간이 지난 완료 작업 삭제"""
+    now = time.time()
+    for job_id, job in list(_jobs.items()):
+        if job.finished_at and now - job.finished_at > settings.TRANSLATOR_JOB_TTL_S:
+            _jobs.pop(job_id, None)
+            _job_progress().pop(job_id, None)
+
+
+async def _run_job(job: TranslationJob, file_bytes: bytes, original_name: str, font_mode: str):
+    """번역을 실행하고 끝나면 결과 보관"""
+    try:
+        job.result = await translate_upload(file_bytes, original_name, job.target_langs, font_mode, job.job_id)
+        print(f"✅ 번역 작업 완료: {job.job_id} ({job.filename})")
+    except BrokenProcessPool:
+        job.error = "번역 작업자 프로세스가 비정상 종료되었습니다 (문서가 너무 크거나 메모리 부족)"
+        print(f"❌ 번역 작업 실패: {job.job_id} - {job.error}")
+    except Exception as e:
+        job.error = str(e) or e.__class__.__name__
+        print(f"❌ 번역 작업 실패: {job.job_id} - {job.error}")
+    finally:
+        job.finished_at = time.time()
+
+
 @router.post("/translate")
 async def translate_hwpx(
     file: UploadFile = File(...),
-    target_lang: str = Form(default="EN-US"),
+    target_lang: List[str] = Form(default=["EN-US"]),  # 여러 개 지정 가능 (필드 반복 또는 쉼표 구분)
     font_mode: str = Form(default="all")  # all, hangul_only, none
 ):
     """
     HWPX 파일 번역
+
+    대상 언어가 하나면 번역된 HWPX를, 여러 개면 언어별 HWPX를 묶은 ZIP을 반환
+    (문서 파싱은 한 번만 하고 언어별 번역은 동시에 진행).
+    HWPX 파싱/생성은 프로세스 풀에서 실행되며, 큰 문서는 /jobs 비동기 작업 사용 권장
     """
     if not file.filename.endswith('.hwpx'):
         raise HTTPException(status_code=400, detail="HWPX 파일만 지원합니다.")
     
-    if target_lang not in SUPPORTED_LANGUAGES:
-        raise HTTPException(status_code=400, detail=f"지원하지 않는 언어입니다: {target_lang}")
+    target_langs = parse_target_langs(target_lang)
     
     try:
-        import deepl
-        deepl_translator = deepl.Translator(settings.DEEPL_API_KEY)
+        create_deepl_translator()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DeepL 초기화 실패: {str(e)}")
     
-    openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    
     try:
         file_bytes = await file.read()
         original_name = file.filename.rsplit('.', 1)[0]
         
         # 번역 수행
-        translated_bytes = translate_hwpx_preserve_format(
-            file_bytes, target_lang, font_mode,
-            deepl_translator, openai_client
+        translated_bytes, download_filename, stats = await translate_upload(
+            file_bytes, original_name, target_langs, font_mode
         )
         
-        download_filename = f"{original_name}_translated_{target_lang}.hwpx"
-        
         return Response(
             content=translated_bytes,
             media_type="application/zip",
             headers={
-                "Content-Disposition": f'attachment; filename="{download_filename}"'
+                "Content-Disposition": f'attachment; filename="{download_filename}"',
+                "X-Translation-Languages": ",".join(target_langs),
+                **translation_headers(stats)
             }
         )
         
@@ -100,158 +421,675 @@ async def translate_hwpx(
         raise HTTPException(status_code=500, detail=f"번역 실패: {str(e)}")
 
 
+@router.post("/jobs", response_model=TranslationJobResponse)
+async def create_translation_job(
+    file: UploadFile = File(...),
+    target_lang: List[str] = Form(default=["EN-US"]),
+    font_mode: str = Form(default="all")
+):
+    """
+    HWPX 번역 작업 등록 (작업 ID를 바로 반환, /jobs/{job_id}로 진행 상황 확인)
+    """
+    if not file.filename.endswith('.hwpx'):
+        raise HTTPException(status_code=400, detail="HWPX 파일만 지원합니다.")
+    
+    target_langs = parse_target_langs(target_lang)
+    
+    try:
+        create_deepl_translator()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DeepL 초기화 실패: {str(e)}")
+    
+    _prune_jobs()
+    if sum(1 for job in _jobs.values() if job.finished_at is None) >= settings.TRANSLATOR_JOB_MAX_PENDING:
+        raise HTTPException(status_code=429, detail="진행 중인 번역 작업이 많습니다. 잠시 후 다시 시도해주세요.")
+    
+    file_bytes = await file.read()
+    job = TranslationJob(uuid.uuid4().hex, file.filename, target_langs)
+    _jobs[job.job_id] = job
+    job.task = asyncio.create_task(_run_job(job, file_bytes, file.filename.rsplit('.', 1)[0], font_mode))
+    print(f"📥 번역 작업 등록: {job.job_id} ({file.filename}, {','.join(target_langs)})")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=TranslationJobResponse)
+async def get_translation_job(job_id: str):
+    """
+    번역 작업 진행 상황 (단계, 현재 XML 항목, 세그먼트 완료/전체)
+    """
+    _prune_jobs()
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="번역 작업을 찾을 수 없습니다.")
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_translation_job(job_id: str):
+    """
+    완료된 번역 작업 결과 다운로드
+    """
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="번역 작업을 찾을 수 없습니다.")
+    if job.error is not None:
+        raise HTTPException(status_code=500, detail=f"번역 실패: {job.error}")
+    if job.result is None:
+        raise HTTPException(status_code=409, detail="번역이 아직 끝나지 않았습니다.")
+    
+    translated_bytes, download_filename, stats = job.result
+    return Response(
+        content=translated_bytes,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="{download_filename}"',
+            "X-Translation-Languages": ",".join(job.target_langs),
+            **translation_headers(stats)
+        }
+    )
+
+
+def _job_response(job: TranslationJob) -> TranslationJobResponse:
+    """작업 상태 + 기록된 진행 상황"""
+    progress = _job_progress_entry(job.job_id)
+    status = job.status
+    if status == "done":
+        progress["stage"] = "done"
+    return TranslationJobResponse(
+        job_id=job.job_id,
+        status=status,
+        filename=job.filename,
+        target_langs=job.target_langs,
+        stage=progress.get("stage"),
+        current_part=progress.get("part"),
+        segments_done=progress.get("segments_done", 0),
+        segments_total=progress.get("segments_total", 0),
+        languages=progress.get("languages", {}),
+        error=job.error,
+        stats=job.result[2] if job.result else None,
+        elapsed_seconds=round((job.finished_at or time.time()) - job.created_at, 2),
+    )
+
+
+def combine_stats(stats_list: List[Dict]) -> Dict:
+    """
+    언어별 통계 합산
+
+    문서 세그먼트/run 수는 언어와 무관해 그대로 두고, 건너뛴/고유 세그먼트 수는 대상 언어마다
+    다르므로(needs_translation) 호출 수와 함께 합계, 소요 시간은 최댓값
+    """
+    combined = dict(stats_list[0])
+    for key in ("skipped_segments", "unique_segments", "deepl_segments", "deepl_calls", "gpt_calls",
+                "gpt_translations", "tm_deepl_hits", "tm_gpt_hits"):
+        combined[key] = sum(stats.get(key, 0) for stats in stats_list)
+    combined["total_seconds"] = max(stats.get("total_seconds", 0) for stats in stats_list)
+    return combined
+
+
+def translation_headers(stats: Dict) -> Dict[str, str]:
+    """번역 통계 응답 헤더"""
+    return {
+        "X-Translation-Segments": str(stats.get("segments", 0)),
+        "X-Translation-Skipped": str(stats.get("skipped_segments", 0)),
+        "X-Translation-Unique": str(stats.get("unique_segments", 0)),
+        "X-DeepL-Segments": str(stats.get("deepl_segments", 0)),
+        "X-DeepL-Calls": str(stats.get("deepl_calls", 0)),
+        "X-GPT-Calls": str(stats.get("gpt_calls", 0)),
+        "X-Translation-Seconds": str(stats.get("total_seconds", 0)),
+        "X-TM-DeepL-Hits": str(stats.get("tm_deepl_hits", 0)),
+        "X-TM-GPT-Hits": str(stats.get("tm_gpt_hits", 0)),
+    }
+
+
 def has_korean(text: str) -> bool:
     """한글 포함 여부 확인"""
     return bool(re.search(r'[가-힣]', text))
 
 
-def translate_hwpx_preserve_format(
-    file_bytes: bytes,
-    target_lang: str,
-    font_mode: str,
-    deepl_translator,
-    openai_client
-) -> bytes:
+def is_korean_target(target_lang: str) -> bool:
+    """한국어로 번역하는 요청인지 (한글 잔존 검사/건너뛰기 기준이 반대가 됨)"""
+    return target_lang.upper() == "KO"
+
+
+def needs_translation(korean: bool, target_lang: str) -> bool:
     """
-    HWPX 파일 번역 (구조 보존)
+    세그먼트를 번역할지 여부
+
+    외국어 대상이면 한글이 있는 세그먼트만, 한국어 대상이면 한글이 없는 세그먼트만 번역
+    (숫자/기호만 있는 세그먼트는 한국어 대상일 때도 DeepL이 그대로 돌려줌)
     """
+    return not korean if is_korean_target(target_lang) else korean
+
+
+# 문단 내 run 경계 자리표시자 (<r0>…</r0>)
+RUN_TAG = re.compile(r"r(\d+)")
+
+
+def build_paragraph_segment(texts: List[str]) -> str:
+    """
+    문단 하나의 run 텍스트를 번역 단위 1개로 합침
+
+    서식 때문에 문장이 여러 run으로 나뉘어도 한 번에 번역되도록 하고,
+    run이 여러 개면 <rN>…</rN> 자리표시자로 경계를 남김 (DeepL tag_handling="xml")
+    """
+    if len(texts) == 1:
+        return escape(texts[0])
+    return "".join(f"<r{k}>{escape(text)}</r{k}>" for k, text in enumerate(texts))
+
+
+def split_paragraph_segment(markup: str, run_count: int) -> Optional[List[str]]:
+    """
+    번역된 세그먼트를 run별 텍스트로 되돌림 (XML로 읽을 수 없으면 None)
+
+    태그 밖 텍스트는 바로 앞 run에 붙이고, 번역 결과에서 빠진 run은 빈 문자열로 둠
+    """
+    try:
+        root = etree.fromstring(f"<seg>{markup}</seg>")
+    except etree.XMLSyntaxError:
+        return None
+    texts = [""] * run_count
+    texts[0] += root.text or ""
+    last = 0
+    for child in root:
+        match = RUN_TAG.fullmatch(child.tag) if isinstance(child.tag, str) else None
+        if match and int(match.group(1)) < run_count:
+            last = int(match.group(1))
+        texts[last] += "".join(child.itertext()) + (child.tail or "")
+    return texts
+
+
+# HWPX 본문 요소 (hp 네임스페이스)
+HP_NAMESPACE = "http://www.hancom.co.kr/hwpml/2011/paragraph"
+HP_P = f"{{{HP_NAMESPACE}}}p"
+HP_T = f"{{{HP_NAMESPACE}}}t"
+HP_LINESEGARRAY = f"{{{HP_NAMESPACE}}}linesegarray"
+
+
+def scan_part(stream) -> Tuple[Any, List[List[Any]], bool]:
+    """
+    XML 항목을 한 번 훑으면서 t 요소를 문단(p)별로 묶고 linesegarray를 삭제
+
+    압축 해제 스트림을 바로 iterparse로 읽으므로 항목 전체 바이트를 따로 들고 있지 않고,
+    트리 전체 xpath 검색 없이 p/t/linesegarray 태그 이벤트만 처리함.
+    표 안 문단은 바깥 문단과 별도 문단으로 묶임
+
+    Returns:
+        (루트 요소, 문단별 t 요소 목록, linesegarray 삭제 여부)
+    """
+    groups: List[List[Any]] = []
+    open_paragraphs: List[List[Any]] = []
+    linesegarrays = []
+    context = etree.iterparse(
+        stream, events=("start", "end"), tag=(HP_P, HP_T, HP_LINESEGARRAY),
+        remove_blank_text=False, strip_cdata=False, huge_tree=True
+    )
+    for event, elem in context:
+        if elem.tag == HP_P:
+            if event == "start":
+                open_paragraphs.append([])
+                groups.append(open_paragraphs[-1])
+            else:
+                open_paragraphs.pop()
+        elif event == "end":
+            if elem.tag == HP_T:
+                if open_paragraphs:
+                    open_paragraphs[-1].append(elem)
+                else:
+                    groups.append([elem])
+            else:
+                linesegarrays.append(elem)
     
-    def extract_full_text(t_elem) -> str:
-        """t 요소에서 전체 텍스트 추출"""
-        texts = []
-        if t_elem.text:
-            texts.append(t_elem.text)
-        for child in t_elem:
-            local = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            if local == 'fwSpace':
-                texts.append(' ')
-            if child.tail:
-                texts.append(child.tail)
-        return ''.join(texts)
-    
-    def set_clean_text(t_elem, new_text: str):
-        """t 요소에 새 텍스트 설정"""
-        for child in list(t_elem):
-            t_elem.remove(child)
-        t_elem.text = new_text
-    
-    def gpt_translate_full(original: str, target_lang: str) -> Optional[str]:
-        """GPT 2차 번역"""
-        lang_names = {
-            "EN-US": "English", "EN-GB": "British English",
-            "JA": "Japanese", "ZH-HANS": "Simplified Chinese",
-            "ZH-HANT": "Traditional Chinese", "VI": "Vietnamese",
-            "TH": "Thai", "RU": "Russian", "AR": "Arabic",
-            "ES": "Spanish", "DE": "German", "FR": "French"
-        }
-        target_lang_name = lang_names.get(target_lang, "English")
-        
-        prompt = f"""Translate the following Korean text to {target_lang_name}.
-Preserve all formatting, numbers, and special characters.
+    # linesegarray 삭제 (레이아웃 재계산용) - 파싱이 끝난 뒤 떼어냄
+    for lsa in linesegarrays:
+        parent = lsa.getparent()
+        if parent is not None:
+            parent.remove(lsa)
+    return context.root, [group for group in groups if group], bool(linesegarrays)
 
-Korean text:
-{original}
 
-Return ONLY the translation, no explanations.
+def iter_batches(items: List[Any], max_items: int, max_bytes: int, text=lambda item: item) -> Iterator[List[Any]]:
+    """요청당 항목 개수/UTF-8 바이트 한도에 맞춰 순서대로 분할 (text: 항목 -> 원문)"""
+    batch, batch_bytes = [], 0
+    for item in items:
+        size = len(text(item).encode('utf-8'))
+        if batch and (len(batch) >= max_items or batch_bytes + size > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(item)
+        batch_bytes += size
+    if batch:
+        yield batch
 
-Translation:"""
-        
+
+def parse_fallback_response(raw: str) -> Dict[int, str]:
+    """GPT 묶음 응답 -> {id: 번역문} (형식이 맞지 않는 항목은 버림)"""
+    data = json.loads(raw)
+    translations = data.get("translations") if isinstance(data, dict) else None
+    results = {}
+    for entry in translations or []:
+        if not isinstance(entry, dict) or not isinstance(entry.get("text"), str):
+            continue
+        try:
+            results[int(entry.get("id"))] = entry["text"].strip()
+        except (TypeError, ValueError):
+            continue
+    return results
+
+
+async def gpt_fallback_translate(pending: Dict[int, str], target_lang: str, stats: Dict,
+                                 validate: Callable[[int, str], bool] = lambda i, text: True,
+                                 on_progress: Optional[Callable[[int], None]] = None) -> Dict[int, str]:
+    """
+    DeepL 결과에 한글이 남은 세그먼트 GPT 2차 번역
+
+    세그먼트를 id가 붙은 JSON 배열로 묶어 TRANSLATOR_GPT_CONCURRENCY개까지 동시에 요청하고,
+    응답은 세그먼트별로 검증(요청한 id, 빈 문자열 아님, 한글 없음(외국어 대상), validate 통과)해 통과한 것만 반환.
+    여러 개 묶음에서 검증에 실패한 세그먼트는 1개씩 한 번 더 요청함
+
+    Args:
+        pending: {세그먼트 id: 원문}
+        validate: (세그먼트 id, 번역문) -> 사용 가능 여부 (자리표시자 확인 등)
+        on_progress: 묶음 1건이 끝날 때마다 지금까지 번역된 세그먼트 수로 호출
+
+    Returns:
+        {세그먼트 id: 번역문}
+    """
+    semaphore = asyncio.Semaphore(settings.TRANSLATOR_GPT_CONCURRENCY)
+    target_lang_name = GPT_LANGUAGE_NAMES.get(target_lang, "English")
+    check_korean = not is_korean_target(target_lang)
+    results: Dict[int, str] = {}
+
+    async def run_pack(pack: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """묶음 1건 요청 -> 검증 실패 세그먼트 목록"""
+        segments_json = json.dumps([{"id": i, "text": text} for i, text in pack], ensure_ascii=False)
+        stats["gpt_calls"] += 1
         try:
-            resp = openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"You are a professional translator. Translate Korean to {target_lang_name}."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1
-            )
-            return resp.choices[0].message.content.strip()
-        except Exception:
-            return None
+            async with semaphore:
+                raw = await openai_service.generate_prompt(
+                    FALLBACK_PROMPT,
+                    {"target_lang_name": target_lang_name, "segments_json": segments_json},
+                    model=settings.LLM_MODEL_TIERS["fast"],
+                    temperature=0.1,
+                    max_tokens=min(4000, 200 + 2 * len(segments_json)),
+                    response_format={"type": "json_object"},
+                    priority="batch",
+                )
+            translations = parse_fallback_response(raw)
+        except Exception as e:
+            print(f"⚠️ GPT 2차 번역 실패 ({len(pack)}건): {e}")
+            translations = {}
+
+        failed = []
+        for i, original in pack:
+            candidate = translations.get(i)
+            if candidate and not (check_korean and has_korean(candidate)) and validate(i, candidate):
+                results[i] = candidate
+            else:
+                failed.append((i, original))
+        if on_progress:
+            on_progress(len(results))
+        return failed
+
+    packs = list(iter_batches(
+        list(pending.items()), settings.TRANSLATOR_GPT_BATCH_SEGMENTS, settings.TRANSLATOR_GPT_BATCH_BYTES,
+        text=lambda item: item[1]
+    ))
+    failed = await asyncio.gather(*(run_pack(pack) for pack in packs))
+    retry = [item for pack, items in zip(packs, failed) if len(pack) > 1 for item in items]
+    if retry:
+        await asyncio.gather(*(run_pack([item]) for item in retry))
+    return results
+
+
+def extract_full_text(t_elem) -> str:
+    """t 요소에서 전체 텍스트 추출"""
+    texts = []
+    if t_elem.text:
+        texts.append(t_elem.text)
+    for child in t_elem:
+        local = child.tag.split('}')[-1] if '}' in child.tag else child.tag
+        if local == 'fwSpace':
+            texts.append(' ')
+        if child.tail:
+            texts.append(child.tail)
+    return ''.join(texts)
+
+
+def set_clean_text(t_elem, new_text: str):
+    """t 요소에 새 텍스트 설정"""
+    for child in list(t_elem):
+        t_elem.remove(child)
+    t_elem.text = new_text
+
+
+class SegmentTable:
+    """
+    번역할 세그먼트 목록 (XML 트리 없이 번역에 필요한 값만 담아 프로세스 간에 주고받을 수 있음)
+
+    - originals: 중복 제거된 세그먼트, run_counts: originals별 run 개수, korean: originals별 한글 포함 여부
+      (번역할지는 대상 언어마다 다르므로 needs_translation으로 언어별로 고름)
+    - target_indices: 문서에 나오는 문단 순서대로의 originals 인덱스
+    """
+
+    def __init__(self):
+        self.originals: List[str] = []
+        self.run_counts: List[int] = []
+        self.korean: List[bool] = []
+        self.target_indices: List[int] = []
+        self.stats = {"segments": 0, "runs": 0}
+
+    def is_valid(self, i: int, translated: str) -> bool:
+        """자리표시자 구조가 살아 있어 run별로 되돌릴 수 있는지"""
+        return split_paragraph_segment(translated, self.run_counts[i]) is not None
+
+
+class ParsedHwpx(SegmentTable):
+    """
+    번역 대상을 수집한 HWPX (언어와 무관하므로 여러 언어 번역에 한 번만 만듦)
+
+    - parts: (항목 이름, XML 트리, 변경 여부) - 번역 문단이나 linesegarray가 있던 항목만 다시 씀
+    - targets: (문단의 t 요소 목록, originals 인덱스)
+    - rendered: 한 번이라도 번역문을 써 넣은 originals 인덱스 (다른 언어에서 건너뛸 때 원문 복원용)
+    """
+
+    def __init__(self, file_bytes: bytes):
+        super().__init__()
+        self.file_bytes = file_bytes
+        self.parts: List[Tuple[str, Any, bool]] = []
+        self.targets: List[Tuple[List[Any], int]] = []
+        self.rendered: Set[int] = set()
+
+    def segment_table(self) -> SegmentTable:
+        """XML 트리를 뺀 세그먼트 목록 (프로세스 풀 작업자가 API 프로세스로 돌려보낼 값)"""
+        table = SegmentTable()
+        table.originals = self.originals
+        table.run_counts = self.run_counts
+        table.korean = self.korean
+        table.target_indices = self.target_indices
+        table.stats = dict(self.stats)
+        return table
+
+
+def parse_hwpx(file_bytes: bytes, on_progress: Optional[Callable[[Dict], None]] = None) -> ParsedHwpx:
+    """
+    업로드 바이트에서 바로 XML 항목을 읽어 번역할 문단을 수집 (디스크에 풀지 않음)
+
+    문단 단위 세그먼트로 합치고 한글 포함 여부를 기록함 (건너뛸 문단은 대상 언어별로 translate_segments에서 고름).
+    같은 세그먼트(공백 정규화 기준)는 한 번만 번역해 모든 위치에 반영하도록 묶음.
+    linesegarray(레이아웃 캐시)는 언어와 무관하게 지워야 하므로 여기서 삭제 (scan_part)
+    """
+    started = time.perf_counter()
+    doc = ParsedHwpx(file_bytes)
+    unique_index: Dict[str, int] = {}
+    with zipfile.ZipFile(BytesIO(file_bytes)) as source:
+        for info in source.infolist():
+            if not info.filename.endswith('.xml') or info.filename.rsplit('/', 1)[-1] == 'header.xml':
+                continue
+            if on_progress:
+                on_progress({"stage": "parse", "part": info.filename, "done": 0, "total": 0})
+            try:
+                with source.open(info) as stream:
+                    tree, paragraphs, stripped = scan_part(stream)
+            except etree.XMLSyntaxError:
+                continue
+            
+            count = 0
+            for t_elems in paragraphs:
+                runs = [(t_elem, extract_full_text(t_elem)) for t_elem in t_elems]
+                runs = [(t_elem, text) for t_elem, text in runs if text]
+                if not any(text.strip() for _, text in runs):
+                    continue
+                doc.stats["segments"] += 1
+                segment = build_paragraph_segment([text for _, text in runs])
+                key = normalize_segment(segment)
+                if key not in unique_index:
+                    unique_index[key] = len(doc.originals)
+                    doc.originals.append(segment)
+                    doc.run_counts.append(len(runs))
+                    doc.korean.append(any(has_korean(text) for _, text in runs))
+                doc.targets.append(([t_elem for t_elem, _ in runs], unique_index[key]))
+                doc.target_indices.append(unique_index[key])
+                doc.stats["runs"] += len(runs)
+                count += 1
+            doc.parts.append((info.filename, tree, bool(count or stripped)))
     
-    # 임시 파일로 저장
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".hwpx") as tmp_input:
-        tmp_input.write(file_bytes)
-        tmp_input_path = tmp_input.name
+    doc.stats["parse_seconds"] = round(time.perf_counter() - started, 3)
+    return doc
+
+
+async def translate_segments(doc: SegmentTable, target_lang: str, deepl_translator, stats: Dict,
+                             on_progress: Optional[Callable[[Dict], None]] = None) -> List[Optional[str]]:
+    """
+    고유 세그먼트 번역 -> originals와 같은 순서의 번역문 (번역하지 않는 세그먼트는 None)
+
+    대상 언어 기준으로 번역할 세그먼트만 골라(needs_translation) 번역 메모리에 없는 것만
+    DeepL에 묶음으로 보내고, 외국어 대상에서 한글이 남으면 GPT 2차 번역.
+    새 번역 결과는 번역 메모리에 저장함.
+    on_progress는 {"stage": "deepl"|"gpt", "done", "total"}로 진행 상황을 받음
+    (total은 번역할 고유 세그먼트 수, gpt 단계의 done은 더 번역할 필요가 없는 세그먼트 수)
+    """
+    memory = get_translation_memory()
+    wanted = [i for i, korean in enumerate(doc.korean) if needs_translation(korean, target_lang)]
+    wanted_set = set(wanted)
+    originals = [doc.originals[i] for i in wanted]
+    stats["unique_segments"] = len(wanted)
+    stats["skipped_segments"] = sum(1 for i in doc.target_indices if i not in wanted_set)
     
-    extract_dir = tempfile.mkdtemp()
+    def report(stage: str, done: int, total: int):
+        if on_progress:
+            on_progress({"stage": stage, "part": None, "done": done, "total": total})
     
-    try:
-        # HWPX 압축 해제
-        with zipfile.ZipFile(tmp_input_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        
-        # XML 파일 찾기
-        xml_files = []
-        for root, dirs, files in os.walk(extract_dir):
-            for f in files:
-                if f.endswith('.xml') and f != 'header.xml':
-                    xml_files.append(os.path.join(root, f))
-        
-        total_translations = 0
-        gpt_translations = 0
-        
-        # 각 XML 파일 번역
-        for xml_file in xml_files:
-            with open(xml_file, 'rb') as f:
-                xml_content = f.read()
-            
+    async def translate_batches(texts: List[str]) -> List[Optional[str]]:
+        """DeepL 일괄 번역 (실패한 묶음은 None, SDK가 동기식이라 스레드에서 호출)"""
+        results = []
+        cached = len(originals) - len(texts)
+        report("deepl", cached, len(originals))
+        for batch in iter_batches(texts, settings.DEEPL_BATCH_MAX_TEXTS, settings.DEEPL_BATCH_MAX_BYTES):
+            stats["deepl_calls"] += 1
             try:
-                parser = etree.XMLParser(remove_blank_text=False, strip_cdata=False)
-                tree = etree.fromstring(xml_content, parser)
-                
-                t_elements = tree.xpath(".//*[local-name()='t']")
-                for t_elem in t_elements:
-                    original_text = extract_full_text(t_elem)
-                    if not original_text or not original_text.strip():
-                        continue
-                    
-                    # DeepL 1차 번역
-                    try:
-                        deepl_result = deepl_translator.translate_text(
-                            original_text, target_lang=target_lang
-                        ).text
-                    except Exception:
-                        deepl_result = original_text
-                    
-                    final_translation = deepl_result
-                    
-                    # 한글 잔존 시 GPT 2차 번역
-                    if has_korean(deepl_result):
-                        gpt_result = gpt_translate_full(original_text, target_lang)
-                        if gpt_result and not has_korean(gpt_result):
-                            final_translation = gpt_result
-                            gpt_translations += 1
-                    
-                    set_clean_text(t_elem, final_translation)
-                    total_translations += 1
-                
-                # linesegarray 삭제 (레이아웃 재계산용)
-                linesegarray_elements = tree.xpath(".//*[local-name()='linesegarray']")
-                for lsa in linesegarray_elements:
-                    parent = lsa.getparent()
-                    if parent is not None:
-                        parent.remove(lsa)
-                
-                with open(xml_file, 'wb') as f:
-                    f.write(etree.tostring(
-                        tree, encoding='UTF-8', xml_declaration=True, pretty_print=False
-                    ))
-                    
-            except etree.XMLSyntaxError:
-                pass
-        
-        # 재압축
-        output_buffer = BytesIO()
-        with zipfile.ZipFile(output_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-            for root, dirs, files in os.walk(extract_dir):
-                for f in files:
-                    file_path = os.path.join(root, f)
-                    arcname = os.path.relpath(file_path, extract_dir)
-                    zip_out.write(file_path, arcname)
-        
-        return output_buffer.getvalue()
-        
-    finally:
-        os.remove(tmp_input_path)
-        shutil.rmtree(extract_dir)
+                with metrics.observe_external("deepl", "translate"):
+                    translated = await asyncio.to_thread(
+                        deepl_translator.translate_text, batch, target_lang=target_lang, tag_handling="xml"
+                    )
+                results.extend(r.text for r in translated)
+            except Exception as e:
+                print(f"⚠️ DeepL 일괄 번역 실패 ({len(batch)}건, 원문 유지): {e}")
+                results.extend([None] * len(batch))
+            report("deepl", cached + len(results), len(originals))
+        return results
+    
+    def lookup_memory(indices: List[int], engine: str) -> List[Optional[str]]:
+        """번역 메모리 조회 (없거나 run별로 되돌릴 수 없으면 None)"""
+        if memory is None or not indices:
+            return [None] * len(indices)
+        found = memory.get_many([originals[i] for i in indices], target_lang, engine)
+        results = []
+        for i in indices:
+            cached = found.get(normalize_segment(originals[i]))
+            results.append(cached if cached is not None and doc.is_valid(wanted[i], cached) else None)
+        stats[f"tm_{engine}_hits"] += sum(r is not None for r in results)
+        return results
+    
+    # 1) 번역 메모리에 없는 세그먼트만 DeepL 1차 번역 (묶음 요청)
+    step = time.perf_counter()
+    deepl_results = lookup_memory(list(range(len(originals))), "deepl")
+    pending = [i for i, result in enumerate(deepl_results) if result is None]
+    stats["deepl_segments"] = len(pending)
+    fresh = await translate_batches([originals[i] for i in pending])
+    fresh = [result if result is not None and doc.is_valid(wanted[i], result) else None
+             for i, result in zip(pending, fresh)]
+    for i, result in zip(pending, fresh):
+        deepl_results[i] = result
+    if memory is not None:
+        memory.put_many(
+            [(originals[i], result) for i, result in zip(pending, fresh) if result is not None],
+            target_lang, "deepl"
+        )
+    stats["deepl_seconds"] = round(time.perf_counter() - step, 3)
+    
+    # 2) 한글 잔존 시 GPT 2차 번역 (번역 메모리 우선, 묶음 병렬 요청, 한국어 대상이면 생략)
+    step = time.perf_counter()
+    final_translations = [result or original for result, original in zip(deepl_results, originals)]
+    korean_left = [] if is_korean_target(target_lang) else [
+        i for i, result in enumerate(final_translations) if has_korean(result)
+    ]
+    gpt_cached = lookup_memory(korean_left, "gpt")
+    gpt_pending = {}
+    for i, cached in zip(korean_left, gpt_cached):
+        if cached is not None:
+            final_translations[i] = cached
+        else:
+            gpt_pending[i] = originals[i]
+    settled = len(originals) - len(gpt_pending)
+    report("gpt", settled, len(originals))
+    gpt_results = await gpt_fallback_translate(
+        gpt_pending, target_lang, stats, validate=lambda i, text: doc.is_valid(wanted[i], text),
+        on_progress=lambda done: report("gpt", settled + done, len(originals))
+    )
+    for i, gpt_result in gpt_results.items():
+        final_translations[i] = gpt_result
+    stats["gpt_translations"] = len(gpt_results)
+    if memory is not None:
+        memory.put_many([(originals[i], result) for i, result in gpt_results.items()], target_lang, "gpt")
+    stats["gpt_seconds"] = round(time.perf_counter() - step, 3)
+    
+    translations: List[Optional[str]] = [None] * len(doc.originals)
+    for i, translated in zip(wanted, final_translations):
+        translations[i] = translated
+    return translations
+
+
+def render_hwpx(doc: ParsedHwpx, translations: List[Optional[str]], stats: Dict) -> bytes:
+    """
+    번역문을 run별로 나눠 넣고 새 HWPX 바이트 생성
+
+    XML 트리를 언어마다 덮어쓰므로 한 언어의 렌더링은 중간에 다른 작업과 섞이지 않게
+    동기 함수로 한 번에 끝냄. 번역하지 않은 문단(None)은 그대로 두되, 앞서 다른 언어 번역문을
+    써 넣은 문단이면 원문으로 되돌림. 바뀐 XML 항목만 다시 압축하고 나머지는 압축된 바이트 그대로 복사
+    """
+    step = time.perf_counter()
+    for t_elems, i in doc.targets:
+        translated = translations[i]
+        if translated is None:
+            if i not in doc.rendered:
+                continue
+            translated = doc.originals[i]
+        else:
+            doc.rendered.add(i)
+        texts = split_paragraph_segment(translated, len(t_elems))
+        for t_elem, text in zip(t_elems, texts):
+            set_clean_text(t_elem, text)
+    
+    # 바뀐 항목만 다시 직렬화
+    replacements = {
+        name: etree.tostring(tree, encoding='UTF-8', xml_declaration=True, pretty_print=False)
+        for name, tree, changed in doc.parts if changed
+    }
+    
+    # 나머지 항목(이미지, header.xml 등)은 압축된 바이트 그대로 복사
+    output = rewrite_zip(doc.file_bytes, replacements)
+    stats["rewritten_parts"] = len(replacements)
+    stats["write_seconds"] = round(time.perf_counter() - step, 3)
+    return output
+
+
+async def translate_table(table: SegmentTable, target_lang: str, deepl_translator, stats: Dict,
+                          on_progress: Optional[Callable[[Dict], None]] = None) -> List[Optional[str]]:
+    """세그먼트 목록을 한 언어로 번역 (stats에 문서 통계와 호출 수/단계별 시간을 채움)"""
+    stats.update(table.stats)
+    stats.update({
+        "deepl_segments": 0, "deepl_calls": 0, "gpt_calls": 0, "gpt_translations": 0,
+        "tm_deepl_hits": 0, "tm_gpt_hits": 0,
+    })
+    translations = await translate_segments(table, target_lang, deepl_translator, stats, on_progress)
+    if on_progress:
+        total = stats["unique_segments"]
+        on_progress({"stage": "render", "part": None, "done": total, "total": total})
+    return translations
+
+
+def log_translation(target_lang: str, stats: Dict):
+    """언어별 번역 결과 요약 로그"""
+    print(
+        f"🌐 HWPX 번역 완료 [{target_lang}] 문단 세그먼트 {stats['segments']}개 (run {stats['runs']}) "
+        f"(번역 불필요 {stats['skipped_segments']}, 고유 {stats['unique_segments']}, DeepL 전송 {stats['deepl_segments']}), "
+        f"DeepL {stats['deepl_calls']}회 ({stats['deepl_seconds']}s), "
+        f"GPT {stats['gpt_calls']}회 ({stats['gpt_seconds']}s), "
+        f"번역 메모리 적중 DeepL {stats['tm_deepl_hits']}/GPT {stats['tm_gpt_hits']}, "
+        f"다시 쓴 항목 {stats['rewritten_parts']}개, 총 {stats['total_seconds']}s"
+    )
+
+
+async def translate_parsed_hwpx(doc: ParsedHwpx, target_lang: str, deepl_translator,
+                                stats: Optional[Dict] = None,
+                                on_progress: Optional[Callable[[Dict], None]] = None) -> bytes:
+    """파싱해 둔 HWPX를 한 언어로 번역 (stats를 넘기면 세그먼트/호출 수/단계별 시간을 채움)"""
+    if stats is None:
+        stats = {}
+    started = time.perf_counter()
+    translations = await translate_table(doc, target_lang, deepl_translator, stats, on_progress)
+    output = render_hwpx(doc, translations, stats)
+    stats["total_seconds"] = round(stats["parse_seconds"] + time.perf_counter() - started, 3)
+    log_translation(target_lang, stats)
+    return output
+
+
+def _tag_progress(on_progress: Optional[Callable[[Dict], None]],
+                  target_lang: Optional[str]) -> Optional[Callable[[Dict], None]]:
+    """진행 상황에 대상 언어 표시를 붙여 전달"""
+    if on_progress is None:
+        return None
+    return lambda update: on_progress({**update, "target_lang": target_lang})
+
+
+async def translate_hwpx_preserve_format(
+    file_bytes: bytes,
+    target_lang: str,
+    font_mode: str,
+    deepl_translator,
+    stats: Optional[Dict] = None,
+    on_progress: Optional[Callable[[Dict], None]] = None
+) -> bytes:
+    """
+    HWPX 파일 번역 (구조 보존)
+
+    문단(p)마다 run(t 요소)을 자리표시자로 합쳐 번역 단위 1개로 만들고,
+    대상 언어로 번역할 필요가 없는 문단(외국어 대상이면 한글 없음, 한국어 대상이면 한글 있음)은
+    건너뛰고 같은 원문은 하나로 묶은 뒤,
+    번역 메모리에 없는 것만 DeepL에 묶음으로 보내고
+    결과를 순서대로 되돌려 씀. 새 번역 결과는 번역 메모리에 저장함.
+    번역 결과는 자리표시자 기준으로 다시 run별로 나눠 넣으므로 run 서식(charPrIDRef)과
+    font_mode 처리는 그대로 유지됨. 압축은 메모리에서 풀고, 바뀐 XML 항목만 다시 압축해 나머지 항목과 함께 새 ZIP으로 씀.
+    stats를 넘기면 세그먼트 수, API 호출 수, 단계별 소요 시간을 채움.
+    on_progress는 {"target_lang", "stage", "part", "done", "total"}로 진행 상황을 받음
+    """
+    report = _tag_progress(on_progress, target_lang)
+    return await translate_parsed_hwpx(
+        parse_hwpx(file_bytes, _tag_progress(on_progress, None)), target_lang, deepl_translator, stats, report
+    )
+
+
+async def translate_hwpx_multi(
+    file_bytes: bytes,
+    target_langs: List[str],
+    font_mode: str,
+    deepl_translator,
+    on_progress: Optional[Callable[[Dict], None]] = None
+) -> Dict[str, Tuple[bytes, Dict]]:
+    """
+    HWPX 하나를 여러 언어로 번역 (파싱/세그먼트 수집은 한 번, 언어별 번역은 동시에)
+
+    Returns:
+        {대상 언어: (HWPX 바이트, 통계)}
+    """
+    doc = parse_hwpx(file_bytes, _tag_progress(on_progress, None))
+
+    async def translate_one(target_lang: str) -> Tuple[bytes, Dict]:
+        stats = {}
+        output = await translate_parsed_hwpx(
+            doc, target_lang, deepl_translator, stats, _tag_progress(on_progress, target_lang)
+        )
+        return output, stats
+
+    results = await asyncio.gather(*(translate_one(lang) for lang in target_langs))
+    return dict(zip(target_langs, results))
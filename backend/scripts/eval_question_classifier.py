@@ -0,0 +1,128 @@
+"""
+선거법 질문 유형 로컬 분류기 평가 스크립트
+
+라벨링된 예시(question_type_examples.json)로 leave-one-out 정확도,
+확신도 기준별 커버리지(LLM 폴백 없이 처리되는 비율), 질문당 지연시간을 측정
+
+사용법 (backend 디렉토리에서):
+    python scripts/eval_question_classifier.py
+    python scripts/eval_question_classifier.py --llm   # LLM 분류와 비교 (API 호출 발생)
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.question_classifier import QuestionTypeClassifier, SOFTMAX_TEMPERATURE  # noqa: E402
+
+DEFAULT_EXAMPLES = os.path.join(BACKEND_DIR, "data", "election_law", "question_type_examples.json")
+THRESHOLDS = [0.0, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def _percentile(values, pct):
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def leave_one_out(classifier: QuestionTypeClassifier, examples: dict):
+    """예시 하나씩 빼고 중심을 다시 계산해 예측 -> [(정답, 예측, 확신도)]"""
+    labels = [label for label in examples if examples[label]]
+    embeddings = {label: classifier._encode(examples[label]) for label in labels}
+
+    results = []
+    for label in labels:
+        for i in range(len(examples[label])):
+            centroids = []
+            for other in labels:
+                vecs = embeddings[other]
+                if other == label:
+                    vecs = np.delete(vecs, i, axis=0)
+                centroid = vecs.mean(axis=0)
+                centroids.append(centroid / max(np.linalg.norm(centroid), 1e-12))
+            sims = np.vstack(centroids) @ embeddings[label][i]
+            logits = (sims - sims.max()) / SOFTMAX_TEMPERATURE
+            probs = np.exp(logits) / np.exp(logits).sum()
+            best = int(np.argmax(probs))
+            results.append((label, labels[best], float(probs[best])))
+    return results
+
+
+def measure_latency(classifier: QuestionTypeClassifier, questions, repeat: int = 3):
+    """질문 1건 예측(임베딩 포함) 지연시간 (ms)"""
+    classifier.predict(questions[0])  # 워밍업
+    latencies = []
+    for _ in range(repeat):
+        for q in questions:
+            start = time.perf_counter()
+            classifier.predict(q)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def evaluate_llm(examples: dict):
+    """기존 LLM 분류 정확도/지연시간"""
+    from routers.election_law import classify_question_type_llm
+
+    correct, latencies = 0, []
+    total = 0
+    for label, questions in examples.items():
+        for q in questions:
+            start = time.perf_counter()
+            predicted = await classify_question_type_llm(q)
+            latencies.append((time.perf_counter() - start) * 1000)
+            correct += predicted == label
+            total += 1
+    return correct / max(total, 1), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질문 유형 로컬 분류기 평가")
+    parser.add_argument("--examples", default=DEFAULT_EXAMPLES, help="라벨링된 예시 JSON 경로")
+    parser.add_argument("--llm", action="store_true", help="LLM 분류와 비교 (OpenAI API 호출)")
+    args = parser.parse_args()
+
+    with open(args.examples, "r", encoding="utf-8") as f:
+        examples = json.load(f)
+
+    classifier = QuestionTypeClassifier(examples_path=args.examples)
+    total = sum(len(v) for v in examples.values())
+    print(f"📚 예시 {total}개 ({', '.join(f'{k}:{len(v)}' for k, v in examples.items())})")
+
+    results = leave_one_out(classifier, examples)
+    accuracy = sum(t == p for t, p, _ in results) / len(results)
+    print(f"\n🎯 Leave-one-out 정확도 (폴백 없음): {accuracy:.1%}")
+
+    print("\n확신도 기준 | 로컬 처리율 | 로컬 처리분 정확도")
+    for threshold in THRESHOLDS:
+        confident = [(t, p) for t, p, c in results if c >= threshold]
+        coverage = len(confident) / len(results)
+        conf_acc = sum(t == p for t, p in confident) / len(confident) if confident else 0.0
+        print(f"  {threshold:>8.2f}  | {coverage:>9.1%}  | {conf_acc:>9.1%}")
+
+    errors = [(t, p, c) for t, p, c in results if t != p]
+    if errors:
+        print("\n❌ 오분류 (정답 → 예측, 확신도)")
+        for t, p, c in errors:
+            print(f"  {t} → {p} ({c:.2f})")
+
+    classifier.load()
+    questions = [q for qs in examples.values() for q in qs]
+    latencies = measure_latency(classifier, questions)
+    print(f"\n⏱️ 로컬 분류 지연시간: p50 {_percentile(latencies, 50):.1f}ms / "
+          f"p95 {_percentile(latencies, 95):.1f}ms")
+
+    if args.llm:
+        llm_accuracy, llm_latencies = asyncio.run(evaluate_llm(examples))
+        print(f"\n🤖 LLM 분류 정확도: {llm_accuracy:.1%}")
+        print(f"⏱️ LLM 분류 지연시간: p50 {_percentile(llm_latencies, 50):.0f}ms / "
+              f"p95 {_percentile(llm_latencies, 95):.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""LLM 헤지 요청 정책 (첫 토큰이 늦으면 같은 요청을 한 번 더 보내 먼저 응답한 쪽 사용)"""
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from config import settings
+from services.llm_scheduler import _percentile
+
+
+class HedgeDecision:
+    """요청 1건의 헤지 여부 (동시 요청끼리 섞이지 않도록 요청마다 따로 기록)"""
+
+    __slots__ = ("model", "hedged")
+
+    def __init__(self, model: str):
+        self.model = model
+        self.hedged = False
+
+
+class HedgePolicy:
+    """
+    모델별 최근 TTFT 분포로 헤지 지연을 정하고, 헤지 비율 상한을 관리
+
+    - 헤지 지연: 최근 TTFT의 LLM_HEDGE_PERCENTILE 분위수 (샘플이 적으면 기본값)
+    - 예산: 최근 LLM_HEDGE_WINDOW건 중 헤지 비율이 LLM_HEDGE_MAX_RATE를 넘으면 헤지하지 않음
+    """
+
+    def __init__(self):
+        self._ttft: Dict[str, deque] = {}
+        self._decisions: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _samples(self, store: Dict[str, deque], model: str) -> deque:
+        if model not in store:
+            store[model] = deque(maxlen=settings.LLM_HEDGE_WINDOW)
+        return store[model]
+
+    def _count(self, model: str, event: str):
+        counts = self._counts.setdefault(model, {"requests": 0, "issued": 0, "won": 0, "budget_exceeded": 0})
+        counts[event] += 1
+
+    def observe_ttft(self, model: str, seconds: float):
+        self._samples(self._ttft, model).append(seconds)
+
+    def delay(self, model: str) -> float:
+        """이 시간 안에 첫 토큰이 없으면 헤지 (초)"""
+        samples = self._samples(self._ttft, model)
+        if len(samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return settings.LLM_HEDGE_DEFAULT_DELAY_S
+        return max(_percentile(samples, settings.LLM_HEDGE_PERCENTILE), settings.LLM_HEDGE_MIN_DELAY_S)
+
+    def _rate(self, model: str) -> float:
+        decisions = self._samples(self._decisions, model)
+        return sum(d.hedged for d in decisions) / max(len(decisions), 1)
+
+    def start_request(self, model: str) -> HedgeDecision:
+        """헤지 대상 요청 1건 시작 (기본은 헤지 안 함으로 기록, try_hedge에 넘길 기록 반환)"""
+        decision = HedgeDecision(model)
+        self._samples(self._decisions, model).append(decision)
+        self._count(model, "requests")
+        return decision
+
+    def try_hedge(self, decision: HedgeDecision) -> bool:
+        """예산 안이면 이 요청을 헤지로 기록하고 True"""
+        model = decision.model
+        if self._rate(model) >= settings.LLM_HEDGE_MAX_RATE:
+            self._count(model, "budget_exceeded")
+            return False
+        decision.hedged = True
+        self._count(model, "issued")
+        return True
+
+    def record_win(self, model: str):
+        self._count(model, "won")
+
+    def snapshot(self) -> Dict:
+        """모델별 헤지 지연/비율/횟수"""
+        result = {}
+        for model, counts in self._counts.items():
+            result[model] = {
+                **counts,
+                "delay_s": round(self.delay(model), 3),
+                "recent_hedge_rate": round(self._rate(model), 3),
+            }
+        return result
+
+
+_policy: Optional[HedgePolicy] = None
+
+
+def get_hedge_policy() -> HedgePolicy:
+    global _policy
+    if _policy is None:
+        _policy = HedgePolicy()
+    return _policy
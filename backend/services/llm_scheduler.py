@@ -0,0 +1,239 @@
+"""LLM 호출 스케줄러 (모델별 동시성/TPM 제한 + 우선순위 + 429 백오프)"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from config import settings
+
+# 우선순위 클래스 (숫자가 작을수록 먼저 처리)
+PRIORITIES = {
+    "interactive": 0,
+    "batch": 1,
+}
+
+# 설정에 없는 모델에 적용할 기본 제한
+DEFAULT_LIMITS = {"concurrency": 8, "tpm": 100000}
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# 대기시간 통계에 보관할 최근 샘플 수
+WAIT_SAMPLE_SIZE = 200
+
+
+def _percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(int(len(ordered) * pct), len(ordered) - 1)
+    return ordered[idx]
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """429/5xx/연결 오류 여부"""
+    try:
+        import openai
+    except ImportError:
+        return False
+
+    if isinstance(e, (openai.APIConnectionError, openai.APITimeoutError, openai.RateLimitError)):
+        return True
+    if isinstance(e, openai.APIStatusError):
+        return e.status_code in RETRYABLE_STATUS
+    return False
+
+
+def _retry_after_seconds(e: Exception) -> Optional[float]:
+    """응답 헤더의 Retry-After 값 (초)"""
+    response = getattr(e, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class _ModelLane:
+    """모델 하나에 대한 동시성 슬롯 + 토큰 버킷 + 우선순위 대기열"""
+
+    def __init__(self, model: str, concurrency: int, tpm: int):
+        self.model = model
+        self.concurrency = concurrency
+        self.tpm = tpm
+        self.active = 0
+        self.tokens = float(tpm)
+        self.updated_at = time.monotonic()
+        self.waiters = []  # (priority, seq, est_tokens, future)
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+        self.completed = 0
+        self.retries = 0
+        self.failures = 0
+        self.wait_samples = {name: deque(maxlen=WAIT_SAMPLE_SIZE) for name in PRIORITIES}
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.tpm, self.tokens + (now - self.updated_at) * self.tpm / 60.0)
+        self.updated_at = now
+
+    def dispatch(self):
+        """빈 슬롯과 토큰이 있는 만큼 대기열 앞쪽 요청 깨우기"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self._refill()
+
+        while self.waiters and self.active < self.concurrency:
+            priority, seq, est_tokens, future = self.waiters[0]
+            if future.done():
+                heapq.heappop(self.waiters)
+                continue
+
+            # 한 번의 요청이 버킷보다 크면 가득 찬 버킷으로 통과시킴
+            needed = min(est_tokens, self.tpm)
+            if self.tokens < needed:
+                delay = (needed - self.tokens) * 60.0 / self.tpm
+                loop = asyncio.get_running_loop()
+                self.timer = loop.call_later(delay, self.dispatch)
+                return
+
+            heapq.heappop(self.waiters)
+            self.tokens -= needed
+            self.active += 1
+            future.set_result(needed)
+
+    def release(self, reserved: float, actual_tokens: Optional[int]):
+        """슬롯 반환 + 실제 사용량 기준으로 예약 토큰 정산"""
+        self.active -= 1
+        if actual_tokens is not None:
+            self._refill()
+            self.tokens = min(self.tpm, self.tokens + reserved - min(actual_tokens, self.tpm))
+        self.dispatch()
+
+    def queue_depth(self) -> Dict[str, int]:
+        depth = {name: 0 for name in PRIORITIES}
+        names = {v: k for k, v in PRIORITIES.items()}
+        for priority, _, _, future in self.waiters:
+            if not future.done():
+                depth[names[priority]] += 1
+        return depth
+
+    def snapshot(self) -> Dict:
+        self._refill()
+        return {
+            "concurrency": self.concurrency,
+            "tpm": self.tpm,
+            "active": self.active,
+            "tokens_available": int(self.tokens),
+            "queue_depth": self.queue_depth(),
+            "completed": self.completed,
+            "retries": self.retries,
+            "failures": self.failures,
+            "wait_seconds": {
+                name: {
+                    "p50": round(_percentile(samples, 0.5), 3),
+                    "p95": round(_percentile(samples, 0.95), 3),
+                    "max": round(max(samples), 3) if samples else 0.0,
+                }
+                for name, samples in self.wait_samples.items()
+            },
+        }
+
+
+class LLMScheduler:
+    """프로세스 전역 LLM 호출 스케줄러"""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, int]]] = None):
+        self.limits = limits if limits is not None else settings.LLM_MODEL_LIMITS
+        self.lanes: Dict[str, _ModelLane] = {}
+        self._seq = itertools.count()
+
+    def _lane(self, model: str) -> _ModelLane:
+        if model not in self.lanes:
+            limit = {**DEFAULT_LIMITS, **self.limits.get(model, {})}
+            self.lanes[model] = _ModelLane(model, limit["concurrency"], limit["tpm"])
+        return self.lanes[model]
+
+    @asynccontextmanager
+    async def slot(self, model: str, est_tokens: int, priority: str = "interactive"):
+        """
+        모델별 실행 슬롯 획득
+
+        사용 후 yield된 dict의 "tokens"에 실제 사용 토큰을 기록하면 버킷이 정산됨
+        """
+        lane = self._lane(model)
+        level = PRIORITIES.get(priority, PRIORITIES["interactive"])
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(lane.waiters, (level, next(self._seq), est_tokens, future))
+
+        queued_at = time.monotonic()
+        lane.dispatch()
+        try:
+            reserved = await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                lane.release(future.result(), 0)
+            raise
+        lane.wait_samples[priority if priority in PRIORITIES else "interactive"].append(
+            time.monotonic() - queued_at
+        )
+
+        usage = {"tokens": None}
+        try:
+            yield usage
+        finally:
+            lane.release(reserved, usage["tokens"])
+
+    async def run(self, model: str, est_tokens: int, call, priority: str = "interactive"):
+        """
+        슬롯을 잡고 call()을 실행, 429/5xx면 지수 백오프 + 지터로 재시도
+
+        Args:
+            call: 인자 없는 코루틴 함수. 반환값에 usage.total_tokens가 있으면 정산에 사용
+        """
+        lane = self._lane(model)
+        attempt = 0
+        while True:
+            try:
+                async with self.slot(model, est_tokens, priority) as usage:
+                    result = await call()
+                    total = getattr(getattr(result, "usage", None), "total_tokens", None)
+                    usage["tokens"] = total if total is not None else est_tokens
+                lane.completed += 1
+                return result
+            except Exception as e:
+                if not is_retryable_error(e) or attempt >= settings.LLM_MAX_RETRIES:
+                    lane.failures += 1
+                    raise
+                delay = min(settings.LLM_BACKOFF_MAX, settings.LLM_BACKOFF_BASE * (2 ** attempt))
+                delay = random.uniform(0, delay)
+                retry_after = _retry_after_seconds(e)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                attempt += 1
+                lane.retries += 1
+                print(f"⚠️ LLM 재시도 {attempt}/{settings.LLM_MAX_RETRIES} ({model}, {delay:.1f}s 후): {e}")
+                await asyncio.sleep(delay)
+
+    def snapshot(self) -> Dict:
+        """모델별 대기열/대기시간 지표"""
+        return {model: lane.snapshot() for model, lane in self.lanes.items()}
+
+
+# 싱글톤 인스턴스 (라우터마다 OpenAIService를 만들어도 스케줄러는 공유)
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler()
+    return _scheduler
@@ -0,0 +1,180 @@
+"""Prometheus 지표 (HTTP 라우트, LLM, 벡터검색, 외부 API)"""
+import re
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import httpx
+from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+# 지연시간 버킷 (초) - LLM 호출은 수십 초까지 걸릴 수 있음
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "API 요청 처리 시간",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "LLM 호출 시간 (스케줄러 대기 포함)",
+    ["model", "endpoint", "status"], buckets=LATENCY_BUCKETS,
+)
+LLM_TTFT_SECONDS = Histogram(
+    "llm_time_to_first_token_seconds", "스트리밍 LLM 첫 토큰까지 시간",
+    ["model", "endpoint"], buckets=LATENCY_BUCKETS,
+)
+LLM_ROUTED_CALLS = Counter(
+    "llm_routed_calls_total", "모델 라우팅 결과별 호출 수",
+    ["endpoint", "tier", "model"],
+)
+LLM_HEDGES = Counter(
+    "llm_hedges_total", "헤지 요청 (issued: 중복 요청 발송, won: 중복 요청이 먼저 응답, budget_exceeded: 상한으로 생략)",
+    ["model", "endpoint", "event"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "LLM 토큰 사용량",
+    ["model", "endpoint", "kind"],
+)
+
+PROMPT_TOKENS = Counter(
+    "llm_prompt_tokens_total", "프롬프트 템플릿별 입력 토큰 (kind=cached: 공급자 프롬프트 캐시 적중분)",
+    ["prompt", "kind"],
+)
+
+EMBED_SECONDS = Histogram(
+    "vectorstore_embed_duration_seconds", "질의 임베딩 시간",
+    ["store"], buckets=FAST_BUCKETS,
+)
+SEARCH_SECONDS = Histogram(
+    "vectorstore_search_duration_seconds", "FAISS 검색 시간",
+    ["store", "target"], buckets=FAST_BUCKETS,
+)
+
+EXTERNAL_SECONDS = Histogram(
+    "external_api_duration_seconds", "외부 API 호출 시간",
+    ["service", "operation", "status"], buckets=LATENCY_BUCKETS,
+)
+EXTERNAL_ERRORS = Counter(
+    "external_api_errors_total", "외부 API 오류 수 (4xx/5xx/예외)",
+    ["service", "operation"],
+)
+
+# 경로 내 숫자/UUID를 묶어서 라벨 수 폭증 방지
+_ID_SEGMENT = re.compile(r"/(\d+|[0-9a-f]{8}-[0-9a-f-]{27,})(?=/|$)", re.I)
+
+
+def render_latest() -> tuple:
+    """(본문, content-type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def observe_http_request(method: str, route: str, status: int, seconds: float):
+    HTTP_REQUEST_SECONDS.labels(method, route, str(status)).observe(seconds)
+
+
+def observe_llm_request(model: str, endpoint: str, status: str, seconds: float, usage=None):
+    """LLM 호출 1건 기록 (usage: OpenAI 응답의 usage 객체)"""
+    LLM_REQUEST_SECONDS.labels(model, endpoint, status).observe(seconds)
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, endpoint, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    LLM_TOKENS.labels(model, endpoint, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+    LLM_TOKENS.labels(model, endpoint, "cached").inc(cached_prompt_tokens(usage))
+
+
+def cached_prompt_tokens(usage) -> int:
+    """usage.prompt_tokens_details.cached_tokens (없으면 0)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+
+
+def observe_prompt_usage(prompt: str, usage):
+    """프롬프트 템플릿별 입력/캐시 적중 토큰 기록"""
+    if usage is None:
+        return
+    PROMPT_TOKENS.labels(prompt, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    PROMPT_TOKENS.labels(prompt, "cached").inc(cached_prompt_tokens(usage))
+
+
+def observe_llm_route(endpoint: str, tier: str, model: str):
+    LLM_ROUTED_CALLS.labels(endpoint, tier, model).inc()
+
+
+def observe_llm_hedge(model: str, endpoint: str, event: str):
+    LLM_HEDGES.labels(model, endpoint, event).inc()
+
+
+def observe_llm_ttft(model: str, endpoint: str, seconds: float):
+    LLM_TTFT_SECONDS.labels(model, endpoint).observe(seconds)
+
+
+@contextmanager
+def time_embed(store: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        EMBED_SECONDS.labels(store).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def time_search(store: str, target: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        SEARCH_SECONDS.labels(store, target).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def observe_external(service: str, operation: str):
+    """httpx 이외의 외부 SDK 호출(DeepL 등) 계측"""
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except Exception:
+        status = "error"
+        EXTERNAL_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        EXTERNAL_SECONDS.labels(service, operation, status).observe(time.perf_counter() - start)
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """요청별 지연시간/오류를 기록하는 httpx 전송 계층"""
+
+    def __init__(self, service: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.service = service
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        operation = f"{request.method} {_ID_SEGMENT.sub('/:id', request.url.path)}"
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception:
+            EXTERNAL_ERRORS.labels(self.service, operation).inc()
+            EXTERNAL_SECONDS.labels(self.service, operation, "exception").observe(time.perf_counter() - start)
+            raise
+        EXTERNAL_SECONDS.labels(self.service, operation, str(response.status_code)).observe(
+            time.perf_counter() - start
+        )
+        if response.status_code >= 400:
+            EXTERNAL_ERRORS.labels(self.service, operation).inc()
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def external_client(service: str, **kwargs) -> httpx.AsyncClient:
+    """
+    계측되는 httpx.AsyncClient 생성
+
+    Args:
+        service: 지표 라벨 (supabase, kakao, github 등)
+        **kwargs: httpx.AsyncClient 인자 (timeout 등)
+    """
+    return httpx.AsyncClient(transport=_InstrumentedTransport(service), **kwargs)
@@ -0,0 +1,74 @@
+"""입력 길이/기능/지연 목표(SLO) 기반 모델 등급 선택"""
+from typing import Dict, Optional
+
+from config import settings
+from services import metrics
+
+# 실제 출력은 max_tokens보다 짧은 경우가 많아 지연 추정 시 적용하는 비율
+OUTPUT_FILL_RATIO = 0.6
+
+
+def _tier_order():
+    """빠른 등급부터 나열 (LLM_MODEL_TIERS 정의 순서)"""
+    return list(settings.LLM_MODEL_TIERS.keys())
+
+
+def estimate_latency(tier: str, max_tokens: int) -> float:
+    """등급별 예상 응답 시간 (초)"""
+    speed = settings.LLM_TIER_SPEED.get(tier, {"overhead_s": 1.0, "tokens_per_s": 50.0})
+    return speed["overhead_s"] + max_tokens * OUTPUT_FILL_RATIO / speed["tokens_per_s"]
+
+
+def select_model(endpoint: str, input_chars: int, default_max_tokens: int, default_model: Optional[str] = None) -> Dict:
+    """
+    기능별 정책에 따라 모델과 max_tokens 선택
+
+    정책(LLM_ROUTING_POLICY[endpoint])의 rules를 위에서부터 보며 input_chars < max_chars인
+    첫 규칙을 적용하고, 예상 지연이 latency_slo_s를 넘으면 한 단계 빠른 등급으로 내림.
+    정책이 없는 기능은 default_model을 그대로 사용
+
+    Returns:
+        {"tier", "model", "max_tokens", "reason"}
+    """
+    policy = settings.LLM_ROUTING_POLICY.get(endpoint)
+    if not policy:
+        return {
+            "tier": None,
+            "model": default_model or settings.OPENAI_MODEL,
+            "max_tokens": default_max_tokens,
+            "reason": "정책 없음",
+        }
+
+    rule = {}
+    for candidate in policy.get("rules", []):
+        max_chars = candidate.get("max_chars")
+        if max_chars is None or input_chars < max_chars:
+            rule = candidate
+            break
+
+    tiers = _tier_order()
+    tier = rule.get("tier", tiers[-1])
+    max_tokens = rule.get("max_tokens", default_max_tokens)
+    reason = f"입력 {input_chars}자 → {tier}"
+
+    slo = policy.get("latency_slo_s")
+    if slo:
+        while estimate_latency(tier, max_tokens) > slo and tiers.index(tier) > 0:
+            tier = tiers[tiers.index(tier) - 1]
+            reason += f", SLO {slo}s 초과로 {tier} 하향"
+        if estimate_latency(tier, max_tokens) > slo:
+            speed = settings.LLM_TIER_SPEED[tier]
+            capped = int((slo - speed["overhead_s"]) * speed["tokens_per_s"] / OUTPUT_FILL_RATIO)
+            if 0 < capped < max_tokens:
+                max_tokens = capped
+                reason += f", max_tokens {capped}로 제한"
+
+    route = {
+        "tier": tier,
+        "model": settings.LLM_MODEL_TIERS[tier],
+        "max_tokens": max_tokens,
+        "reason": reason,
+    }
+    metrics.observe_llm_route(endpoint, tier, route["model"])
+    print(f"🧭 모델 라우팅 [{endpoint}] {route['model']} (tier={tier}, max_tokens={max_tokens}) - {reason}")
+    return route
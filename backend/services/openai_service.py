@@ -1,40 +1,326 @@
 """OpenAI API 서비스"""
+import asyncio
+import time
+from typing import AsyncIterator, List, Dict, Optional
 from openai import AsyncOpenAI
 from config import settings
+from services import metrics
+from services.llm_hedge import get_hedge_policy
+from services.llm_scheduler import get_scheduler, is_retryable_error
+from services.prompt_registry import PromptTemplate
+from services.model_router import select_model
+from utils.context_packer import count_tokens
+
+# 이미지 입력 1장당 예상 토큰 (스케줄러 예약용)
+IMAGE_TOKEN_ESTIMATE = 1000
+
+DEFAULT_SYSTEM_PROMPT = "당신은 충주시청 업무를 돕는 AI 어시스턴트입니다. 정확하고 명확하게 답변하세요."
+
+
+def estimate_request_tokens(messages: List[Dict], max_tokens: int, model: str) -> int:
+    """프롬프트 + 최대 출력 토큰 추정치"""
+    total = max_tokens
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            total += count_tokens(content, model)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "text":
+                    total += count_tokens(part.get("text", ""), model)
+                else:
+                    total += IMAGE_TOKEN_ESTIMATE
+    return total
+
+
+class _Attempt:
+    """헤지 경쟁 중인 스트리밍 요청 1건"""
+
+    def __init__(self, is_hedge: bool):
+        self.is_hedge = is_hedge
+        self.ready = asyncio.Event()  # 첫 토큰 수신 또는 종료(성공/실패)
+        self.parts: List[str] = []
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.task.done() and not self.task.cancelled() and self.task.exception() is not None
 
 
 class OpenAIService:
     """OpenAI API 호출 서비스"""
-    
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+    def __init__(self, endpoint: str = "default", hedge: bool = False):
+        """
+        Args:
+            endpoint: 지표 라벨용 호출 기능 이름 (election_law, press_release 등)
+            hedge: True면 interactive 텍스트 생성에 헤지 요청 적용 (꼬리 지연 단축)
+        """
+        self.endpoint = endpoint
+        self.hedge = hedge
+        self.hedge_policy = get_hedge_policy()
+        # 재시도는 스케줄러가 담당 (SDK 자체 재시도 비활성화)
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            max_retries=0
+        )
         self.model = settings.OPENAI_MODEL
-    
-    async def generate_text(
+        self.scheduler = get_scheduler()
+
+    async def chat_completion(
         self,
-        prompt: str,
+        messages: List[Dict],
+        model: Optional[str] = None,
         max_tokens: int = 1000,
-        temperature: float = 0.7,
-        system_prompt: str = "당신은 충주시청 업무를 돕는 AI 어시스턴트입니다. 정확하고 명확하게 답변하세요."
-    ) -> str:
-        """텍스트 생성"""
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
+        priority: str = "interactive",
+        prompt_name: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Chat Completions 호출 (스케줄러 경유)
+
+        Args:
+            messages: OpenAI 메시지 목록
+            model: 사용할 모델 (기본: settings.OPENAI_MODEL)
+            max_tokens: 최대 출력 토큰
+            priority: "interactive"(즉답형) 또는 "batch"(대용량 생성)
+            prompt_name: 프롬프트 템플릿 이름 (프롬프트 캐시 적중 토큰 기록용)
+            **kwargs: temperature, response_format 등 추가 파라미터
+
+        Returns:
+            ChatCompletion 응답 객체
+        """
+        model = model or self.model
+        # n개 후보를 한 번에 받으면 출력 토큰도 n배
+        est_tokens = estimate_request_tokens(messages, max_tokens * kwargs.get("n", 1), model)
+
+        async def call():
+            return await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
                 max_tokens=max_tokens,
-                temperature=temperature
+                **kwargs
             )
-            
-            return response.choices[0].message.content.strip()
-            
+
+        start = time.perf_counter()
+        try:
+            response = await self.scheduler.run(model, est_tokens, call, priority=priority)
         except Exception as e:
+            metrics.observe_llm_request(model, self.endpoint, "error", time.perf_counter() - start)
             print(f"❌ OpenAI API 오류: {e}")
             raise
-    
+
+        usage = getattr(response, "usage", None)
+        metrics.observe_llm_request(model, self.endpoint, "ok", time.perf_counter() - start, usage)
+        if prompt_name:
+            metrics.observe_prompt_usage(prompt_name, usage)
+        return response
+
+    async def stream_text(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        priority: str = "interactive",
+        prompt_name: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        스트리밍 생성 (텍스트 조각을 순서대로 yield)
+
+        스트림이 끝날 때까지 스케줄러 슬롯을 유지하며, 첫 토큰까지 시간(TTFT)을 기록함.
+        스트림 도중 끊기면 재시도하지 않고 예외를 그대로 올림
+        """
+        model = model or self.model
+        est_tokens = estimate_request_tokens(messages, max_tokens, model)
+        start = time.perf_counter()
+        status = "error"
+        final_usage = None
+
+        try:
+            async with self.scheduler.slot(model, est_tokens, priority) as usage:
+                stream = await self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **kwargs
+                )
+                first_token = True
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None):
+                        final_usage = chunk.usage
+                        usage["tokens"] = chunk.usage.total_tokens
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        if first_token:
+                            ttft = time.perf_counter() - start
+                            metrics.observe_llm_ttft(model, self.endpoint, ttft)
+                            self.hedge_policy.observe_ttft(model, ttft)
+                            first_token = False
+                        yield delta
+                status = "ok"
+        except (asyncio.CancelledError, GeneratorExit):
+            # 헤지 경쟁에서 진 요청 등 호출 측 취소
+            status = "cancelled"
+            raise
+        finally:
+            metrics.observe_llm_request(model, self.endpoint, status, time.perf_counter() - start, final_usage)
+            if prompt_name:
+                metrics.observe_prompt_usage(prompt_name, final_usage)
+
+    async def generate_text(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = DEFAULT_SYSTEM_PROMPT,
+        model: Optional[str] = None,
+        priority: str = "interactive",
+        **kwargs
+    ) -> str:
+        """텍스트 생성 (system_prompt=None이면 user 메시지만 전송)"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        return await self.generate_messages(
+            messages, max_tokens=max_tokens, temperature=temperature, model=model, priority=priority, **kwargs
+        )
+
+    async def generate_prompt(self, template: PromptTemplate, values: Dict, **kwargs) -> str:
+        """
+        등록된 프롬프트 템플릿으로 텍스트 생성 (고정 앞부분 = system, 요청별 값 = user)
+
+        Args:
+            template: services.prompt_registry에 등록된 템플릿
+            values: template.tail에 채울 값
+            **kwargs: generate_messages 인자 (max_tokens, temperature, model, priority 등)
+        """
+        return await self.generate_messages(template.render(**values), prompt_name=template.name, **kwargs)
+
+    async def generate_messages(
+        self,
+        messages: List[Dict],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        priority: str = "interactive",
+        **kwargs
+    ) -> str:
+        """메시지 목록으로 텍스트 생성 (hedge=True 서비스의 interactive 호출은 헤지 요청으로 처리)"""
+        if self.hedge and settings.LLM_HEDGE_ENABLED and priority == "interactive" and "n" not in kwargs:
+            return await self.hedged_text(
+                messages, model=model, max_tokens=max_tokens, priority=priority, temperature=temperature, **kwargs
+            )
+
+        response = await self.chat_completion(
+            messages=messages,
+            model=model,
+            max_tokens=max_tokens,
+            priority=priority,
+            temperature=temperature,
+            **kwargs
+        )
+
+        return (response.choices[0].message.content or "").strip()
+
+    async def hedged_text(
+        self,
+        messages: List[Dict],
+        model: Optional[str] = None,
+        max_tokens: int = 1000,
+        priority: str = "interactive",
+        **kwargs
+    ) -> str:
+        """
+        헤지 요청으로 텍스트 생성
+
+        스트리밍으로 보낸 요청이 모델별 헤지 지연(최근 TTFT p90) 안에 첫 토큰을 받지 못하면
+        같은 요청을 한 번 더 보내고, 먼저 첫 토큰을 받은 쪽을 끝까지 읽고 다른 쪽은 취소함.
+        헤지 비율이 상한을 넘으면 중복 요청을 보내지 않음.
+        양쪽 모두 토큰 없이 재시도 가능 오류로 실패하거나, 고른 쪽 스트림이 도중에 끊기면
+        일반 호출(스케줄러 재시도)로 전환
+        """
+        model = model or self.model
+        policy = self.hedge_policy
+        decision = policy.start_request(model)
+        attempts: List[_Attempt] = []
+
+        def launch(is_hedge: bool) -> _Attempt:
+            attempt = _Attempt(is_hedge)
+
+            async def run() -> str:
+                try:
+                    async for delta in self.stream_text(messages, model, max_tokens, priority, **kwargs):
+                        attempt.parts.append(delta)
+                        attempt.ready.set()
+                    return "".join(attempt.parts)
+                finally:
+                    attempt.ready.set()
+
+            attempt.task = asyncio.create_task(run())
+            attempts.append(attempt)
+            return attempt
+
+        async def wait_ready(candidates: List[_Attempt], timeout: Optional[float] = None) -> List[_Attempt]:
+            waiters = {asyncio.create_task(a.ready.wait()): a for a in candidates}
+            done, pending = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+            return [waiters[w] for w in done]
+
+        winner = None
+        try:
+            launch(is_hedge=False)
+            ready = await wait_ready(attempts, timeout=policy.delay(model))
+            if not ready:
+                if policy.try_hedge(decision):
+                    metrics.observe_llm_hedge(model, self.endpoint, "issued")
+                    launch(is_hedge=True)
+                else:
+                    metrics.observe_llm_hedge(model, self.endpoint, "budget_exceeded")
+
+            live = list(attempts)
+            while winner is None:
+                ready = ready or await wait_ready(live)
+                winner = next((a for a in ready if not a.failed), None)
+                if winner is None:
+                    live = [a for a in live if a not in ready]
+                    if not live:
+                        break
+                    ready = []
+
+            if winner is None:
+                error = attempts[0].task.exception()
+                if not is_retryable_error(error):
+                    raise error
+                print(f"⚠️ 헤지 요청 실패, 일반 호출로 재시도: {error}")
+            else:
+                for attempt in attempts:
+                    if attempt is not winner:
+                        attempt.task.cancel()
+                if winner.is_hedge:
+                    policy.record_win(model)
+                    metrics.observe_llm_hedge(model, self.endpoint, "won")
+                try:
+                    return (await winner.task).strip()
+                except Exception as error:
+                    # 첫 토큰 이후 스트림이 끊김 (다른 요청은 이미 취소됨)
+                    print(f"⚠️ 헤지 스트림 중단, 일반 호출로 재시도: {error}")
+        finally:
+            for attempt in attempts:
+                if not attempt.task.done():
+                    attempt.task.cancel()
+
+        response = await self.chat_completion(messages, model=model, max_tokens=max_tokens, priority=priority, **kwargs)
+        return (response.choices[0].message.content or "").strip()
+
     async def get_embedding(self, text: str) -> list:
         """텍스트 임베딩 생성 (OpenAI 모델)"""
         try:
@@ -46,3 +332,11 @@ class OpenAIService:
         except Exception as e:
             print(f"❌ 임베딩 생성 오류: {e}")
             raise
+
+    def route_model(self, input_chars: int, default_max_tokens: int, default_model: Optional[str] = None) -> Dict:
+        """입력 길이와 config 정책으로 모델 등급/max_tokens 선택 -> {"tier", "model", "max_tokens", "reason"}"""
+        return select_model(self.endpoint, input_chars, default_max_tokens, default_model or self.model)
+
+    def get_scheduler_metrics(self) -> Dict:
+        """모델별 대기열 깊이/대기시간 지표"""
+        return self.scheduler.snapshot()
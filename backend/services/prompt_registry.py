@@ -0,0 +1,66 @@
+"""
+프롬프트 템플릿 레지스트리
+
+모든 프롬프트를 "고정 앞부분(system: 역할 + 규칙 + 예시) + 요청별 뒷부분(user)" 순서로 구성.
+OpenAI는 요청 앞부분이 이전 요청과 같으면(1024토큰 이상) 캐시를 적용하므로,
+요청마다 바뀌는 값은 반드시 tail에만 넣어야 함
+"""
+import hashlib
+from typing import Any, Dict, List
+
+from utils.context_packer import count_tokens
+
+
+class PromptTemplate:
+    """고정 앞부분 + 요청별 뒷부분 프롬프트"""
+
+    def __init__(self, name: str, system: str, tail: str):
+        """
+        Args:
+            name: 레지스트리/지표 라벨용 이름 (예: "press_release")
+            system: 요청과 무관한 고정 지침 (그대로 system 메시지로 전송, format 하지 않음)
+            tail: 요청별 값이 들어가는 str.format 템플릿 (user 메시지).
+                  덜 바뀌는 값(유형별 가이드 등)을 앞에, 자주 바뀌는 값을 뒤에 둘 것
+        """
+        self.name = name
+        self.system = system.strip()
+        self.tail = tail.strip()
+        self.prefix_hash = hashlib.sha256(self.system.encode("utf-8")).hexdigest()[:12]
+
+    def render(self, **values: Any) -> List[Dict]:
+        """OpenAI 메시지 목록 [system(고정), user(요청별)]"""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.tail.format(**values)},
+        ]
+
+    def describe(self) -> Dict:
+        return {
+            "name": self.name,
+            "prefix_hash": self.prefix_hash,
+            "prefix_tokens": count_tokens(self.system),
+        }
+
+
+_registry: Dict[str, PromptTemplate] = {}
+
+
+def register_prompt(name: str, system: str, tail: str) -> PromptTemplate:
+    """템플릿 등록 (같은 이름에 다른 고정 앞부분을 등록하면 ValueError)"""
+    template = PromptTemplate(name, system, tail)
+    existing = _registry.get(name)
+    if existing and (existing.system, existing.tail) != (template.system, template.tail):
+        raise ValueError(f"이미 다른 내용으로 등록된 프롬프트: {name}")
+    _registry[name] = template
+    return template
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    if name not in _registry:
+        raise KeyError(f"등록되지 않은 프롬프트: {name}")
+    return _registry[name]
+
+
+def list_prompts() -> List[Dict]:
+    """등록된 템플릿 목록 (이름, 고정 앞부분 해시/토큰 수)"""
+    return [template.describe() for template in _registry.values()]
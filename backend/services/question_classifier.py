@@ -0,0 +1,108 @@
+"""선거법 질문 유형 로컬 분류기 (ko-sroberta 임베딩 + 최근접 중심)"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from services.vectorstore import get_embedding_model
+
+QUESTION_TYPES = ["list_type", "single_case", "definition", "period", "general"]
+
+# 코사인 유사도 -> 확률 변환 온도 (작을수록 최고점에 확률이 몰림)
+SOFTMAX_TEMPERATURE = 0.05
+
+
+class QuestionTypeClassifier:
+    """
+    라벨링된 예시 질문의 임베딩 평균(중심)과의 코사인 유사도로 유형 분류
+
+    확신도(softmax 최대값)가 기준 미만이면 None을 돌려 LLM 분류로 넘김
+    """
+
+    def __init__(self, examples_path: Optional[str] = None, model=None):
+        self.examples_path = examples_path or settings.QUESTION_TYPE_EXAMPLES_PATH
+        self._model = model
+        self.labels: List[str] = []
+        self.centroids: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = get_embedding_model()
+        return self._model
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.asarray(self.model.encode(texts), dtype="float32")
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def fit(self, examples: Dict[str, List[str]]) -> "QuestionTypeClassifier":
+        """라벨별 예시 질문으로 중심 벡터 계산"""
+        labels = [label for label in QUESTION_TYPES if examples.get(label)]
+        centroids = []
+        for label in labels:
+            centroid = self._encode(examples[label]).mean(axis=0)
+            centroids.append(centroid / max(np.linalg.norm(centroid), 1e-12))
+        self.labels = labels
+        self.centroids = np.vstack(centroids).astype("float32")
+        return self
+
+    def load(self) -> bool:
+        """예시 파일 로드 후 학습 (싱글톤처럼 최초 1회)"""
+        if self.centroids is not None:
+            return True
+
+        with self._lock:
+            if self.centroids is not None:
+                return True
+            if not os.path.exists(self.examples_path):
+                print(f"⚠️ 질문 유형 예시 파일 없음: {self.examples_path}")
+                return False
+            try:
+                with open(self.examples_path, "r", encoding="utf-8") as f:
+                    self.fit(json.load(f))
+                print(f"✅ 질문 유형 분류기 로드: {len(self.labels)}개 유형")
+                return True
+            except Exception as e:
+                print(f"❌ 질문 유형 분류기 로드 실패: {e}")
+                return False
+
+    def predict_proba(self, question: str) -> Dict[str, float]:
+        """유형별 확률"""
+        sims = self.centroids @ self._encode([question])[0]
+        logits = (sims - sims.max()) / SOFTMAX_TEMPERATURE
+        probs = np.exp(logits) / np.exp(logits).sum()
+        return {label: float(p) for label, p in zip(self.labels, probs)}
+
+    def predict(self, question: str, min_confidence: Optional[float] = None) -> Tuple[Optional[str], float]:
+        """
+        질문 유형 예측
+
+        Returns:
+            (label, confidence). 확신도가 기준 미만이거나 분류기를 쓸 수 없으면 label은 None
+        """
+        if min_confidence is None:
+            min_confidence = settings.QUESTION_TYPE_MIN_CONFIDENCE
+
+        if not self.load():
+            return None, 0.0
+
+        probs = self.predict_proba(question)
+        label = max(probs, key=probs.get)
+        confidence = probs[label]
+        return (label if confidence >= min_confidence else None), confidence
+
+
+# 싱글톤 인스턴스
+_classifier: Optional[QuestionTypeClassifier] = None
+
+
+def get_question_classifier() -> QuestionTypeClassifier:
+    global _classifier
+    if _classifier is None:
+        _classifier = QuestionTypeClassifier()
+    return _classifier
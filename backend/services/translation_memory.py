@@ -0,0 +1,129 @@
+"""번역 메모리 (세그먼트 단위 번역 결과를 SQLite에 저장해 재사용)"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+
+# SQLite 바인딩 변수 개수 제한 대비 조회 묶음 크기
+_LOOKUP_CHUNK = 500
+
+
+def normalize_segment(text: str) -> str:
+    """공백 차이를 무시하는 조회 키 (앞뒤 공백 제거, 연속 공백 1칸)"""
+    return " ".join(text.split())
+
+
+class TranslationMemory:
+    """
+    (정규화 원문, 대상 언어, 엔진) -> 번역문 저장소
+
+    - 엔진: "deepl"(DeepL 1차 결과), "gpt"(한글 잔존 시 GPT 2차 결과)
+    - 최근 사용 시각 기준 LRU로 max_entries를 넘는 항목 삭제
+    - 여러 워커 프로세스가 같은 파일을 쓸 수 있도록 WAL 모드 사용
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS segments (
+                source TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                engine TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source, target_lang, engine)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments(last_used)")
+        self._conn.commit()
+
+    def get_many(self, sources: Iterable[str], target_lang: str, engine: str) -> Dict[str, str]:
+        """
+        저장된 번역 조회 (적중 항목은 최근 사용 시각 갱신)
+
+        Returns:
+            {정규화 원문: 번역문}
+        """
+        keys = list(dict.fromkeys(normalize_segment(s) for s in sources))
+        found: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[i:i + _LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT source, translation FROM segments WHERE target_lang = ? AND engine = ? "
+                    f"AND source IN ({','.join('?' * len(chunk))})",
+                    [target_lang, engine, *chunk],
+                ).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE segments SET last_used = ?, hits = hits + 1 "
+                    "WHERE source = ? AND target_lang = ? AND engine = ?",
+                    [(now, source, target_lang, engine) for source in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, pairs: List[Tuple[str, str]], target_lang: str, engine: str):
+        """(원문, 번역문) 저장 후 용량 초과분 삭제"""
+        if not pairs:
+            return
+        now = time.time()
+        rows = {normalize_segment(source): translation for source, translation in pairs}
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO segments (source, target_lang, engine, translation, last_used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(source, target_lang, engine) DO UPDATE SET "
+                "translation = excluded.translation, last_used = excluded.last_used",
+                [(source, target_lang, engine, translation, now) for source, translation in rows.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM segments WHERE rowid IN (SELECT rowid FROM segments ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            )
+
+    def snapshot(self) -> Dict:
+        """저장 항목 수 (엔진별)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT engine, COUNT(*) FROM segments GROUP BY engine").fetchall()
+        return {"path": self.path, "max_entries": self.max_entries, "entries": dict(rows)}
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_failed = False
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """번역 메모리 싱글톤 (비활성화되었거나 파일을 열 수 없으면 None)"""
+    global _memory, _memory_failed
+    if not settings.TRANSLATION_MEMORY_ENABLED or _memory_failed:
+        return None
+    if _memory is None:
+        try:
+            _memory = TranslationMemory(settings.TRANSLATION_MEMORY_PATH, settings.TRANSLATION_MEMORY_MAX_ENTRIES)
+            print(f"✅ 번역 메모리 로드: {settings.TRANSLATION_MEMORY_PATH}")
+        except (OSError, sqlite3.Error) as e:
+            _memory_failed = True
+            print(f"⚠️ 번역 메모리 사용 불가 (캐시 없이 번역): {e}")
+            return None
+    return _memory
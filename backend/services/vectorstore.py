@@ -1,10 +1,13 @@
 """벡터스토어 검색 서비스"""
+import asyncio
 import os
 import pickle
+import threading
 from typing import List, Dict
 import numpy as np
 
 from config import settings
+from services import metrics
 
 # 지연 로딩을 위한 전역 변수
 _faiss_index = None
@@ -15,14 +18,19 @@ _metadata = None
 _election_indexes = {}
 _election_metadata = {}
 
+# 검색이 스레드에서 실행되므로 지연 로딩 중복 방지용 락
+_load_lock = threading.RLock()
+
 
 def get_embedding_model():
     """임베딩 모델 로드 (싱글톤)"""
     global _embedding_model
     if _embedding_model is None:
-        from sentence_transformers import SentenceTransformer
-        _embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
-        print(f"✅ 임베딩 모델 로드: {settings.EMBEDDING_MODEL}")
+        with _load_lock:
+            if _embedding_model is None:
+                from sentence_transformers import SentenceTransformer
+                _embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
+                print(f"✅ 임베딩 모델 로드: {settings.EMBEDDING_MODEL}")
     return _embedding_model
 
 
@@ -106,14 +114,16 @@ class VectorStoreService:
             import faiss  # ✅ 여기서 사용 (정규화)
 
             model = get_embedding_model()
-            query_embedding = model.encode([query])[0]
+            with metrics.time_embed("press_release"):
+                query_embedding = model.encode([query])[0]
             query_embedding = np.array([query_embedding]).astype("float32")
 
             # ✅ 코사인처럼 쓰기 위한 정규화
             faiss.normalize_L2(query_embedding)
 
             # FAISS 검색 (IndexFlatIP면 distances가 곧 cosine score에 가까움)
-            distances, indices = _faiss_index.search(query_embedding, top_k)
+            with metrics.time_search("press_release", "all"):
+                distances, indices = _faiss_index.search(query_embedding, top_k)
 
             results = []
             for score, idx in zip(distances[0], indices[0]):
@@ -160,6 +170,15 @@ class VectorStoreService:
         if target in _election_indexes:
             return True
 
+        with _load_lock:
+            if target in _election_indexes:
+                return True
+            return self._load_election_law_files(target)
+
+    def _load_election_law_files(self, target: str) -> bool:
+        """선거법 인덱스/메타데이터 파일 읽기 (_load_lock 안에서 호출)"""
+        global _election_indexes, _election_metadata
+
         try:
             import faiss
 
@@ -208,48 +227,82 @@ class VectorStoreService:
             return False
 
     async def search_election_law(self, query: str, target: str = "all", top_k: int = 5) -> List[Dict]:
-        """선거법 문서 검색 (코사인처럼: normalize + score 그대로)"""
-        if not self._load_election_law_vectorstore(target):
+        """
+        선거법 문서 검색 (코사인처럼: normalize + score 그대로)
+
+        임베딩/FAISS 검색은 CPU 작업이므로 스레드에서 실행해 이벤트 루프를 막지 않음
+        (LLM 호출과 동시에 검색을 진행할 수 있음)
+        """
+        return await asyncio.to_thread(self._search_election_law_sync, query, target, top_k)
+
+    def _search_election_law_sync(self, query: str, target: str, top_k: int) -> List[Dict]:
+        """선거법 문서 검색 (동기)"""
+        return self._search_election_law_batch_sync([query], target, top_k)[0]
+
+    async def search_election_law_batch(self, queries: List[str], target: str = "all", top_k: int = 5) -> List[List[Dict]]:
+        """
+        여러 질의를 한 번에 검색 (임베딩 1회 배치 인코딩 + FAISS 다중 행 검색 1회)
+
+        Returns:
+            queries와 같은 순서의 검색 결과 리스트
+        """
+        if not queries:
             return []
+        return await asyncio.to_thread(self._search_election_law_batch_sync, list(queries), target, top_k)
+
+    def _search_election_law_batch_sync(self, queries: List[str], target: str, top_k: int) -> List[List[Dict]]:
+        """선거법 문서 배치 검색 (동기)"""
+        if not self._load_election_law_vectorstore(target):
+            return [[] for _ in queries]
 
         try:
             import faiss
 
             model = get_embedding_model()
-            query_embedding = model.encode([query])[0]
-            query_embedding = np.array([query_embedding]).astype("float32")
+            with metrics.time_embed("election_law"):
+                query_embeddings = np.asarray(model.encode(queries), dtype="float32").reshape(len(queries), -1)
+            query_embeddings = np.ascontiguousarray(query_embeddings)
 
-            faiss.normalize_L2(query_embedding)
+            faiss.normalize_L2(query_embeddings)
 
             index = _election_indexes[target]
             metadata = _election_metadata[target]
 
-            distances, indices = index.search(query_embedding, top_k)
+            with metrics.time_search("election_law", target):
+                distances, indices = index.search(query_embeddings, top_k)
 
-            results = []
-            for score, idx in zip(distances[0], indices[0]):
-                if idx < 0 or idx >= len(metadata):
-                    continue
-
-                doc = metadata[idx]
-                similarity = float(score)
-
-                content = doc.get("page_content", "") or doc.get("content", "")
-                doc_type = doc.get("type") or doc.get("metadata", {}).get("doc_type") or target
-
-                if content and similarity >= 0.35:
-                    results.append({
-                        "content": content,
-                        "similarity": similarity,
-                        "type": doc_type,
-                        "metadata": doc.get("metadata", {})
-                    })
-
-            return results
+            return [
+                self._collect_election_results(distances[row], indices[row], metadata, target)
+                for row in range(len(queries))
+            ]
 
         except Exception as e:
             print(f"❌ 선거법 검색 오류: {e}")
-            return []
+            return [[] for _ in queries]
+
+    @staticmethod
+    def _collect_election_results(scores, ids, metadata: List[Dict], target: str) -> List[Dict]:
+        """FAISS 결과 한 행을 문서 dict 리스트로 변환 (유사도 0.35 미만 제외)"""
+        results = []
+        for score, idx in zip(scores, ids):
+            if idx < 0 or idx >= len(metadata):
+                continue
+
+            doc = metadata[idx]
+            similarity = float(score)
+
+            content = doc.get("page_content", "") or doc.get("content", "")
+            doc_type = doc.get("type") or doc.get("metadata", {}).get("doc_type") or target
+
+            if content and similarity >= 0.35:
+                results.append({
+                    "content": content,
+                    "similarity": similarity,
+                    "type": doc_type,
+                    "metadata": doc.get("metadata", {})
+                })
+
+        return results
 
     def get_election_law_status(self) -> Dict:
         """선거법 벡터스토어 상태"""
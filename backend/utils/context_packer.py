@@ -0,0 +1,152 @@
+"""토큰 예산 기반 참고문서 컨텍스트 패커"""
+import hashlib
+import re
+from typing import List, Dict, Tuple, Optional
+
+# 인코딩 캐시 (모델명 -> 인코딩)
+_encodings = {}
+
+# tiktoken 미설치/오프라인 시 근사치 (한글 위주 텍스트 기준 글자당 토큰 수)
+APPROX_TOKENS_PER_CHAR = 0.6
+
+# 예산이 이보다 적게 남으면 문서를 잘라 넣지 않고 건너뜀
+MIN_PARTIAL_TOKENS = 64
+
+
+class _ApproxEncoding:
+    """tiktoken을 쓸 수 없을 때 사용하는 근사 토크나이저"""
+
+    name = "approx"
+
+    def count(self, text: str) -> int:
+        return int(len(text) * APPROX_TOKENS_PER_CHAR) + 1 if text else 0
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return text[:int((max_tokens - 1) / APPROX_TOKENS_PER_CHAR)]
+
+
+class _TiktokenEncoding:
+    """tiktoken 인코딩 래퍼"""
+
+    def __init__(self, encoding):
+        self._encoding = encoding
+        self.name = encoding.name
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text)) if text else 0
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self._encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        # 멀티바이트 문자가 잘려 생긴 깨진 글자 제거
+        return self._encoding.decode(tokens[:max_tokens]).rstrip("�")
+
+
+def get_encoding(model: str = "gpt-4o-mini"):
+    """모델에 맞는 토크나이저 로드 (싱글톤, 실패 시 근사치)"""
+    if model in _encodings:
+        return _encodings[model]
+
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        _encodings[model] = _TiktokenEncoding(encoding)
+    except Exception as e:
+        print(f"⚠️ tiktoken 로드 실패, 근사 토큰 계산 사용: {e}")
+        _encodings[model] = _ApproxEncoding()
+
+    return _encodings[model]
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """텍스트 토큰 수 계산"""
+    return get_encoding(model).count(text)
+
+
+def _content_key(content: str) -> str:
+    """공백 차이를 무시한 중복 판별 키"""
+    normalized = re.sub(r"\s+", " ", content).strip()
+    return hashlib.md5(normalized.encode("utf-8")).hexdigest()
+
+
+def pack_context(
+    docs: List[Dict],
+    token_budget: int,
+    max_chars: Optional[int] = None,
+    max_docs: Optional[int] = None,
+    model: str = "gpt-4o-mini",
+) -> Tuple[List[Dict], Dict]:
+    """
+    유사도 높은 순으로 중복 없는 문서를 토큰 예산 안에 채워 넣기
+
+    Args:
+        docs: {"content", "similarity", ...} 형태의 검색 결과
+        token_budget: 참고문서 전체에 허용할 토큰 수
+        max_chars: 문서당 최대 글자 수 (기존 잘라내기 기준)
+        max_docs: 최대 문서 수
+        model: 토큰 계산 기준 모델
+
+    Returns:
+        (packed_docs, stats) 튜플. packed_docs의 content는 잘린 본문
+    """
+    encoding = get_encoding(model)
+
+    ranked = sorted(docs, key=lambda d: d.get("similarity", 0), reverse=True)
+
+    # 기존 방식(앞에서부터 N개 × max_chars) 기준 토큰 수
+    baseline_docs = docs[:max_docs] if max_docs else docs
+    baseline_tokens = sum(
+        encoding.count((d.get("content", "") or "")[:max_chars] if max_chars else (d.get("content", "") or ""))
+        for d in baseline_docs
+    )
+
+    packed = []
+    seen = set()
+    used_tokens = 0
+    duplicates = 0
+    truncated = 0
+
+    for doc in ranked:
+        if max_docs and len(packed) >= max_docs:
+            break
+
+        content = doc.get("content", "") or ""
+        if max_chars:
+            content = content[:max_chars]
+        if not content.strip():
+            continue
+
+        key = _content_key(content)
+        if key in seen:
+            duplicates += 1
+            continue
+
+        remaining = token_budget - used_tokens
+        tokens = encoding.count(content)
+        if tokens > remaining:
+            if remaining < MIN_PARTIAL_TOKENS:
+                break
+            content = encoding.truncate(content, remaining)
+            tokens = encoding.count(content)
+            truncated += 1
+
+        seen.add(key)
+        packed.append({**doc, "content": content})
+        used_tokens += tokens
+
+    stats = {
+        "tokenizer": encoding.name,
+        "token_budget": token_budget,
+        "candidates": len(docs),
+        "packed": len(packed),
+        "duplicates_removed": duplicates,
+        "truncated": truncated,
+        "tokens_used": used_tokens,
+        "baseline_tokens": baseline_tokens,
+        "tokens_saved": max(baseline_tokens - used_tokens, 0),
+    }
+    return packed, stats
@@ -0,0 +1,57 @@
+"""비전 모델 업로드 전 이미지 축소/재인코딩"""
+import io
+from typing import Dict, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+def prepare_image_for_vision(image_bytes: bytes, max_dimension: int, jpeg_quality: int,
+                             content_type: str = "image/jpeg") -> Tuple[bytes, str, Dict]:
+    """
+    긴 변을 max_dimension 이하로 줄이고 JPEG로 재인코딩
+
+    휴대폰 EXIF 회전을 반영하고 투명 배경은 흰색으로 채움.
+    디코딩할 수 없는 형식이거나 재인코딩 결과가 원본보다 크면 원본을 그대로 사용
+
+    Returns:
+        (이미지 바이트, MIME 타입, {"original_bytes", "sent_bytes", "original_size", "sent_size", "resized"})
+    """
+    stats = {
+        "original_bytes": len(image_bytes),
+        "sent_bytes": len(image_bytes),
+        "original_size": None,
+        "sent_size": None,
+        "resized": False,
+    }
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            stats["original_size"] = stats["sent_size"] = list(img.size)
+            img = ImageOps.exif_transpose(img)
+
+            if img.mode in ("RGBA", "LA", "P"):
+                img = img.convert("RGBA")
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                background.paste(img, mask=img.split()[-1])
+                img = background
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
+
+            if max(img.size) > max_dimension:
+                img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+                stats["resized"] = True
+
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
+            encoded = buffer.getvalue()
+            size = list(img.size)
+    except (UnidentifiedImageError, OSError) as e:
+        print(f"⚠️ 이미지 전처리 생략 (원본 사용): {e}")
+        return image_bytes, content_type, stats
+
+    if not stats["resized"] and len(encoded) >= len(image_bytes):
+        return image_bytes, content_type, stats
+
+    stats["sent_bytes"] = len(encoded)
+    stats["sent_size"] = size
+    return encoded, "image/jpeg", stats
@@ -0,0 +1,59 @@
+"""ZIP 일부 항목만 교체 (나머지 항목은 압축된 바이트 그대로 복사)"""
+import copy
+import io
+import struct
+import zipfile
+from typing import Dict
+
+# 로컬 파일 헤더: 고정 30바이트, 26~29바이트가 파일명/extra 길이
+_LOCAL_HEADER_SIZE = 30
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+
+def _raw_entry(source: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    """항목의 압축된 데이터 (압축 해제 없이)"""
+    source.fp.seek(info.header_offset)
+    header = source.fp.read(_LOCAL_HEADER_SIZE)
+    name_len, extra_len = struct.unpack("<HH", header[26:30])
+    source.fp.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_len + extra_len)
+    return source.fp.read(info.compress_size)
+
+
+def _write_raw(target: zipfile.ZipFile, info: zipfile.ZipInfo, raw: bytes):
+    """압축된 데이터를 재압축 없이 기록 (CRC/크기는 원본 항목 정보 사용)"""
+    entry = copy.copy(info)
+    entry.header_offset = target.fp.tell()
+    # 로컬 헤더에 CRC/크기를 바로 적으므로 데이터 디스크립터는 쓰지 않음
+    entry.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+    target.fp.write(entry.FileHeader())
+    target.fp.write(raw)
+    target.filelist.append(entry)
+    target.NameToInfo[entry.filename] = entry
+    target.start_dir = target.fp.tell()
+
+
+def rewrite_zip(source_bytes: bytes, replacements: Dict[str, bytes]) -> bytes:
+    """
+    replacements에 있는 항목만 새 내용으로 압축하고, 나머지는 원래 순서/압축 방식 그대로 복사
+
+    이미지(BinData) 등 큰 항목을 다시 deflate하지 않으며 디스크에 풀지 않음.
+    mimetype처럼 무압축(STORED)으로 맨 앞에 있어야 하는 항목도 그대로 유지됨
+
+    Args:
+        source_bytes: 원본 ZIP 바이트
+        replacements: {항목 이름: 새 내용}
+
+    Returns:
+        새 ZIP 바이트
+    """
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(source_bytes)) as source, zipfile.ZipFile(output, "w") as target:
+        for info in source.infolist():
+            if info.filename in replacements:
+                entry = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                entry.external_attr = info.external_attr
+                entry.compress_type = zipfile.ZIP_DEFLATED
+                target.writestr(entry, replacements[info.filename])
+            else:
+                _write_raw(target, info, _raw_entry(source, info))
+    return output.getvalue()